@@ -16,26 +16,160 @@ class Settings(BaseSettings):
     mistral_model: str = "mistral-large-latest"
 
     # Pinecone Configuration
-    pinecone_api_key: str
+    pinecone_api_key: str = ""
     pinecone_index_name: str = "legal-ai-index"
     pinecone_environment: str = "us-east-1-aws"
 
+    # Vector Store ("pinecone" or an in-process NumPy "local" store)
+    vector_store: Literal["pinecone", "local"] = "pinecone"
+    local_vector_store_path: str = os.path.join(os.path.dirname(__file__), "data", "vector_store")
+    local_vector_store_dtype: Literal["float32", "float16"] = "float32"
+    local_vector_store_mmap: bool = True
+
     # LLM Provider
     llm_provider: Literal["openai", "mistral"] = "openai"
 
-    # Embedding Configuration
+    # LLM Connection Pooling (per provider)
+    llm_max_connections: int = 100
+    llm_max_keepalive_connections: int = 20
+    llm_keepalive_expiry: float = 30.0
+    llm_request_timeout: float = 120.0
+
+    # LLM Provider Limits (per provider; size to your account quotas, 0 disables a rate limit).
+    # Calls that cannot get a slot and quota within chat_max_queue_seconds are rejected with a 429
+    openai_max_concurrency: int = 16
+    openai_requests_per_minute: int = 500
+    openai_tokens_per_minute: int = 0  # Disabled: tier quotas vary widely, set yours to enable
+    mistral_max_concurrency: int = 4
+    mistral_requests_per_minute: int = 60
+    mistral_tokens_per_minute: int = 500000
+    llm_estimated_output_tokens: int = 700  # Completion tokens charged against TPM per call
+
+    # Hedged Fallback: start the fallback LLM if the primary has no first token by the
+    # deadline, or by its p95 time to first token once enough samples are tracked
+    llm_hedging_enabled: bool = True
+    llm_hedge_deadline_seconds: float = 4.0
+    llm_hedge_min_samples: int = 20
+
+    # Admission Control: chat requests processed at once, requests allowed to wait,
+    # and the longest wait before a 429 with Retry-After
+    chat_max_concurrency: int = 32
+    chat_max_queue: int = 64
+    chat_max_queue_seconds: float = 10.0
+
+    # Embedding Configuration ("openai", or an offline deterministic "hash" embedder)
+    embedding_provider: Literal["openai", "hash"] = "openai"
     embedding_model: str = "text-embedding-3-small"
     embedding_dimension: int = 1536
 
+    # Ingestion Embedding Batching
+    embedding_batch_max_tokens: int = 100000  # Token budget per embeddings request
+    embedding_batch_max_items: int = 2048  # Input count limit per embeddings request
+    embedding_concurrency: int = 4  # Batches in flight at once
+    embedding_tokens_per_minute: int = 1000000  # 0 disables rate limiting
+    embedding_max_retries: int = 5
+
+    # Ingestion Embedding Store (vectors keyed by model and text hash, reused across runs)
+    embedding_store_enabled: bool = True
+    embedding_store_path: str = os.path.join(os.path.dirname(__file__), "data", "embedding_store")
+
+    # Query Embedding Cache
+    embedding_cache_size: int = 10000
+    embedding_cache_ttl_seconds: float = 86400.0
+    embedding_cache_path: str = ""  # SQLite file for a persistent tier; empty disables it
+    embedding_cache_disk_max_entries: int = 200000  # Least recently used rows beyond this are pruned
+    embedding_cache_disk_ttl_seconds: float = 30 * 86400.0  # Rows unused for this long are pruned
+
+    # Retrieval Result Cache (top-k results keyed on query embedding, top_k and filter;
+    # dropped whenever ingestion bumps the index version)
+    retrieval_cache_enabled: bool = True
+    retrieval_cache_max_bytes: int = 64 * 1024 * 1024
+    retrieval_cache_ttl_seconds: float = 86400.0
+
+    # Request Coalescing: identical concurrent queries, embeddings and retrievals
+    # share one in-flight execution
+    single_flight_enabled: bool = True
+
+    # Semantic Answer Cache
+    answer_cache_enabled: bool = True
+    answer_cache_similarity_threshold: float = 0.97
+    answer_cache_size: int = 1000
+    answer_cache_ttl_seconds: float = 86400.0
+
+    # Streaming Ingestion
+    ingestion_source: str = ""  # JSONL file, JSON file or directory; empty uses the bundled mock data
+    ingestion_batch_size: int = 512  # Chunks per embed/upsert batch
+    ingestion_queue_size: int = 4  # Batches buffered between pipeline stages
+    chunk_workers: int = 1  # Chunking processes; raise for large corpora
+
+    # Vector Upserts (Pinecone caps requests at 2 MB and 1000 vectors)
+    upsert_max_batch_bytes: int = 2_000_000
+    upsert_max_batch_size: int = 100
+    upsert_concurrency: int = 4
+    upsert_max_retries: int = 3
+
+    # Ingestion manifest of document and chunk content hashes, for incremental re-ingestion
+    ingestion_manifest_path: str = os.path.join(os.path.dirname(__file__), "data", "ingestion_manifest.json")
+
+    # Server-side Conversation History
+    conversation_store_size: int = 10000
+    conversation_ttl_seconds: float = 86400.0
+    conversation_max_messages: int = 20
+
+    # Session Checkpointer (bounded LangGraph memory; SQLite path persists sessions across restarts)
+    checkpoint_ttl_seconds: float = 3600.0
+    checkpoint_max_bytes: int = 256 * 1024 * 1024
+    checkpoint_max_history: int = 2
+    checkpoint_sqlite_path: str = ""  # Empty keeps checkpoints in memory only
+    checkpoint_flush_seconds: float = 1.0  # Write-behind delay for the SQLite tier
+
+    # Index version file, bumped by ingestion to invalidate caches
+    index_version_path: str = os.path.join(os.path.dirname(__file__), ".index_version")
+
     # Application Configuration
     frontend_url: str = "http://localhost:3000"
     backend_port: int = 8000
 
+    # Metrics: Prometheus /metrics endpoint and Server-Timing response headers
+    metrics_enabled: bool = True
+
     # RAG Configuration
     top_k_chunks: int = 5
     chunk_size: int = 512
     chunk_overlap: int = 50
 
+    # Prompt Context: token budget for retrieved cases (cl100k tokens), and the
+    # smallest remainder worth filling with a truncated case
+    context_token_budget: int = 3000
+    context_min_truncated_tokens: int = 100
+
+    # Batch Chat (POST /chat/batch): questions per request, concurrent vector searches,
+    # concurrent generations
+    batch_max_questions: int = 1000
+    batch_retrieval_concurrency: int = 32
+    batch_generation_concurrency: int = 8
+
+    # Follow-up Rewriting: local gate to skip the rewrite LLM call, and speculative
+    # retrieval of the raw query while a rewrite runs
+    rewrite_gate_enabled: bool = True
+    rewrite_short_query_words: int = 4
+    rewrite_similarity_threshold: float = 0.2
+    speculative_retrieval: bool = True
+    speculative_similarity_threshold: float = 0.8
+
+    # Hybrid Retrieval (BM25 index built by ingestion, fused with vector search via RRF)
+    hybrid_retrieval: bool = True
+    lexical_index_path: str = os.path.join(os.path.dirname(__file__), "data", "lexical_index.npz")
+    hybrid_candidates: int = 20
+    # BM25 results are filtered after their metadata is fetched from the vector
+    # store, so filtered searches rank this many times more lexical candidates
+    hybrid_filter_overfetch: int = 4
+    rrf_k: int = 60
+
+    # Single-call generation: answer, cited cases and confidence from one structured
+    # LLM call instead of a separate self-assessment round trip
+    inline_confidence: bool = False
+
     # Confidence Thresholds
     retrieval_confidence_weight: float = 0.6
     llm_confidence_weight: float = 0.4
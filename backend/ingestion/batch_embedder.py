@@ -0,0 +1,177 @@
+"""Token-budgeted, concurrent, rate-limited batch embedding for ingestion."""
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+import openai
+from backend.config import settings
+from backend.ingestion.chunker import get_encoding
+from backend.ingestion.embedding_store import EmbeddingStore
+from backend.services.embeddings import EmbeddingProvider
+from backend.services.rate_limit import TokenBucket
+
+
+def plan_batches(
+    token_counts: List[int],
+    max_tokens: int,
+    max_items: int
+) -> List[range]:
+    """
+    Group consecutive texts into batches under a token budget and item limit.
+
+    A single text larger than the budget gets a batch of its own.
+
+    Args:
+        token_counts: Token count of each text, in input order
+        max_tokens: Maximum total tokens per batch
+        max_items: Maximum texts per batch
+
+    Returns:
+        List of index ranges into the input, in order
+    """
+    batches = []
+    start, batch_tokens = 0, 0
+    for idx, tokens in enumerate(token_counts):
+        if idx > start and (batch_tokens + tokens > max_tokens or idx - start >= max_items):
+            batches.append(range(start, idx))
+            start, batch_tokens = idx, 0
+        batch_tokens += tokens
+    if start < len(token_counts):
+        batches.append(range(start, len(token_counts)))
+    return batches
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """Return True for rate-limit, server-side and connection errors."""
+    if isinstance(exc, (openai.RateLimitError, openai.APIConnectionError)):
+        return True
+    return isinstance(exc, openai.APIStatusError) and exc.status_code >= 500
+
+
+def _retry_after_seconds(exc: Exception) -> Optional[float]:
+    """Read the Retry-After header from an API error, if present."""
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class BatchEmbedder:
+    """
+    Embeds large text collections in concurrent, token-budgeted batches.
+
+    Texts are grouped into batches that fit the provider's per-request
+    token and input limits, several batches run at once on a thread pool,
+    a shared tokens-per-minute bucket keeps the whole pool under quota,
+    and 429/5xx responses are retried with jittered exponential backoff.
+    With an embedding store, texts embedded in earlier runs are served
+    from disk and only the rest are sent to the provider.
+    """
+
+    def __init__(
+        self,
+        provider: EmbeddingProvider,
+        max_tokens: int = None,
+        max_items: int = None,
+        concurrency: int = None,
+        tokens_per_minute: int = None,
+        max_retries: int = None,
+        embedding_store: EmbeddingStore = None
+    ):
+        """
+        Initialize batch embedder.
+
+        Args:
+            provider: Embedding provider instance
+            max_tokens: Token budget per request (default from settings)
+            max_items: Input count limit per request (default from settings)
+            concurrency: Batches in flight at once (default from settings)
+            tokens_per_minute: Rate limit, 0 to disable (default from settings)
+            max_retries: Retries per batch on retryable errors (default from settings)
+            embedding_store: Persistent store to reuse and record embeddings (optional)
+        """
+        self.provider = provider
+        self.embedding_store = embedding_store
+        self.max_tokens = max_tokens or settings.embedding_batch_max_tokens
+        self.max_items = max_items or settings.embedding_batch_max_items
+        self.concurrency = concurrency or settings.embedding_concurrency
+        self.max_retries = settings.embedding_max_retries if max_retries is None else max_retries
+
+        if tokens_per_minute is None:
+            tokens_per_minute = settings.embedding_tokens_per_minute
+        self.rate_limiter = TokenBucket.per_minute(tokens_per_minute) if tokens_per_minute else None
+
+    def _embed_batch(self, texts: List[str], tokens: int) -> List[List[float]]:
+        """Embed one batch, waiting on the rate limiter and retrying transient errors."""
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter:
+                self.rate_limiter.acquire(tokens)
+            try:
+                return self.provider.embed(texts)
+            except Exception as e:
+                if attempt == self.max_retries or not _is_retryable(e):
+                    raise
+                delay = _retry_after_seconds(e) or min(2 ** attempt, 60) * (0.5 + random.random())
+                if self.rate_limiter and isinstance(e, openai.RateLimitError):
+                    # The quota is exhausted for every worker, not just this one
+                    self.rate_limiter.pause(delay)
+                print(f"Embedding batch failed ({e.__class__.__name__}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts, returning vectors in input order.
+
+        Args:
+            texts: List of text strings to embed
+
+        Returns:
+            List of embedding vectors
+        """
+        if self.embedding_store is None:
+            return self._embed_uncached(texts)
+
+        embeddings = self.embedding_store.get_many(texts)
+        missing = [idx for idx, embedding in enumerate(embeddings) if embedding is None]
+        print(f"Embedding store: {len(texts) - len(missing)} of {len(texts)} texts already embedded")
+        if missing:
+            missing_texts = [texts[idx] for idx in missing]
+            fresh = self._embed_uncached(missing_texts)
+            self.embedding_store.put_many(missing_texts, fresh)
+            for idx, embedding in zip(missing, fresh):
+                embeddings[idx] = embedding
+        return embeddings
+
+    def _embed_uncached(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts with the provider in concurrent, rate-limited batches."""
+        if not texts:
+            return []
+
+        token_counts = [len(tokens) for tokens in get_encoding().encode_ordinary_batch(texts)]
+        batches = plan_batches(token_counts, self.max_tokens, self.max_items)
+        print(f"Embedding {len(texts)} texts ({sum(token_counts)} tokens) in {len(batches)} batches")
+
+        started = time.perf_counter()
+        embeddings: List[List[float]] = []
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [
+                executor.submit(
+                    self._embed_batch,
+                    texts[batch.start:batch.stop],
+                    sum(token_counts[batch.start:batch.stop])
+                )
+                for batch in batches
+            ]
+            try:
+                for future in futures:
+                    embeddings.extend(future.result())
+            except Exception:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+        elapsed = time.perf_counter() - started
+        print(f"Embedded {len(embeddings)} texts in {elapsed:.1f}s")
+        return embeddings
@@ -0,0 +1,152 @@
+"""Payload-size-aware, concurrent vector upserts with retry and throughput reporting."""
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+from backend.config import settings
+from backend.services.vector_store import VectorStore
+
+
+def vector_payload_bytes(vector: Dict[str, Any]) -> int:
+    """Return the JSON-serialized size of a vector record in bytes."""
+    return len(json.dumps(vector, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+
+def plan_upsert_batches(
+    sizes: List[int],
+    max_bytes: int,
+    max_count: int
+) -> List[range]:
+    """
+    Group consecutive vectors into batches under a byte budget and count limit.
+
+    A single vector larger than the budget gets a batch of its own.
+
+    Args:
+        sizes: Serialized size of each vector, in input order
+        max_bytes: Maximum total bytes per batch
+        max_count: Maximum vectors per batch
+
+    Returns:
+        List of index ranges into the input, in order
+    """
+    batches = []
+    start, batch_bytes = 0, 0
+    for idx, size in enumerate(sizes):
+        if idx > start and (batch_bytes + size > max_bytes or idx - start >= max_count):
+            batches.append(range(start, idx))
+            start, batch_bytes = idx, 0
+        batch_bytes += size
+    if start < len(sizes):
+        batches.append(range(start, len(sizes)))
+    return batches
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """Return True for throttling, server-side and transport errors."""
+    status = getattr(exc, "status", None) or getattr(exc, "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    # Malformed records fail the same way every time
+    return not isinstance(exc, (ValueError, TypeError, KeyError))
+
+
+class BatchUpserter:
+    """
+    Upserts vectors in concurrent batches bounded by request size.
+
+    Records carry the chunk text in their metadata, so batch sizes are
+    capped by serialized bytes as well as by count to stay under vendor
+    request limits. Batches are sent from a bounded thread pool, retried
+    with jittered exponential backoff on transient errors, and cumulative
+    throughput is tracked across calls.
+    """
+
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        max_batch_bytes: int = None,
+        max_batch_size: int = None,
+        concurrency: int = None,
+        max_retries: int = None
+    ):
+        """
+        Initialize batch upserter.
+
+        Args:
+            vector_store: Vector store instance
+            max_batch_bytes: Serialized byte budget per request (default from settings)
+            max_batch_size: Vector count limit per request (default from settings)
+            concurrency: Batches in flight at once (default from settings)
+            max_retries: Retries per batch on transient errors (default from settings)
+        """
+        self.vector_store = vector_store
+        self.max_batch_bytes = max_batch_bytes or settings.upsert_max_batch_bytes
+        self.max_batch_size = max_batch_size or settings.upsert_max_batch_size
+        self.concurrency = concurrency or settings.upsert_concurrency
+        self.max_retries = settings.upsert_max_retries if max_retries is None else max_retries
+
+        self.total_vectors = 0
+        self.total_bytes = 0
+        self.total_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _upsert_batch(self, vectors: List[Dict[str, Any]]) -> None:
+        """Upsert one batch, retrying transient errors."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.vector_store.upsert(vectors)
+                return
+            except Exception as e:
+                if attempt == self.max_retries or not _is_retryable(e):
+                    raise
+                delay = min(2 ** attempt, 30) * (0.5 + random.random())
+                print(f"Upsert batch failed ({e.__class__.__name__}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def upsert(self, vectors: List[Dict[str, Any]]) -> None:
+        """
+        Upsert vectors, returning once every batch has been written.
+
+        Args:
+            vectors: List of dicts with id, values and metadata
+        """
+        if not vectors:
+            return
+
+        sizes = [vector_payload_bytes(vector) for vector in vectors]
+        batches = plan_upsert_batches(sizes, self.max_batch_bytes, self.max_batch_size)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(self._upsert_batch, vectors[batch.start:batch.stop]) for batch in batches]
+            try:
+                for future in futures:
+                    future.result()
+            except Exception:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self.total_vectors += len(vectors)
+            self.total_bytes += sum(sizes)
+            self.total_seconds += elapsed
+        print(
+            f"Upserted {len(vectors)} vectors in {len(batches)} batches "
+            f"({sum(sizes) / 1e6:.1f} MB, {elapsed:.2f}s, {len(vectors) / max(elapsed, 1e-9):.0f} vectors/s)"
+        )
+
+    def throughput(self) -> Dict[str, float]:
+        """Return cumulative upsert totals and rates."""
+        with self._lock:
+            seconds = max(self.total_seconds, 1e-9)
+            return {
+                "vectors": self.total_vectors,
+                "megabytes": round(self.total_bytes / 1e6, 2),
+                "seconds": round(self.total_seconds, 2),
+                "vectors_per_second": round(self.total_vectors / seconds, 1),
+                "megabytes_per_second": round(self.total_bytes / 1e6 / seconds, 2)
+            }
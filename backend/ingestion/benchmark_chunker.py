@@ -0,0 +1,59 @@
+"""Benchmark the token-native chunker against the recursive character splitter.
+
+Usage:
+    python -m backend.ingestion.benchmark_chunker [source] [--repeat N] [--workers N]
+"""
+import argparse
+import os
+import time
+from typing import Any, Callable, Dict, List
+from backend.config import settings
+from backend.ingestion.chunker import (
+    chunk_document,
+    chunk_documents,
+    count_tokens,
+    create_recursive_text_splitter,
+    create_text_splitter
+)
+from backend.ingestion.ingest import MOCK_DATA_PATH
+from backend.ingestion.streaming import iter_documents
+
+
+def _measure(name: str, documents: List[Dict[str, Any]], run: Callable[[], List[List[Dict[str, Any]]]]) -> None:
+    started = time.perf_counter()
+    results = run()
+    elapsed = time.perf_counter() - started
+
+    chunks = [chunk for document_chunks in results for chunk in document_chunks]
+    sizes = [count_tokens(chunk["text"]) for chunk in chunks]
+    print(
+        f"{name:<22} {len(documents) / elapsed:>10.1f} docs/s  "
+        f"{len(chunks):>7} chunks  avg {sum(sizes) / max(len(sizes), 1):>6.1f} tokens  "
+        f"max {max(sizes, default=0):>5} tokens"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark chunking throughput.")
+    parser.add_argument("source", nargs="?", default=MOCK_DATA_PATH, help="JSONL file, JSON file or directory")
+    parser.add_argument("--repeat", type=int, default=10, help="Times to repeat the corpus")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes for the pooled run")
+    args = parser.parse_args()
+
+    documents = list(iter_documents(args.source)) * args.repeat
+    size, overlap = settings.chunk_size, settings.chunk_overlap
+    print(f"Chunking {len(documents)} documents (chunk_size={size}, chunk_overlap={overlap})\n")
+
+    recursive = create_recursive_text_splitter(size, overlap)
+    token_native = create_text_splitter(size, overlap)
+
+    _measure("recursive splitter", documents,
+             lambda: [chunk_document(doc, recursive) for doc in documents])
+    _measure("token-native", documents,
+             lambda: [chunk_document(doc, token_native) for doc in documents])
+    _measure(f"token-native x{args.workers}", documents,
+             lambda: [chunks for _, chunks in chunk_documents(documents, size, overlap, workers=args.workers)])
+
+
+if __name__ == "__main__":
+    main()
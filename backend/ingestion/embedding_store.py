@@ -0,0 +1,160 @@
+"""Persistent content-addressed embedding store, so unchanged chunk texts are never re-embedded."""
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+import numpy as np
+
+
+VECTORS_FILE = "vectors.f32"
+INDEX_FILE = "index.npy"
+META_FILE = "meta.json"
+
+_INDEX_DTYPE = np.dtype([("key", np.uint64), ("row", np.int64)])
+
+
+def text_key(text: str) -> int:
+    """Hash a text to the 64-bit key used by the store."""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class EmbeddingStore:
+    """
+    On-disk embedding store keyed by (embedding model, text hash).
+
+    Each model gets its own directory. Vectors are appended as raw float32
+    rows to a file that is read through a memory map, and the index is a
+    sorted array of (64-bit text hash, row) pairs searched in bulk with
+    ``np.searchsorted``. Entries added since the last ``save`` live in a
+    small dict until the next save merges them into the sorted index.
+    """
+
+    def __init__(self, path: str, model: str):
+        """
+        Open (or create) the store for a model.
+
+        Args:
+            path: Root directory of the store
+            model: Embedding model name
+        """
+        self.model = model
+        self.path = os.path.join(path, re.sub(r"[^A-Za-z0-9_.-]", "_", model))
+        self.dimension: Optional[int] = None
+        self._index = np.zeros(0, dtype=_INDEX_DTYPE)
+        self._pending: Dict[int, int] = {}
+        self._rows = 0
+        self._matrix: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+
+        meta_path = os.path.join(self.path, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                self.dimension = json.load(f)["dimension"]
+            index_path = os.path.join(self.path, INDEX_FILE)
+            if os.path.exists(index_path):
+                self._index = np.load(index_path)
+            self._rows = os.path.getsize(os.path.join(self.path, VECTORS_FILE)) // (4 * self.dimension)
+
+    def __len__(self) -> int:
+        return len(self._index) + len(self._pending)
+
+    def _read_rows(self, rows: List[int]) -> np.ndarray:
+        """Read vectors by row, remapping the file if it has grown."""
+        if self._matrix is None or max(rows) >= len(self._matrix):
+            self._matrix = np.memmap(
+                os.path.join(self.path, VECTORS_FILE),
+                dtype=np.float32,
+                mode="r",
+                shape=(self._rows, self.dimension)
+            )
+        return np.asarray(self._matrix[rows])
+
+    def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Look up stored embeddings.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            One embedding per text, or None where the text is not stored
+        """
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        if not len(self) or not texts:
+            return results
+
+        keys = np.array([text_key(text) for text in texts], dtype=np.uint64)
+        with self._lock:
+            positions = np.searchsorted(self._index["key"], keys)
+            found_at, found_rows = [], []
+            for idx, (key, position) in enumerate(zip(keys.tolist(), positions.tolist())):
+                if position < len(self._index) and int(self._index["key"][position]) == key:
+                    row = int(self._index["row"][position])
+                else:
+                    row = self._pending.get(key)
+                if row is not None:
+                    found_at.append(idx)
+                    found_rows.append(row)
+            if found_rows:
+                vectors = self._read_rows(found_rows)
+                for idx, vector in zip(found_at, vectors):
+                    results[idx] = vector.tolist()
+        return results
+
+    def put_many(self, texts: List[str], embeddings: List[List[float]]) -> None:
+        """
+        Append embeddings for texts not already stored.
+
+        Args:
+            texts: Embedded texts
+            embeddings: Embedding vectors, one per text
+        """
+        if not texts:
+            return
+
+        with self._lock:
+            if self.dimension is None:
+                self.dimension = len(embeddings[0])
+                os.makedirs(self.path, exist_ok=True)
+                with open(os.path.join(self.path, META_FILE), 'w', encoding='utf-8') as f:
+                    json.dump({"model": self.model, "dimension": self.dimension}, f)
+
+            new_keys, new_vectors, seen = [], [], set()
+            for text, embedding in zip(texts, embeddings):
+                key = text_key(text)
+                position = np.searchsorted(self._index["key"], np.uint64(key))
+                stored = position < len(self._index) and int(self._index["key"][position]) == key
+                if stored or key in self._pending or key in seen:
+                    continue
+                seen.add(key)
+                new_keys.append(key)
+                new_vectors.append(embedding)
+            if not new_keys:
+                return
+
+            with open(os.path.join(self.path, VECTORS_FILE), 'ab') as f:
+                f.write(np.asarray(new_vectors, dtype=np.float32).tobytes())
+            for key in new_keys:
+                self._pending[key] = self._rows
+                self._rows += 1
+
+    def save(self) -> None:
+        """Merge new entries into the sorted index and write it atomically."""
+        with self._lock:
+            if not self._pending:
+                return
+            count = len(self._pending)
+            added = np.zeros(count, dtype=_INDEX_DTYPE)
+            added["key"] = np.fromiter(self._pending.keys(), dtype=np.uint64, count=count)
+            added["row"] = np.fromiter(self._pending.values(), dtype=np.int64, count=count)
+            merged = np.concatenate([self._index, added])
+            merged = merged[np.argsort(merged["key"], kind="stable")]
+
+            index_path = os.path.join(self.path, INDEX_FILE)
+            tmp_path = f"{index_path}.tmp.npy"
+            np.save(tmp_path, merged)
+            os.replace(tmp_path, index_path)
+            self._index = merged
+            self._pending = {}
@@ -1,155 +1,270 @@
-"""Ingestion pipeline for loading legal documents into Pinecone."""
-import json
+"""Ingestion pipeline for loading legal documents into the configured vector store."""
+import argparse
 import os
-from typing import List, Dict, Any
-from openai import OpenAI
-from pinecone import Pinecone, ServerlessSpec
+from typing import Iterable, Iterator, List, Dict, Any, Optional
 from backend.config import settings
-from backend.ingestion.chunker import create_text_splitter, chunk_document
+from backend.ingestion.batch_embedder import BatchEmbedder
+from backend.ingestion.batch_upserter import BatchUpserter
+from backend.ingestion.chunker import chunk_documents
+from backend.ingestion.embedding_store import EmbeddingStore
+from backend.ingestion.manifest import IngestionManifest, chunk_hash, document_hash, document_id
+from backend.ingestion.streaming import SpillFile, batched, iter_documents, run_pipeline
+from backend.services.embeddings import EmbeddingProvider, get_embedding_provider
+from backend.services.index_version import bump_index_version
+from backend.services.lexical_index import BM25Index
+from backend.services.vector_store import VectorStore, get_vector_store
 
 
-def load_mock_data(file_path: str = None) -> List[Dict[str, Any]]:
-    """Load mock legal documents from JSON file."""
-    if file_path is None:
-        file_path = os.path.join(os.path.dirname(__file__), "mock_data.json")
+MOCK_DATA_PATH = os.path.join(os.path.dirname(__file__), "mock_data.json")
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+# Vector ids per delete call when removing orphaned vectors
+DELETE_BATCH_SIZE = 1000
 
 
-def generate_embeddings(texts: List[str], client: OpenAI) -> List[List[float]]:
+def open_embedding_store(provider: EmbeddingProvider) -> Optional[EmbeddingStore]:
+    """Open the persistent embedding store for the provider's model, if enabled."""
+    if not settings.embedding_store_enabled:
+        return None
+    return EmbeddingStore(settings.embedding_store_path, provider.model_name)
+
+
+def chunk_vector_id(chunk: Dict[str, Any]) -> str:
+    """Build the vector store id for a chunk from its document id and position."""
+    return f"{chunk['metadata']['doc_id']}-{chunk['metadata']['chunk_id']}"
+
+
+def legacy_chunk_vector_id(chunk: Dict[str, Any]) -> str:
+    """Build the case-name-based id used before the ingestion manifest existed."""
+    vector_id = f"{chunk['metadata']['case_name']}_chunk_{chunk['metadata']['chunk_id']}"
+    return vector_id.replace(" ", "_").replace(".", "")
+
+
+def iter_chunks(
+    documents: Iterable[Dict[str, Any]],
+    manifest: IngestionManifest
+) -> Iterator[Dict[str, Any]]:
     """
-    Generate embeddings for a list of texts using OpenAI.
+    Chunk documents, assign stable ids and content hashes, and record them in a manifest.
+
+    A document with the same identity as an earlier one (case name, court,
+    date and citation) is reported and skipped, so its chunks do not overwrite
+    the first copy's vectors.
 
     Args:
-        texts: List of text strings to embed
-        client: OpenAI client instance
+        documents: Legal documents, possibly streamed
+        manifest: Empty manifest to record documents and chunks in
 
-    Returns:
-        List of embedding vectors
+    Yields:
+        Chunks with id and content_hash set
     """
-    response = client.embeddings.create(
-        model=settings.embedding_model,
-        input=texts
-    )
-    return [item.embedding for item in response.data]
+    for doc, chunks in chunk_documents(
+        documents,
+        chunk_size=settings.chunk_size,
+        chunk_overlap=settings.chunk_overlap,
+        workers=settings.chunk_workers
+    ):
+        doc_id = document_id(doc)
+        for chunk in chunks:
+            chunk["metadata"]["doc_id"] = doc_id
+            chunk["id"] = chunk_vector_id(chunk)
+            chunk["content_hash"] = chunk_hash(chunk)
+        if not manifest.record_document(doc_id, document_hash(doc), chunks):
+            print(f"Skipping duplicate of document {doc_id} ({doc.get('case_name')}, {doc.get('citation')})")
+            continue
+        yield from chunks
 
 
-def create_pinecone_index(pc: Pinecone, index_name: str, dimension: int = 1536):
+def build_lexical_index(entries: Iterable[Dict[str, Any]], path: str) -> BM25Index:
     """
-    Create a Pinecone index if it doesn't exist.
+    Build the BM25 lexical index over chunks and save it for hybrid retrieval.
 
     Args:
-        pc: Pinecone client instance
-        index_name: Name of the index to create
-        dimension: Dimension of the embedding vectors
+        entries: Dicts with id, text and metadata (one per chunk), possibly streamed
+        path: File path to write the index to
+
+    Returns:
+        BM25Index instance
     """
-    existing_indexes = [index.name for index in pc.list_indexes()]
-
-    if index_name not in existing_indexes:
-        pc.create_index(
-            name=index_name,
-            dimension=dimension,
-            metric="cosine",
-            spec=ServerlessSpec(
-                cloud="aws",
-                region=settings.pinecone_environment
-            )
-        )
-        print(f"Created index: {index_name}")
-    else:
-        print(f"Index {index_name} already exists")
-
-
-def upsert_to_pinecone(
+    lexical_index = BM25Index.build(entries)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    lexical_index.save(path)
+    return lexical_index
+
+
+def upsert_chunks(
     chunks: List[Dict[str, Any]],
     embeddings: List[List[float]],
-    index,
-    batch_size: int = 100
+    vector_store: VectorStore,
+    upserter: BatchUpserter = None
 ):
     """
-    Upsert chunks and their embeddings to Pinecone.
+    Upsert chunks and their embeddings to the vector store.
 
     Args:
         chunks: List of chunk dictionaries
         embeddings: List of embedding vectors
-        index: Pinecone index instance
-        batch_size: Number of vectors to upsert in each batch
+        vector_store: Vector store instance
+        upserter: Batch upserter to send through (default: a new one for vector_store)
     """
-    vectors = []
-    for idx, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-        vector_id = f"{chunk['metadata']['case_name']}_chunk_{chunk['metadata']['chunk_id']}"
-        vector_id = vector_id.replace(" ", "_").replace(".", "")
-
-        vectors.append({
-            "id": vector_id,
+    upserter = upserter or BatchUpserter(vector_store)
+    upserter.upsert([
+        {
+            "id": chunk["id"],
             "values": embedding,
             "metadata": {
                 **chunk["metadata"],
                 "text": chunk["text"]
             }
-        })
+        }
+        for chunk, embedding in zip(chunks, embeddings)
+    ])
 
-        # Upsert in batches
-        if len(vectors) >= batch_size:
-            index.upsert(vectors=vectors)
-            print(f"Upserted batch of {len(vectors)} vectors")
-            vectors = []
 
-    # Upsert remaining vectors
-    if vectors:
-        index.upsert(vectors=vectors)
-        print(f"Upserted final batch of {len(vectors)} vectors")
+def run_ingestion(
+    vector_store: VectorStore = None,
+    embedding_provider: EmbeddingProvider = None,
+    full_rebuild: bool = False,
+    source: str = None
+):
+    """
+    Main ingestion pipeline.
 
+    Documents are streamed from the source and flow through chunking,
+    embedding and upserting in batches, with bounded queues between the
+    stages, so memory does not grow with the corpus (apart from the manifest
+    and the BM25 postings). Chunk text for the lexical index and the legacy
+    vector ids to delete are spilled to temporary files and read back at the end.
 
-def run_ingestion():
-    """Main ingestion pipeline."""
+    Only chunks that are new or changed since the last run (per the ingestion
+    manifest) are embedded and upserted, and vectors of removed chunks are deleted.
+
+    Args:
+        vector_store: Vector store to write to (default from settings)
+        embedding_provider: Embedding provider (default from settings)
+        full_rebuild: Re-embed and upsert every chunk regardless of the manifest
+        source: JSONL file, JSON file or directory of documents (default from settings)
+    """
     print("Starting ingestion pipeline...")
 
     # Initialize clients
-    openai_client = OpenAI(api_key=settings.openai_api_key)
-    pc = Pinecone(api_key=settings.pinecone_api_key)
+    vector_store = vector_store or get_vector_store(for_writing=True)
+    embedding_provider = embedding_provider or get_embedding_provider()
+    embedding_store = open_embedding_store(embedding_provider)
+    embedder = BatchEmbedder(embedding_provider, embedding_store=embedding_store)
+    upserter = BatchUpserter(vector_store)
+    source = source or settings.ingestion_source or MOCK_DATA_PATH
 
     # Create or connect to index
-    print(f"\nCreating/connecting to Pinecone index: {settings.pinecone_index_name}")
-    create_pinecone_index(pc, settings.pinecone_index_name, settings.embedding_dimension)
-    index = pc.Index(settings.pinecone_index_name)
-
-    # Load mock data
-    print("\nLoading mock legal documents...")
-    documents = load_mock_data()
-    print(f"Loaded {len(documents)} documents")
-
-    # Chunk documents
-    print("\nChunking documents...")
-    text_splitter = create_text_splitter(
-        chunk_size=settings.chunk_size,
-        chunk_overlap=settings.chunk_overlap
+    print(f"\nCreating/connecting to vector store: {vector_store.name}")
+    vector_store.create_index_if_missing(settings.embedding_dimension)
+
+    # Load the manifest of what the store already holds
+    manifest_path = settings.ingestion_manifest_path
+    previous = IngestionManifest.load(manifest_path)
+    first_run = not previous.documents
+    if not first_run and (
+        previous.embedding_model != embedding_provider.model_name
+        or previous.vector_store != vector_store.name
+        or vector_store.stats()["total_vector_count"] == 0
+    ):
+        print("Manifest does not match the embedding model or vector store; rebuilding all chunks")
+        full_rebuild = True
+
+    manifest = IngestionManifest(
+        embedding_model=embedding_provider.model_name,
+        vector_store=vector_store.name
     )
+    spill_dir = os.path.dirname(settings.lexical_index_path) or None
+    if spill_dir:
+        os.makedirs(spill_dir, exist_ok=True)
+    lexical_entries = SpillFile(spill_dir) if settings.hybrid_retrieval else None
+    legacy_ids = SpillFile(spill_dir) if first_run else None
+    total_chunks = 0
+
+    def track(chunks: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        nonlocal total_chunks
+        for chunk in chunks:
+            total_chunks += 1
+            if lexical_entries is not None:
+                lexical_entries.append({"id": chunk["id"], "text": chunk["text"], "metadata": chunk["metadata"]})
+            if legacy_ids is not None:
+                # Vectors written under the old case-name ids are not in any manifest
+                legacy_ids.append(legacy_chunk_vector_id(chunk))
+            yield chunk
+
+    def embed_batch(batch: List[Dict[str, Any]]) -> tuple:
+        return batch, embedder.embed([chunk["text"] for chunk in batch])
+
+    def upsert_batch(item: tuple) -> int:
+        batch, embeddings = item
+        upsert_chunks(batch, embeddings, vector_store, upserter)
+        return len(batch)
+
+    # Stream documents through chunk -> embed -> upsert
+    print(f"\nStreaming documents from {source} with {embedding_provider.model_name}...")
+    chunks = track(iter_chunks(iter_documents(source), manifest))
+    if not full_rebuild:
+        chunks = previous.changed_chunks(chunks)
+
+    changed = 0
+    try:
+        try:
+            for upserted in run_pipeline(
+                batched(chunks, settings.ingestion_batch_size),
+                [embed_batch, upsert_batch],
+                settings.ingestion_queue_size
+            ):
+                changed += upserted
+                print(f"Ingested {changed} new or changed chunks so far")
+        finally:
+            # Keep paid-for embeddings even if a later stage failed
+            if embedding_store is not None:
+                embedding_store.save()
+
+        orphaned_ids = sorted(previous.vector_ids() - manifest.vector_ids())
+        orphaned = len(orphaned_ids) + (legacy_ids.count if legacy_ids is not None else 0)
+        print(f"\nProcessed {total_chunks} chunks from {len(manifest.documents)} documents: "
+              f"{changed} new or changed, {total_chunks - changed} unchanged, {orphaned} orphaned")
+
+        if changed:
+            print(f"Upsert throughput: {upserter.throughput()}")
 
-    all_chunks = []
-    for doc in documents:
-        chunks = chunk_document(doc, text_splitter)
-        all_chunks.extend(chunks)
+        if orphaned:
+            print(f"\nDeleting {orphaned} orphaned vectors...")
+            for batch in batched(orphaned_ids, DELETE_BATCH_SIZE):
+                vector_store.delete(batch)
+            if legacy_ids is not None:
+                for batch in batched(legacy_ids, DELETE_BATCH_SIZE):
+                    vector_store.delete(batch)
 
-    print(f"Created {len(all_chunks)} chunks from {len(documents)} documents")
+        # Build lexical index
+        if lexical_entries is not None:
+            print("\nBuilding BM25 lexical index...")
+            build_lexical_index(lexical_entries, settings.lexical_index_path)
+            print(f"Saved lexical index to {settings.lexical_index_path}")
+    finally:
+        for spill in (lexical_entries, legacy_ids):
+            if spill is not None:
+                spill.close()
 
-    # Generate embeddings
-    print("\nGenerating embeddings...")
-    texts = [chunk["text"] for chunk in all_chunks]
-    embeddings = generate_embeddings(texts, openai_client)
-    print(f"Generated {len(embeddings)} embeddings")
+    vector_store.save()
+    manifest.save(manifest_path)
 
-    # Upsert to Pinecone
-    print("\nUpserting to Pinecone...")
-    upsert_to_pinecone(all_chunks, embeddings, index)
+    if changed or orphaned:
+        # Invalidate API caches built from the previous index contents
+        version = bump_index_version()
+        print(f"Index version bumped to {version}")
 
     # Verify
-    stats = index.describe_index_stats()
+    stats = vector_store.stats()
     print(f"\nIngestion complete!")
     print(f"Index stats: {stats}")
-    print(f"Total vectors in index: {stats.total_vector_count}")
+    print(f"Total vectors in index: {stats['total_vector_count']}")
 
 
 if __name__ == "__main__":
-    run_ingestion()
+    parser = argparse.ArgumentParser(description="Ingest legal documents into the vector store.")
+    parser.add_argument("source", nargs="?", help="JSONL file, JSON file or directory of documents")
+    parser.add_argument("--full", action="store_true", help="Re-embed every chunk, ignoring the manifest")
+    args = parser.parse_args()
+    run_ingestion(full_rebuild=args.full, source=args.source)
@@ -0,0 +1,162 @@
+"""Content-hash manifest of ingested documents and chunks, for incremental re-ingestion."""
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Set
+
+
+MANIFEST_FORMAT = 1
+IDENTITY_FIELDS = ("case_name", "court", "date", "citation")
+
+
+def _sha256(payload: str) -> str:
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def document_id(document: Dict[str, Any]) -> str:
+    """
+    Build a stable id for a document from its identifying fields.
+
+    The id does not depend on content, so an edited opinion keeps its id and
+    its old chunks can be found and replaced.
+
+    Args:
+        document: Dictionary containing case information
+
+    Returns:
+        Hex digest prefix identifying the document
+    """
+    identity = "\x1f".join(str(document.get(name, "")) for name in IDENTITY_FIELDS)
+    return _sha256(identity)[:24]
+
+
+def document_hash(document: Dict[str, Any]) -> str:
+    """Hash a document's full contents, including metadata."""
+    return _sha256(json.dumps(document, sort_keys=True, ensure_ascii=False))
+
+
+def chunk_hash(chunk: Dict[str, Any]) -> str:
+    """Hash a chunk's text and metadata, which together determine its stored vector record."""
+    return _sha256(json.dumps(
+        {"text": chunk["text"], "metadata": chunk["metadata"]},
+        sort_keys=True,
+        ensure_ascii=False
+    ))
+
+
+class IngestionManifest:
+    """
+    Record of what is in the vector store, keyed by document id.
+
+    Each document entry holds the document's content hash and a map of its
+    vector ids to chunk content hashes. Comparing a fresh chunking of the
+    corpus against it tells ingestion which chunks to embed and upsert and
+    which vector ids are orphaned and must be deleted.
+    """
+
+    def __init__(
+        self,
+        embedding_model: str = None,
+        vector_store: str = None,
+        documents: Dict[str, Dict[str, Any]] = None
+    ):
+        """
+        Initialize manifest.
+
+        Args:
+            embedding_model: Embedding model the recorded vectors were built with
+            vector_store: Name of the vector store the vectors were written to
+            documents: Map of document id to {"content_hash", "chunks": {vector_id: chunk_hash}}
+        """
+        self.embedding_model = embedding_model
+        self.vector_store = vector_store
+        self.documents = documents or {}
+
+    @classmethod
+    def load(cls, path: str) -> "IngestionManifest":
+        """
+        Load a manifest, returning an empty one if the file does not exist.
+
+        Args:
+            path: Manifest file path
+
+        Returns:
+            IngestionManifest instance
+        """
+        if not os.path.exists(path):
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        if saved.get("format") != MANIFEST_FORMAT:
+            return cls()
+        return cls(
+            embedding_model=saved.get("embedding_model"),
+            vector_store=saved.get("vector_store"),
+            documents=saved.get("documents")
+        )
+
+    def save(self, path: str) -> None:
+        """
+        Write the manifest atomically.
+
+        Args:
+            path: Manifest file path
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "format": MANIFEST_FORMAT,
+                "embedding_model": self.embedding_model,
+                "vector_store": self.vector_store,
+                "documents": self.documents
+            }, f)
+        os.replace(tmp_path, path)
+
+    def record_document(self, doc_id: str, content_hash: str, chunks: List[Dict[str, Any]]) -> bool:
+        """
+        Record a document and its chunks.
+
+        A document whose identity was already recorded is not recorded again,
+        so the first copy of a duplicated document wins.
+
+        Args:
+            doc_id: Document id
+            content_hash: Document content hash
+            chunks: The document's chunks, with ``id`` and ``content_hash`` set
+
+        Returns:
+            True if the document was recorded, False if it is a duplicate
+        """
+        if doc_id in self.documents:
+            return False
+        self.documents[doc_id] = {
+            "content_hash": content_hash,
+            "chunks": {chunk["id"]: chunk["content_hash"] for chunk in chunks}
+        }
+        return True
+
+    def vector_ids(self) -> Set[str]:
+        """Return every vector id recorded in the manifest."""
+        return {
+            vector_id
+            for entry in self.documents.values()
+            for vector_id in entry["chunks"]
+        }
+
+    def changed_chunks(self, chunks: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Select chunks that are new or whose content differs from the recorded hash.
+
+        Args:
+            chunks: Chunk dictionaries with ``id`` and ``content_hash`` set
+
+        Yields:
+            Chunks that need embedding and upserting
+        """
+        recorded = {}
+        for entry in self.documents.values():
+            recorded.update(entry["chunks"])
+        for chunk in chunks:
+            if recorded.get(chunk["id"]) != chunk["content_hash"]:
+                yield chunk
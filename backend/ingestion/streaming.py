@@ -0,0 +1,207 @@
+"""Streaming document readers and a bounded-queue pipeline for constant-memory ingestion."""
+import json
+import os
+import queue
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+
+DOCUMENT_EXTENSIONS = (".jsonl", ".json")
+
+_DONE = object()
+
+
+class _Failure:
+    """Carries an exception from a pipeline thread to the consumer."""
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+def iter_documents(source: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read documents one at a time from a JSONL file, a JSON file or a directory.
+
+    JSONL files are streamed line by line. JSON files may hold a single
+    document or an array of documents and are read whole, so large corpora
+    should use JSONL. Directories are walked recursively in sorted order.
+
+    Args:
+        source: Path to a .jsonl file, .json file or directory of them
+
+    Yields:
+        Document dictionaries
+    """
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(DOCUMENT_EXTENSIONS):
+                    yield from iter_documents(os.path.join(root, name))
+        return
+
+    with open(source, 'r', encoding='utf-8') as f:
+        if source.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        data = json.load(f)
+    if isinstance(data, list):
+        yield from data
+    else:
+        yield data
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Group an iterable into lists of at most ``size`` items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class SpillFile:
+    """
+    Append-only JSON-lines temporary file for records collected during a streaming run.
+
+    Records are written to disk as they arrive and read back in order, so
+    per-chunk data needed after the pipeline finishes does not accumulate in
+    memory. The file is deleted when closed.
+    """
+
+    def __init__(self, directory: str = None):
+        """
+        Create the spill file.
+
+        Args:
+            directory: Directory to create the file in (default: the system temp directory)
+        """
+        self._file = tempfile.TemporaryFile(mode="w+", encoding="utf-8", dir=directory)
+        self.count = 0
+
+    def append(self, record: Any) -> None:
+        """Write one JSON-serializable record."""
+        self._file.write(json.dumps(record) + "\n")
+        self.count += 1
+
+    def __iter__(self) -> Iterator[Any]:
+        """Read the records back from the start, in the order they were written."""
+        self._file.flush()
+        self._file.seek(0)
+        for line in self._file:
+            yield json.loads(line)
+        self._file.seek(0, os.SEEK_END)
+
+    def close(self) -> None:
+        """Delete the file."""
+        self._file.close()
+
+    def __enter__(self) -> "SpillFile":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _put(outbox: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """Put an item, giving up if the pipeline is stopping. Returns False if it gave up."""
+    while not stop.is_set():
+        try:
+            outbox.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(inbox: queue.Queue, stop: threading.Event) -> Any:
+    """Get an item, returning _DONE if the pipeline is stopping."""
+    while not stop.is_set():
+        try:
+            return inbox.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+def _feed(items: Iterable[Any], outbox: queue.Queue, stop: threading.Event) -> None:
+    try:
+        for item in items:
+            if not _put(outbox, item, stop):
+                return
+    except BaseException as e:
+        _put(outbox, _Failure(e), stop)
+        return
+    _put(outbox, _DONE, stop)
+
+
+def _work(
+    stage: Callable[[Any], Any],
+    inbox: queue.Queue,
+    outbox: queue.Queue,
+    stop: threading.Event
+) -> None:
+    while True:
+        item = _get(inbox, stop)
+        if item is _DONE or isinstance(item, _Failure):
+            _put(outbox, item, stop)
+            return
+        try:
+            result = stage(item)
+        except BaseException as e:
+            _put(outbox, _Failure(e), stop)
+            return
+        if not _put(outbox, result, stop):
+            return
+
+
+def run_pipeline(
+    items: Iterable[Any],
+    stages: List[Callable[[Any], Any]],
+    queue_size: int
+) -> Iterator[Any]:
+    """
+    Run items through stages, each on its own thread, joined by bounded queues.
+
+    The source iterable is consumed on a feeder thread, so generator work
+    (reading, chunking) overlaps with the stages. At most ``queue_size`` items
+    wait between any two stages, so memory is bounded by the queue sizes, not
+    the number of items. The first exception in any stage stops the pipeline
+    and is re-raised to the consumer.
+
+    Args:
+        items: Source iterable
+        stages: Functions applied in order, one thread each
+        queue_size: Maximum items buffered between adjacent stages
+
+    Yields:
+        Outputs of the last stage, in input order
+    """
+    stop = threading.Event()
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+    threads = [threading.Thread(target=_feed, args=(items, queues[0], stop), daemon=True)]
+    threads += [
+        threading.Thread(target=_work, args=(stage, queues[idx], queues[idx + 1], stop), daemon=True)
+        for idx, stage in enumerate(stages)
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            item = _get(queues[-1], stop)
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
@@ -1,14 +1,30 @@
 """Main FastAPI application entry point."""
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from backend.config import settings
-from backend.routes import health, chat
+from backend.routes import health, chat, metrics
+from backend.services.llm_provider import close_llm_registry
+from backend.services.metrics import MetricsMiddleware
+from backend.services.rag_pipeline import close_rag_graph
+from backend.services.retriever import close_retriever
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release long-lived clients and flush session checkpoints on shutdown."""
+    yield
+    await close_llm_registry()
+    await close_retriever()
+    await close_rag_graph()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Legal AI Research Assistant",
     description="RAG-powered legal research assistant for US case law",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS — supports comma-separated origins in FRONTEND_URL for production
@@ -26,11 +42,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After", "Server-Timing"],
 )
 
+# Time every request (added last so it also covers CORS handling)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(health.router)
 app.include_router(chat.router)
+if settings.metrics_enabled:
+    app.include_router(metrics.router)
 
 
 @app.get("/")
@@ -1,8 +1,15 @@
 """Chat endpoint for RAG-powered legal research."""
+import json
+import math
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
-from backend.services.rag_pipeline import run_rag_query
+from starlette.background import BackgroundTask
+from typing import Annotated, List, Dict, Any, Optional, AsyncIterator
+from backend.config import settings
+from backend.services.admission import AdmissionRejected, get_admission_controller, rate_limit_retry_after
+from backend.services.conversation_store import ConversationConflict, get_conversation_store
+from backend.services.rag_pipeline import run_rag_batch, run_rag_query, stream_rag_query
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
@@ -17,9 +24,14 @@ class ChatRequest(BaseModel):
     """Request model for chat endpoint."""
     session_id: str = Field(..., description="Unique session identifier for conversation memory")
     message: str = Field(..., description="User's question", min_length=1)
+    turn: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Completed turns the client has seen (the last response's turn); 409 if it differs from the server"
+    )
     conversation_history: Optional[List[ChatMessage]] = Field(
         default=None,
-        description="Optional conversation history for context"
+        description="Full conversation history, only needed to rehydrate a session the server does not have"
     )
 
     model_config = {
@@ -28,7 +40,30 @@ class ChatRequest(BaseModel):
                 {
                     "session_id": "550e8400-e29b-41d4-a716-446655440000",
                     "message": "What are the key principles of contract law consideration?",
-                    "conversation_history": []
+                    "turn": 0
+                }
+            ]
+        }
+    }
+
+
+class BatchChatRequest(BaseModel):
+    """Request model for batch chat endpoint."""
+    questions: List[Annotated[str, Field(min_length=1)]] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.batch_max_questions,
+        description="Standalone questions, answered independently"
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "questions": [
+                        "What are the key principles of contract law consideration?",
+                        "When is time of the essence in a construction contract?"
+                    ]
                 }
             ]
         }
@@ -61,6 +96,13 @@ class ChatResponse(BaseModel):
     citations: List[Citation] = Field(..., description="Legal case citations referenced")
     retrieved_chunks: List[RetrievedChunk] = Field(..., description="Documents retrieved for context")
     disclaimer: str = Field(..., description="Legal disclaimer")
+    cached: bool = Field(False, description="Whether the answer was served from the semantic answer cache")
+    turn: int = Field(0, description="Completed turns in this session, including this one; send it back as the next request's turn")
+    provider: Optional[str] = Field(None, description="LLM provider that generated the answer (e.g. 'openai' or 'mistral')")
+    context: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Prompt context token usage and the ids of retrieved chunks included, truncated or omitted"
+    )
     error: Optional[str] = Field(None, description="Error message if any")
 
     model_config = {
@@ -94,57 +136,239 @@ LEGAL_DISCLAIMER = (
 )
 
 
+def _conversation_history_to_dicts(request: ChatRequest) -> Optional[List[Dict[str, str]]]:
+    """Convert request conversation history to the dict format used by the pipeline."""
+    if not request.conversation_history:
+        return None
+    return [
+        {"role": msg.role, "content": msg.content}
+        for msg in request.conversation_history
+    ]
+
+
+def _begin_turn(request: ChatRequest) -> List[Dict[str, str]]:
+    """
+    Reserve the request's turn in the server-side conversation store.
+
+    Returns:
+        Conversation history before this turn
+
+    Raises:
+        HTTPException: 409 if the session is unknown or the client's turn counter is stale
+    """
+    try:
+        return get_conversation_store().begin_turn(
+            request.session_id,
+            turn=request.turn,
+            history=_conversation_history_to_dicts(request)
+        )
+    except ConversationConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+async def _admit(request: ChatRequest) -> float:
+    """
+    Wait for a processing slot, releasing the reserved turn if none is granted.
+
+    Returns:
+        Slot start time, to pass to the admission controller's ``release``
+
+    Raises:
+        HTTPException: 429 with Retry-After if the wait queue is full or the wait times out
+    """
+    try:
+        return await get_admission_controller().acquire()
+    except BaseException as e:
+        get_conversation_store().abort_turn(request.session_id)
+        if isinstance(e, AdmissionRejected):
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+        raise
+
+
+def _build_chat_response(result: Dict[str, Any], turn: int) -> ChatResponse:
+    """Build a ChatResponse from a pipeline result dictionary."""
+    return ChatResponse(
+        answer=result["answer"],
+        confidence=result["confidence"],
+        confidence_score=result["confidence_score"],
+        retrieval_confidence=result.get("retrieval_confidence", 0.0),
+        llm_confidence=result.get("llm_confidence", 0.0),
+        citations=[Citation(**citation) for citation in result["citations"]],
+        retrieved_chunks=[
+            RetrievedChunk(text=chunk["text"], metadata=chunk["metadata"])
+            for chunk in result["retrieved_chunks"]
+        ],
+        disclaimer=LEGAL_DISCLAIMER,
+        cached=result.get("cached", False),
+        turn=turn,
+        provider=result.get("provider"),
+        context=result.get("context"),
+        error=result.get("error")
+    )
+
+
+def _format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Format a single Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 @router.post("", response_model=ChatResponse)
 async def chat(request: ChatRequest) -> ChatResponse:
     """
     Process a legal research question and return a citation-grounded answer.
 
+    Conversation history is kept server-side per session, so the client only
+    sends the new message and the ``turn`` from the previous response.
+
     Args:
-        request: Chat request with question and conversation history
+        request: Chat request with question and turn counter
 
     Returns:
         ChatResponse with answer, confidence, and citations
 
     Raises:
-        HTTPException: If query processing fails
+        HTTPException: 409 on a stale or unknown session, 429 with Retry-After when
+            the service or the LLM provider is at capacity, 500 if query processing fails
     """
+    history = _begin_turn(request)
+    store = get_conversation_store()
+    admission = get_admission_controller()
+    started_at = await _admit(request)
+    completed = False
     try:
-        # Convert conversation history to dict format
-        conversation_history = None
-        if request.conversation_history:
-            conversation_history = [
-                {"role": msg.role, "content": msg.content}
-                for msg in request.conversation_history
-            ]
-
         # Run RAG query
         result = await run_rag_query(
             query=request.message,
             session_id=request.session_id,
-            conversation_history=conversation_history
+            conversation_history=history
         )
-
-        # Build response
-        return ChatResponse(
-            answer=result["answer"],
-            confidence=result["confidence"],
-            confidence_score=result["confidence_score"],
-            retrieval_confidence=result.get("retrieval_confidence", 0.0),
-            llm_confidence=result.get("llm_confidence", 0.0),
-            citations=[Citation(**citation) for citation in result["citations"]],
-            retrieved_chunks=[
-                RetrievedChunk(text=chunk["text"], metadata=chunk["metadata"])
-                for chunk in result["retrieved_chunks"]
-            ],
-            disclaimer=LEGAL_DISCLAIMER,
-            error=result.get("error")
-        )
-
+        turn = store.complete_turn(request.session_id, request.message, result["answer"])
+        completed = True
     except Exception as e:
+        if isinstance(e, AdmissionRejected):
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+        retry_after = rate_limit_retry_after(e)
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=429,
+                detail="LLM provider rate limit reached, please retry later",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+            )
         raise HTTPException(
             status_code=500,
             detail=f"Failed to process query: {str(e)}"
         )
+    finally:
+        admission.release(started_at)
+        # Also on cancellation (client disconnect, shutdown), which is not an Exception
+        if not completed:
+            store.abort_turn(request.session_id)
+
+    # Build response
+    return _build_chat_response(result, turn)
+
+
+@router.post("/stream")
+async def chat_stream(request: ChatRequest) -> StreamingResponse:
+    """
+    Process a legal research question, streaming progress as Server-Sent Events.
+
+    Emits ``node_start``/``node_end`` events as each pipeline node runs,
+    ``token`` events as the answer is generated, and a final ``result`` event
+    whose payload matches the ``POST /chat`` response. If processing fails,
+    an ``error`` event is sent instead of ``result``.
+
+    Args:
+        request: Chat request with question and turn counter
+
+    Returns:
+        StreamingResponse with ``text/event-stream`` content
+
+    Raises:
+        HTTPException: 409 on a stale or unknown session, 429 with Retry-After when
+            the service is at capacity
+    """
+    history = _begin_turn(request)
+    store = get_conversation_store()
+    admission = get_admission_controller()
+    started_at = await _admit(request)
+    completed = False
+    finished = False
+
+    def finish() -> None:
+        """Release the slot, and the reserved turn unless the answer was recorded. Runs once."""
+        nonlocal finished
+        if finished:
+            return
+        finished = True
+        admission.release(started_at)
+        if not completed:
+            store.abort_turn(request.session_id)
+
+    async def event_stream() -> AsyncIterator[str]:
+        nonlocal completed
+        try:
+            async for event in stream_rag_query(
+                query=request.message,
+                session_id=request.session_id,
+                conversation_history=history
+            ):
+                if event["event"] == "result":
+                    turn = store.complete_turn(request.session_id, request.message, event["data"]["answer"])
+                    completed = True
+                    response = _build_chat_response(event["data"], turn)
+                    yield _format_sse("result", response.model_dump())
+                else:
+                    yield _format_sse(event["event"], event["data"])
+        except Exception as e:
+            yield _format_sse("error", {"detail": f"Failed to process query: {str(e)}"})
+        finally:
+            finish()
+
+    # If the client disconnects before the body starts, the generator never runs
+    # its finally; the background task runs after the response either way
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(finish)
+    )
+
+
+@router.post("/batch")
+async def chat_batch(request: BatchChatRequest) -> StreamingResponse:
+    """
+    Answer many independent questions, streaming one NDJSON line per question.
+
+    Questions are embedded together, retrieved concurrently and generated
+    with bounded concurrency. Lines arrive in completion order, each carrying
+    the question's ``index`` and either a ``result`` shaped like the
+    ``POST /chat`` response or an ``error``. Each question is admitted like a
+    chat request while it generates, and one that is rejected for capacity
+    gets an ``error`` line. A failed question does not affect the others.
+
+    Args:
+        request: Batch of questions
+
+    Returns:
+        StreamingResponse with ``application/x-ndjson`` content
+    """
+    async def item_stream() -> AsyncIterator[str]:
+        async for item in run_rag_batch(request.questions):
+            line = {"index": item["index"]}
+            try:
+                if "error" in item:
+                    raise RuntimeError(item["error"])
+                line["result"] = _build_chat_response(item["result"], 0).model_dump()
+            except Exception as e:
+                line["error"] = f"Failed to process query: {str(e)}"
+            yield json.dumps(line) + "\n"
+
+    return StreamingResponse(
+        item_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.get("/test")
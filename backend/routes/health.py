@@ -11,22 +11,44 @@ async def health_check() -> Dict[str, Any]:
     Health check endpoint to verify service status.
 
     Returns:
-        Health status including Pinecone connection
+        Health status including vector store connection
     """
     try:
         from backend.services.retriever import get_retriever
+        from backend.services.answer_cache import get_answer_cache
+        from backend.services.admission import get_admission_controller, provider_limiter_stats
+        from backend.services.hedging import get_first_token_latency
+        from backend.services.rag_pipeline import get_query_flights, get_rag_graph
 
-        # Check Pinecone connection
+        # Check vector store connection
         retriever = get_retriever()
-        pinecone_status = retriever.health_check()
+        vector_store_status = retriever.health_check()
 
         return {
-            "status": "healthy" if pinecone_status["status"] == "healthy" else "degraded",
+            "status": "healthy" if vector_store_status["status"] == "healthy" else "degraded",
             "service": "legal-ai-backend",
             "components": {
                 "api": "healthy",
-                "pinecone": pinecone_status
-            }
+                "vector_store": vector_store_status
+            },
+            "caches": {
+                "query_embeddings": retriever.embedding_cache.stats(),
+                "retrieval_results": retriever.result_cache.stats() if retriever.result_cache is not None else None,
+                "answers": {
+                    **get_answer_cache().stats.as_dict(),
+                    "size": len(get_answer_cache())
+                }
+            },
+            "coalescing": {
+                "queries": get_query_flights().stats(),
+                "retrieval": retriever.flights.stats()
+            },
+            "checkpointer": get_rag_graph().checkpointer.stats(),
+            "admission": {
+                "chat": get_admission_controller().stats(),
+                "llm_providers": provider_limiter_stats()
+            },
+            "hedging": get_first_token_latency().stats()
         }
     except Exception as e:
         return {
@@ -35,6 +57,6 @@ async def health_check() -> Dict[str, Any]:
             "error": str(e),
             "components": {
                 "api": "healthy",
-                "pinecone": "not_configured"
+                "vector_store": "not_configured"
             }
         }
@@ -0,0 +1,17 @@
+"""Prometheus metrics endpoint."""
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("")
+async def metrics() -> Response:
+    """
+    Expose pipeline metrics in the Prometheus text format.
+
+    Returns:
+        Node and external-call latency histograms, LLM token counts,
+        cache hit rates and in-flight request gauges
+    """
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,287 @@
+"""Admission control for chat requests and per-provider LLM concurrency and rate limits."""
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+from backend.config import settings
+from backend.services.rate_limit import TokenBucket
+
+
+class AdmissionRejected(Exception):
+    """The service is at capacity; the client should retry after ``retry_after`` seconds."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def rate_limit_retry_after(exc: Exception) -> Optional[float]:
+    """
+    Detect a vendor rate-limit error.
+
+    Args:
+        exc: Exception raised by an LLM or HTTP client
+
+    Returns:
+        Seconds the vendor asked to wait (default 1.0 if it did not say), or None if not a 429
+    """
+    response = getattr(exc, "response", None)
+    status = getattr(exc, "status_code", None) or getattr(response, "status_code", None)
+    if status != 429:
+        return None
+    try:
+        return max(float(response.headers.get("retry-after")), 0.0)
+    except (AttributeError, TypeError, ValueError):
+        return 1.0
+
+
+class AdmissionController:
+    """
+    Bounded-concurrency gate with a bounded wait queue for chat requests.
+
+    Up to ``max_concurrent`` requests run at once. Up to ``max_queue`` more
+    wait, in arrival order, for at most ``max_wait_seconds``. A request that
+    finds the queue full, or waits too long, is rejected with a
+    ``Retry-After`` estimated from recent service times. Under overload the
+    service stays busy while excess requests fail fast, instead of every
+    request slowing down together.
+    """
+
+    def __init__(self, max_concurrent: int = None, max_queue: int = None, max_wait_seconds: float = None):
+        """
+        Initialize admission controller.
+
+        Args:
+            max_concurrent: Requests processed at once (default from settings)
+            max_queue: Requests allowed to wait for a slot (default from settings)
+            max_wait_seconds: Longest a request waits for a slot (default from settings)
+        """
+        self.max_concurrent = max_concurrent or settings.chat_max_concurrency
+        self.max_queue = settings.chat_max_queue if max_queue is None else max_queue
+        self.max_wait_seconds = max_wait_seconds or settings.chat_max_queue_seconds
+        self.active = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._service_seconds = 1.0  # Moving average of time a slot is held
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    def retry_after(self) -> int:
+        """Estimate whole seconds until a slot frees up for a new request."""
+        backlog = (len(self._waiters) + 1) / self.max_concurrent
+        return max(1, math.ceil(backlog * self._service_seconds))
+
+    async def acquire(self) -> float:
+        """
+        Wait for a processing slot.
+
+        Returns:
+            Monotonic time the slot was granted, to pass to ``release``
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait exceeds ``max_wait_seconds``
+        """
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return time.monotonic()
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise AdmissionRejected("Server is at capacity, please retry later", self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.max_wait_seconds)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as we gave up; pass it on
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                self.timed_out += 1
+                raise AdmissionRejected("Timed out waiting for capacity, please retry later", self.retry_after())
+            raise
+
+        self.admitted += 1
+        return time.monotonic()
+
+    def release(self, started_at: Optional[float] = None) -> None:
+        """
+        Free a slot, handing it to the longest-waiting request if any.
+
+        Args:
+            started_at: Value returned by ``acquire``, used to track service time
+        """
+        if started_at is not None:
+            self._service_seconds = 0.9 * self._service_seconds + 0.1 * (time.monotonic() - started_at)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """Hold a processing slot for the duration of the block."""
+        started_at = await self.acquire()
+        try:
+            yield
+        finally:
+            self.release(started_at)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return slot usage, queue depth and rejection counters."""
+        return {
+            "active": self.active,
+            "queued": len(self._waiters),
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_service_seconds": round(self._service_seconds, 3)
+        }
+
+
+class ProviderLimiter:
+    """
+    Concurrency and rate limits for one LLM provider.
+
+    Each call holds a concurrency slot and takes one request from the
+    requests-per-minute bucket and its estimated tokens from the
+    tokens-per-minute bucket. A call that cannot get all three within
+    ``max_wait_seconds`` is rejected straight away rather than queued
+    behind the quota. A vendor 429 drains both buckets for the requested
+    back-off, so every caller slows down together instead of each
+    retrying into the same wall.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        max_wait_seconds: float = None
+    ):
+        """
+        Initialize provider limiter.
+
+        Args:
+            max_concurrency: Calls in flight at once
+            requests_per_minute: Request quota (0 disables)
+            tokens_per_minute: Token quota (0 disables)
+            max_wait_seconds: Longest a call waits for a slot and quota (default from settings)
+        """
+        self.max_concurrency = max_concurrency
+        self.requests = TokenBucket.per_minute(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket.per_minute(tokens_per_minute) if tokens_per_minute else None
+        self.max_wait_seconds = max_wait_seconds or settings.chat_max_queue_seconds
+        self.in_flight = 0
+        self.throttled = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _acquire(self, tokens: int) -> None:
+        """Take a concurrency slot and quota, or raise AdmissionRejected if that would exceed ``max_wait_seconds``."""
+        deadline = time.monotonic() + self.max_wait_seconds
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.max_wait_seconds)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise AdmissionRejected("LLM provider is at capacity, please retry later", 1)
+
+        try:
+            for bucket, amount in ((self.requests, 1), (self.tokens, tokens)):
+                if bucket is None:
+                    continue
+                wait = await bucket.aacquire(amount, max_wait=max(0.0, deadline - time.monotonic()))
+                if wait:
+                    self.rejected += 1
+                    raise AdmissionRejected("LLM provider quota exhausted, please retry later", math.ceil(wait))
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    @asynccontextmanager
+    async def slot(self, tokens: int) -> AsyncIterator[None]:
+        """
+        Hold a concurrency slot and quota for one call.
+
+        Args:
+            tokens: Estimated prompt plus completion tokens of the call
+
+        Raises:
+            AdmissionRejected: If the slot and quota are not available within ``max_wait_seconds``
+        """
+        await self._acquire(tokens)
+        self.in_flight += 1
+        try:
+            yield
+        except Exception as e:
+            retry_after = rate_limit_retry_after(e)
+            if retry_after is not None:
+                self.throttled += 1
+                for bucket in (self.requests, self.tokens):
+                    if bucket is not None:
+                        bucket.pause(retry_after)
+            raise
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return in-flight calls, vendor throttling and local rejection counts."""
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "throttled": self.throttled,
+            "rejected": self.rejected
+        }
+
+
+# Global admission controller and per-provider limiters
+_admission_controller_instance = None
+_provider_limiters: Dict[str, ProviderLimiter] = {}
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get or create global admission controller instance."""
+    global _admission_controller_instance
+    if _admission_controller_instance is None:
+        _admission_controller_instance = AdmissionController()
+    return _admission_controller_instance
+
+
+def get_provider_limiter(provider_key: str) -> ProviderLimiter:
+    """
+    Get or create the limiter for an LLM provider.
+
+    Limits come from the ``<provider>_max_concurrency``,
+    ``<provider>_requests_per_minute`` and ``<provider>_tokens_per_minute``
+    settings. Providers without settings are only capped in concurrency.
+
+    Args:
+        provider_key: Provider key, e.g. 'openai' or 'mistral'
+
+    Returns:
+        Shared ProviderLimiter for the provider
+    """
+    limiter = _provider_limiters.get(provider_key)
+    if limiter is None:
+        limiter = _provider_limiters[provider_key] = ProviderLimiter(
+            max_concurrency=getattr(settings, f"{provider_key}_max_concurrency", settings.chat_max_concurrency),
+            requests_per_minute=getattr(settings, f"{provider_key}_requests_per_minute", 0),
+            tokens_per_minute=getattr(settings, f"{provider_key}_tokens_per_minute", 0)
+        )
+    return limiter
+
+
+def provider_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Return stats of every provider limiter created so far."""
+    return {provider_key: limiter.stats() for provider_key, limiter in _provider_limiters.items()}
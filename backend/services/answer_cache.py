@@ -0,0 +1,153 @@
+"""Semantic answer cache keyed on rewritten-query embeddings."""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import numpy as np
+from backend.config import settings
+from backend.services.cache import CacheStats
+from backend.services.index_version import get_index_version
+from backend.services.metrics import register_cache
+
+
+class SemanticAnswerCache:
+    """
+    Cache of answered queries matched by embedding similarity.
+
+    Embeddings are kept as unit vectors in a fixed-capacity matrix so a lookup
+    is a single matrix-vector product. The least recently used entry is evicted
+    when the cache is full, and all entries are dropped when the index version
+    changes (i.e. after a re-ingestion).
+    """
+
+    def __init__(
+        self,
+        max_size: int = None,
+        similarity_threshold: float = None,
+        ttl_seconds: float = None
+    ):
+        """
+        Initialize answer cache.
+
+        Args:
+            max_size: Maximum number of cached answers (default from settings)
+            similarity_threshold: Minimum cosine similarity for a hit (default from settings)
+            ttl_seconds: Entry lifetime in seconds (default from settings)
+        """
+        self.max_size = max_size or settings.answer_cache_size
+        self.similarity_threshold = similarity_threshold or settings.answer_cache_similarity_threshold
+        self.ttl_seconds = ttl_seconds or settings.answer_cache_ttl_seconds
+        self.stats = CacheStats()
+        self._matrix: Optional[np.ndarray] = None
+        self._payloads: List[Optional[Dict[str, Any]]] = [None] * self.max_size
+        self._created_at = np.zeros(self.max_size, dtype=np.float64)
+        self._valid = np.zeros(self.max_size, dtype=bool)
+        self._lru: "OrderedDict[int, None]" = OrderedDict()
+        self._index_version = get_index_version()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _check_index_version(self) -> None:
+        """Drop every entry if the index has been re-ingested. Caller holds the lock."""
+        version = get_index_version()
+        if version != self._index_version:
+            self._clear()
+            self._index_version = version
+
+    def _clear(self) -> None:
+        self._valid[:] = False
+        self._payloads = [None] * self.max_size
+        self._lru.clear()
+
+    def lookup(self, embedding: List[float]) -> Optional[Dict[str, Any]]:
+        """
+        Find a cached answer for a semantically equivalent query.
+
+        Args:
+            embedding: Embedding of the rewritten query
+
+        Returns:
+            Copy of the cached payload, or None if no entry is similar enough
+        """
+        query = self._normalize(embedding)
+        with self._lock:
+            self._check_index_version()
+            if self._matrix is None or not self._lru:
+                self.stats.misses += 1
+                return None
+
+            # Expire stale entries before scoring
+            expired = self._valid & (time.time() - self._created_at > self.ttl_seconds)
+            for slot in np.flatnonzero(expired):
+                self._release(int(slot))
+
+            scores = self._matrix @ query
+            scores[~self._valid] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] < self.similarity_threshold:
+                self.stats.misses += 1
+                return None
+
+            self._lru.move_to_end(best)
+            self.stats.hits += 1
+            return copy.deepcopy(self._payloads[best])
+
+    def store(self, embedding: List[float], payload: Dict[str, Any]) -> None:
+        """
+        Cache an answer for a query embedding.
+
+        Args:
+            embedding: Embedding of the rewritten query
+            payload: Answer, citations, retrieved chunks and confidence to return on a hit
+        """
+        vector = self._normalize(embedding)
+        with self._lock:
+            self._check_index_version()
+            if self._matrix is None:
+                self._matrix = np.zeros((self.max_size, vector.shape[0]), dtype=np.float32)
+
+            free_slots = np.flatnonzero(~self._valid)
+            if len(free_slots):
+                slot = int(free_slots[0])
+            else:
+                slot, _ = self._lru.popitem(last=False)
+                self.stats.evictions += 1
+
+            self._matrix[slot] = vector
+            self._payloads[slot] = copy.deepcopy(payload)
+            self._created_at[slot] = time.time()
+            self._valid[slot] = True
+            self._lru[slot] = None
+            self._lru.move_to_end(slot)
+
+    def _release(self, slot: int) -> None:
+        self._valid[slot] = False
+        self._payloads[slot] = None
+        self._lru.pop(slot, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._clear()
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+
+# Global answer cache instance
+_answer_cache_instance = None
+
+
+def get_answer_cache() -> SemanticAnswerCache:
+    """Get or create global answer cache instance."""
+    global _answer_cache_instance
+    if _answer_cache_instance is None:
+        _answer_cache_instance = SemanticAnswerCache()
+        register_cache("answers", _answer_cache_instance.stats.as_dict)
+    return _answer_cache_instance
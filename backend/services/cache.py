@@ -0,0 +1,462 @@
+"""In-process caches with bounded size, TTL expiry and hit/miss statistics."""
+import asyncio
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+from backend.config import settings
+from backend.services.index_version import get_index_version
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys: lowercase and collapse whitespace."""
+    return " ".join(text.lower().split())
+
+
+class CacheStats:
+    """Hit/miss/eviction counters for a cache."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that were hits (0-1)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters as a dictionary."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate, 4)
+        }
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with a maximum size and per-entry time-to-live.
+
+    The least recently used entry is evicted when the cache is full, and
+    entries older than the TTL are treated as misses and dropped on access.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: Optional[float] = None):
+        """
+        Initialize cache.
+
+        Args:
+            max_size: Maximum number of entries
+            ttl_seconds: Entry lifetime in seconds (None for no expiry)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a value, refreshing its recency.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            created_at, value = entry
+            if self.ttl_seconds is not None and time.monotonic() - created_at > self.ttl_seconds:
+                del self._entries[key]
+                self.stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entries if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class EmbeddingCache:
+    """
+    Cache of query embeddings keyed on embedding model and normalized query text.
+
+    Lookups go to a bounded in-memory LRU first and then, if configured, to a
+    persistent SQLite tier that survives restarts. Disk rows record when they
+    were last used; rows unused for ``disk_ttl_seconds`` and the least recently
+    used rows beyond ``disk_max_entries`` are pruned as new rows are written.
+    The ``a``-prefixed methods run disk access on a worker thread.
+    """
+
+    # Writes between prunes of the SQLite tier
+    _PRUNE_INTERVAL = 256
+    # Keys per SELECT, under SQLite's bound-parameter limit
+    _LOOKUP_BATCH_SIZE = 500
+
+    def __init__(
+        self,
+        max_size: int = None,
+        ttl_seconds: float = None,
+        path: str = None,
+        disk_max_entries: int = None,
+        disk_ttl_seconds: float = None
+    ):
+        """
+        Initialize embedding cache.
+
+        Args:
+            max_size: Maximum in-memory entries (default from settings)
+            ttl_seconds: In-memory entry lifetime (default from settings)
+            path: SQLite file for the persistent tier (default from settings, empty disables it)
+            disk_max_entries: Maximum rows in the SQLite tier (default from settings)
+            disk_ttl_seconds: Lifetime of unused rows in the SQLite tier (default from settings)
+        """
+        self.memory = TTLCache(
+            max_size=max_size or settings.embedding_cache_size,
+            ttl_seconds=ttl_seconds or settings.embedding_cache_ttl_seconds
+        )
+        self.disk_max_entries = disk_max_entries or settings.embedding_cache_disk_max_entries
+        self.disk_ttl_seconds = disk_ttl_seconds or settings.embedding_cache_disk_ttl_seconds
+        self.disk_hits = 0
+        self.disk_evictions = 0
+        self._writes_since_prune = 0
+        self._disk_lock = threading.Lock()
+        self._disk: Optional[sqlite3.Connection] = None
+
+        path = settings.embedding_cache_path if path is None else path
+        if path:
+            self._disk = sqlite3.connect(path, check_same_thread=False)
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            columns = {row[1] for row in self._disk.execute("PRAGMA table_info(embeddings)")}
+            if "last_used" not in columns:
+                # Rows from before pruning existed count as used now
+                self._disk.execute("ALTER TABLE embeddings ADD COLUMN last_used REAL NOT NULL DEFAULT 0")
+                self._disk.execute("UPDATE embeddings SET last_used = ?", (time.time(),))
+            self._disk.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)"
+            )
+            self._disk.commit()
+            self._prune()
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """Build the cache key for a model and query text."""
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{model}:{digest}"
+
+    # --- SQLite tier -------------------------------------------------------
+
+    def _disk_get(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Read embeddings from SQLite, refresh their last use and copy them into memory."""
+        found = {}
+        now = time.time()
+        with self._disk_lock:
+            for start in range(0, len(keys), self._LOOKUP_BATCH_SIZE):
+                batch = keys[start:start + self._LOOKUP_BATCH_SIZE]
+                rows = self._disk.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({', '.join('?' * len(batch))}) "
+                    "AND last_used >= ?",
+                    (*batch, now - self.disk_ttl_seconds)
+                ).fetchall()
+                found.update((key, array("f", vector).tolist()) for key, vector in rows)
+            if found:
+                self._disk.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._disk.commit()
+            self.disk_hits += len(found)
+        for key, vector in found.items():
+            self.memory.set(key, vector)
+        return found
+
+    def _disk_set(self, items: Dict[str, List[float]]) -> None:
+        """Write embeddings to SQLite, pruning every ``_PRUNE_INTERVAL`` writes."""
+        now = time.time()
+        with self._disk_lock:
+            self._disk.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                [(key, array("f", vector).tobytes(), now) for key, vector in items.items()]
+            )
+            self._disk.commit()
+            self._writes_since_prune += len(items)
+            if self._writes_since_prune < self._PRUNE_INTERVAL:
+                return
+        self._prune()
+
+    def _prune(self) -> None:
+        """Delete expired rows, then the least recently used rows beyond ``disk_max_entries``."""
+        with self._disk_lock:
+            self._writes_since_prune = 0
+            deleted = self._disk.execute(
+                "DELETE FROM embeddings WHERE last_used < ?", (time.time() - self.disk_ttl_seconds,)
+            ).rowcount
+            excess = self._disk.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] - self.disk_max_entries
+            if excess > 0:
+                deleted += self._disk.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (excess,)
+                ).rowcount
+            self._disk.commit()
+            self.disk_evictions += deleted
+
+    # --- Lookups -----------------------------------------------------------
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        """
+        Look up a cached embedding.
+
+        Args:
+            model: Embedding model name
+            text: Query text
+
+        Returns:
+            Embedding vector, or None on a miss
+        """
+        key = self.make_key(model, text)
+        vector = self.memory.get(key)
+        if vector is not None or self._disk is None:
+            return vector
+        return self._disk_get([key]).get(key)
+
+    async def aget(self, model: str, text: str) -> Optional[List[float]]:
+        """Look up a cached embedding, reading the SQLite tier on a worker thread."""
+        return (await self.aget_many(model, [text]))[0]
+
+    async def aget_many(self, model: str, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Look up cached embeddings for many texts, with one SQLite read for the memory misses.
+
+        Args:
+            model: Embedding model name
+            texts: Query texts
+
+        Returns:
+            Embedding vectors, or None for misses, one per text
+        """
+        keys = [self.make_key(model, text) for text in texts]
+        vectors = [self.memory.get(key) for key in keys]
+        missing = [key for key, vector in zip(keys, vectors) if vector is None]
+        if missing and self._disk is not None:
+            found = await asyncio.to_thread(self._disk_get, missing)
+            vectors = [found.get(key) if vector is None else vector for key, vector in zip(keys, vectors)]
+        return vectors
+
+    def set(self, model: str, text: str, vector: List[float]) -> None:
+        """
+        Store an embedding in both tiers.
+
+        Args:
+            model: Embedding model name
+            text: Query text
+            vector: Embedding vector
+        """
+        key = self.make_key(model, text)
+        self.memory.set(key, vector)
+        if self._disk is not None:
+            self._disk_set({key: vector})
+
+    async def aset(self, model: str, text: str, vector: List[float]) -> None:
+        """Store an embedding in both tiers, writing the SQLite tier on a worker thread."""
+        await self.aset_many(model, {text: vector})
+
+    async def aset_many(self, model: str, vectors: Dict[str, List[float]]) -> None:
+        """
+        Store embeddings for many texts in both tiers, with one SQLite write.
+
+        Args:
+            model: Embedding model name
+            vectors: Embedding vector by query text
+        """
+        items = {self.make_key(model, text): vector for text, vector in vectors.items()}
+        for key, vector in items.items():
+            self.memory.set(key, vector)
+        if items and self._disk is not None:
+            await asyncio.to_thread(self._disk_set, items)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cache statistics.
+
+        A lookup that misses memory but hits disk counts as a memory miss and a disk hit.
+
+        Returns:
+            Dictionary of hit/miss counters and sizes
+        """
+        memory_stats = self.memory.stats
+        total = memory_stats.hits + memory_stats.misses
+        hits = memory_stats.hits + self.disk_hits
+        return {
+            **memory_stats.as_dict(),
+            "disk_hits": self.disk_hits,
+            "disk_evictions": self.disk_evictions,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "size": len(self.memory),
+            "persistent": self._disk is not None
+        }
+
+
+class RetrievalCache:
+    """
+    Cache of top-k retrieval results keyed on query embedding, top_k and filter.
+
+    Entries are bounded by their total serialized size and evicted least
+    recently used first. Every entry belongs to the index version current
+    when it was stored, and the whole cache is dropped as soon as ingestion
+    records a new version, so results never outlive the corpus they came from.
+    """
+
+    def __init__(self, max_bytes: int = None, ttl_seconds: float = None):
+        """
+        Initialize retrieval cache.
+
+        Args:
+            max_bytes: Cap on the serialized size of cached results (default from settings)
+            ttl_seconds: Entry lifetime in seconds (default from settings)
+        """
+        self.max_bytes = max_bytes or settings.retrieval_cache_max_bytes
+        self.ttl_seconds = ttl_seconds or settings.retrieval_cache_ttl_seconds
+        self._stats = CacheStats()
+        self.invalidations = 0
+        self._entries: "OrderedDict[str, tuple[float, int, List[Dict[str, Any]]]]" = OrderedDict()
+        self._bytes = 0
+        self._index_version = get_index_version()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        embedding: List[float],
+        top_k: int,
+        filter_dict: Optional[Dict[str, Any]] = None,
+        query: Optional[str] = None
+    ) -> str:
+        """
+        Build the cache key for a retrieval request.
+
+        Args:
+            embedding: Query embedding
+            top_k: Number of results requested
+            filter_dict: Metadata filters
+            query: Query text, for rankers that see more than the embedding (e.g. BM25)
+
+        Returns:
+            Hex digest identifying the request
+        """
+        digest = hashlib.sha256(array("f", embedding).tobytes())
+        digest.update(json.dumps([top_k, filter_dict], sort_keys=True, default=str).encode("utf-8"))
+        if query is not None:
+            digest.update(normalize_text(query).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _check_index_version(self) -> None:
+        """Drop every entry if the index has been re-ingested. Caller holds the lock."""
+        version = get_index_version()
+        if version != self._index_version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+            self._index_version = version
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up cached matches.
+
+        Args:
+            key: Key from ``make_key``
+
+        Returns:
+            Copy of the cached match list, or None on a miss
+        """
+        with self._lock:
+            self._check_index_version()
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                self._bytes -= entry[1]
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return copy.deepcopy(entry[2])
+
+    def set(self, key: str, matches: List[Dict[str, Any]]) -> None:
+        """
+        Store matches, evicting the least recently used entries while over the byte cap.
+
+        Args:
+            key: Key from ``make_key``
+            matches: Match dictionaries with id, score and metadata
+        """
+        size = len(json.dumps(matches, default=str))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._check_index_version()
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (time.monotonic(), size, copy.deepcopy(matches))
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, size and invalidation count."""
+        with self._lock:
+            return {
+                **self._stats.as_dict(),
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
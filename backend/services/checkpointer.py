@@ -0,0 +1,369 @@
+"""Bounded LangGraph checkpointer with per-session TTL, LRU memory cap and optional SQLite tier."""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+from langgraph.checkpoint.memory import MemorySaver
+from backend.config import settings
+
+
+class _ThreadUsage:
+    """Bookkeeping for one thread: recency, size and the writes/blobs keys it owns."""
+
+    __slots__ = ("last_access", "bytes", "write_keys", "blob_keys")
+
+    def __init__(self):
+        self.last_access = time.monotonic()
+        self.bytes = 0
+        self.write_keys: set = set()
+        self.blob_keys: set = set()
+
+
+class BoundedMemorySaver(MemorySaver):
+    """
+    MemorySaver that keeps process memory flat for a long-running service.
+
+    - Threads idle for longer than ``ttl_seconds`` are dropped.
+    - Once the serialized size of all threads exceeds ``max_bytes``, the
+      least recently used threads are evicted.
+    - Only the newest ``max_history`` checkpoints per thread are kept,
+      together with the writes and channel blobs they reference.
+
+    With a ``path``, every checkpoint and pending write also writes the
+    thread's serialized state to SQLite. Evicted threads (and threads from
+    before a restart) are then restored on their next access, until the TTL
+    lapses. Snapshots are written behind: ``put`` and ``put_writes`` only
+    queue them, and a writer thread commits the latest snapshot of every
+    queued thread in one transaction every ``flush_seconds``, so the event
+    loop never waits on disk.
+    """
+
+    _SWEEP_INTERVAL_SECONDS = 60.0
+
+    def __init__(
+        self,
+        ttl_seconds: float = None,
+        max_bytes: int = None,
+        max_history: int = None,
+        path: str = None,
+        flush_seconds: float = None
+    ):
+        """
+        Initialize checkpointer.
+
+        Args:
+            ttl_seconds: Idle lifetime of a session's checkpoints (default from settings)
+            max_bytes: Cap on serialized checkpoint bytes held in memory (default from settings)
+            max_history: Checkpoints kept per thread (default from settings)
+            path: SQLite file for the persistent tier (default from settings, empty disables it)
+            flush_seconds: Delay before queued snapshots are committed to SQLite (default from settings)
+        """
+        super().__init__()
+        self.ttl_seconds = ttl_seconds or settings.checkpoint_ttl_seconds
+        self.max_bytes = max_bytes or settings.checkpoint_max_bytes
+        self.max_history = max_history or settings.checkpoint_max_history
+        self.evictions = 0
+        self.restores = 0
+        self._threads: "OrderedDict[str, _ThreadUsage]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self._disk: Optional[sqlite3.Connection] = None
+        self.flush_seconds = settings.checkpoint_flush_seconds if flush_seconds is None else flush_seconds
+        # Thread id -> row awaiting commit, or None for a pending delete
+        self._pending: Dict[str, Optional[Tuple[float, str, bytes]]] = {}
+        # Rows taken by the writer whose commit has not finished
+        self._flushing: Dict[str, Optional[Tuple[float, str, bytes]]] = {}
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+
+        self.path = settings.checkpoint_sqlite_path if path is None else path
+        if self.path:
+            self._disk = self._connect()
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoint_threads "
+                "(thread_id TEXT PRIMARY KEY, updated_at REAL NOT NULL, payload_type TEXT NOT NULL, payload BLOB NOT NULL)"
+            )
+            self._disk.execute(
+                "CREATE INDEX IF NOT EXISTS checkpoint_threads_updated_at ON checkpoint_threads (updated_at)"
+            )
+            self._disk.commit()
+            self._writer = threading.Thread(target=self._write_behind, name="checkpoint-writer", daemon=True)
+            self._writer.start()
+
+    # --- Bookkeeping -------------------------------------------------------
+
+    def _usage(self, thread_id: str) -> _ThreadUsage:
+        usage = self._threads.get(thread_id)
+        if usage is None:
+            usage = self._threads[thread_id] = _ThreadUsage()
+        usage.last_access = time.monotonic()
+        self._threads.move_to_end(thread_id)
+        return usage
+
+    def _measure(self, thread_id: str, usage: _ThreadUsage) -> None:
+        """Recompute a thread's serialized size."""
+        size = 0
+        for checkpoints in self.storage.get(thread_id, {}).values():
+            for checkpoint, metadata, _ in checkpoints.values():
+                size += len(checkpoint[1]) + len(metadata[1])
+        for key in usage.write_keys:
+            size += sum(len(write[2][1]) for write in self.writes.get(key, {}).values())
+        for key in usage.blob_keys:
+            size += len(self.blobs[key][1])
+        self._total_bytes += size - usage.bytes
+        usage.bytes = size
+
+    def _trim_history(self, thread_id: str, checkpoint_ns: str, usage: _ThreadUsage) -> None:
+        """Drop checkpoints beyond ``max_history`` and the writes and blobs only they referenced."""
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        if len(checkpoints) <= self.max_history:
+            return
+
+        for checkpoint_id in sorted(checkpoints)[:-self.max_history]:
+            del checkpoints[checkpoint_id]
+            key = (thread_id, checkpoint_ns, checkpoint_id)
+            self.writes.pop(key, None)
+            usage.write_keys.discard(key)
+
+        live = set()
+        for checkpoint, _, _ in checkpoints.values():
+            versions = self.serde.loads_typed(checkpoint)["channel_versions"]
+            live.update((thread_id, checkpoint_ns, channel, version) for channel, version in versions.items())
+        for key in [key for key in usage.blob_keys if key[1] == checkpoint_ns and key not in live]:
+            del self.blobs[key]
+            usage.blob_keys.discard(key)
+
+    def _drop(self, thread_id: str) -> None:
+        """Remove a thread from memory (the SQLite tier is untouched)."""
+        usage = self._threads.pop(thread_id, None)
+        self.storage.pop(thread_id, None)
+        if usage is None:
+            return
+        for key in usage.write_keys:
+            self.writes.pop(key, None)
+        for key in usage.blob_keys:
+            self.blobs.pop(key, None)
+        self._total_bytes -= usage.bytes
+
+    def _evict(self) -> None:
+        """Drop expired threads, then least recently used threads while over the memory cap."""
+        now = time.monotonic()
+        while self._threads:
+            thread_id, usage = next(iter(self._threads.items()))
+            if now - usage.last_access <= self.ttl_seconds:
+                break
+            self._drop(thread_id)
+            self.evictions += 1
+
+        # Never evict the most recent thread, which is the one being written
+        while self._total_bytes > self.max_bytes and len(self._threads) > 1:
+            self._drop(next(iter(self._threads)))
+            self.evictions += 1
+
+    # --- SQLite tier -------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the SQLite tier. WAL lets restores read while the writer commits."""
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def _write_behind(self) -> None:
+        """Writer thread: commit queued snapshots every ``flush_seconds`` and sweep expired threads."""
+        disk = self._connect()
+        last_sweep = time.monotonic()
+        try:
+            while not self._closed:
+                self._wake.wait(self.flush_seconds)
+                self._wake.clear()
+                self._flush(disk)
+                if time.monotonic() - last_sweep > self._SWEEP_INTERVAL_SECONDS:
+                    last_sweep = time.monotonic()
+                    disk.execute("DELETE FROM checkpoint_threads WHERE updated_at < ?", (time.time() - self.ttl_seconds,))
+                    disk.commit()
+            self._flush(disk)
+        finally:
+            disk.close()
+
+    def _flush(self, disk: sqlite3.Connection) -> None:
+        """Commit every queued snapshot and delete in one transaction."""
+        with self._lock:
+            self._flushing, self._pending = self._pending, {}
+        if not self._flushing:
+            return
+        try:
+            disk.executemany(
+                "INSERT OR REPLACE INTO checkpoint_threads (thread_id, updated_at, payload_type, payload) "
+                "VALUES (?, ?, ?, ?)",
+                [(thread_id, *row) for thread_id, row in self._flushing.items() if row is not None]
+            )
+            disk.executemany(
+                "DELETE FROM checkpoint_threads WHERE thread_id = ?",
+                [(thread_id,) for thread_id, row in self._flushing.items() if row is None]
+            )
+            disk.commit()
+        finally:
+            with self._lock:
+                self._flushing = {}
+
+    def _queued_row(self, thread_id: str) -> Tuple[bool, Optional[Tuple[float, str, bytes]]]:
+        """Return (queued, row) for a thread's snapshot that has not been committed yet."""
+        for queue in (self._pending, self._flushing):
+            if thread_id in queue:
+                return True, queue[thread_id]
+        return False, None
+
+    def close(self) -> None:
+        """Stop the writer thread after it commits everything queued."""
+        if self._writer is None:
+            return
+        self._closed = True
+        self._wake.set()
+        self._writer.join()
+        self._writer = None
+        self._disk.close()
+
+    def _persist(self, thread_id: str, usage: _ThreadUsage) -> None:
+        """Queue a thread's serialized checkpoints, writes and blobs for the SQLite writer."""
+        snapshot = {
+            "storage": [
+                [checkpoint_ns, checkpoint_id, list(checkpoint), list(metadata), parent]
+                for checkpoint_ns, checkpoints in self.storage[thread_id].items()
+                for checkpoint_id, (checkpoint, metadata, parent) in checkpoints.items()
+            ],
+            "writes": [
+                [key[1], key[2], inner[0], inner[1], task_id, channel, list(value), task_path]
+                for key in usage.write_keys
+                for inner, (task_id, channel, value, task_path) in self.writes.get(key, {}).items()
+            ],
+            "blobs": [[key[1], key[2], key[3], list(self.blobs[key])] for key in usage.blob_keys]
+        }
+        payload_type, payload = self.serde.dumps_typed(snapshot)
+        self._pending[thread_id] = (time.time(), payload_type, payload)
+
+    def _restore(self, thread_id: str) -> None:
+        """Load a thread that is not in memory from the write queue or SQLite, if it has not expired."""
+        # Callers hold the lock, so a snapshot is either queued or already committed
+        queued, row = self._queued_row(thread_id)
+        if not queued:
+            row = self._disk.execute(
+                "SELECT updated_at, payload_type, payload FROM checkpoint_threads WHERE thread_id = ?",
+                (thread_id,)
+            ).fetchone()
+        if row is None or row[0] < time.time() - self.ttl_seconds:
+            return
+
+        snapshot = self.serde.loads_typed((row[1], row[2]))
+        usage = self._usage(thread_id)
+        for checkpoint_ns, checkpoint_id, checkpoint, metadata, parent in snapshot["storage"]:
+            self.storage[thread_id][checkpoint_ns][checkpoint_id] = (tuple(checkpoint), tuple(metadata), parent)
+        for checkpoint_ns, checkpoint_id, task_id, idx, write_task_id, channel, value, task_path in snapshot["writes"]:
+            key = (thread_id, checkpoint_ns, checkpoint_id)
+            self.writes[key][(task_id, idx)] = (write_task_id, channel, tuple(value), task_path)
+            usage.write_keys.add(key)
+        for checkpoint_ns, channel, version, value in snapshot["blobs"]:
+            key = (thread_id, checkpoint_ns, channel, version)
+            self.blobs[key] = tuple(value)
+            usage.blob_keys.add(key)
+        self._measure(thread_id, usage)
+        self.restores += 1
+
+    # --- BaseCheckpointSaver ----------------------------------------------
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock:
+            usage = self._threads.get(thread_id)
+            if usage is not None and time.monotonic() - usage.last_access > self.ttl_seconds:
+                self._drop(thread_id)
+                usage = None
+            if usage is None and self._disk is not None:
+                self._restore(thread_id)
+
+            result = super().get_tuple(config)
+            if thread_id in self._threads:
+                usage = self._usage(thread_id)
+                if result is not None:
+                    # The base lookup creates the checkpoint's writes entry if it had none
+                    usage.write_keys.add((
+                        thread_id,
+                        config["configurable"].get("checkpoint_ns", ""),
+                        result.config["configurable"]["checkpoint_id"]
+                    ))
+            elif not any(self.storage.get(thread_id, {}).values()):
+                # The base lookup creates empty entries for unknown threads
+                self.storage.pop(thread_id, None)
+            return result
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        with self._lock:
+            result = super().put(config, checkpoint, metadata, new_versions)
+            usage = self._usage(thread_id)
+            usage.blob_keys.update(
+                (thread_id, checkpoint_ns, channel, version) for channel, version in new_versions.items()
+            )
+            self._trim_history(thread_id, checkpoint_ns, usage)
+            self._measure(thread_id, usage)
+            if self._disk is not None:
+                self._persist(thread_id, usage)
+            self._evict()
+            return result
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = ""
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        key = (
+            thread_id,
+            config["configurable"].get("checkpoint_ns", ""),
+            config["configurable"]["checkpoint_id"]
+        )
+        with self._lock:
+            super().put_writes(config, writes, task_id, task_path)
+            usage = self._usage(thread_id)
+            usage.write_keys.add(key)
+            self._measure(thread_id, usage)
+            if self._disk is not None:
+                # Pending writes let an interrupted run resume after a restart
+                self._persist(thread_id, usage)
+            self._evict()
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._drop(thread_id)
+            if self._disk is not None:
+                self._pending[thread_id] = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return thread count, memory use and eviction counters."""
+        with self._lock:
+            return {
+                "threads": len(self._threads),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "restores": self.restores,
+                "persistent": self._disk is not None,
+                "queued_writes": len(self._pending)
+            }
+
+
+def create_checkpointer() -> BoundedMemorySaver:
+    """Create the pipeline checkpointer from settings."""
+    return BoundedMemorySaver()
@@ -0,0 +1,148 @@
+"""Token-budgeted prompt context assembly with merging of consecutive chunks."""
+from typing import Any, Dict, List, Tuple
+from langchain_core.documents import Document
+from backend.config import settings
+# Budgets are counted with the same tokenizer the ingestion chunker sizes chunks with
+from backend.ingestion.chunker import count_tokens, get_encoding
+
+
+SEGMENT_SEPARATOR = "\n[...]\n"
+
+
+def merge_overlapping(previous: str, following: str, max_overlap_chars: int = 2000) -> str:
+    """
+    Join two consecutive chunks, dropping the text the second repeats from the first.
+
+    Args:
+        previous: Earlier chunk text
+        following: Next chunk text, which may start with the tail of ``previous``
+        max_overlap_chars: Longest overlap to look for
+
+    Returns:
+        Merged text
+    """
+    probe = following[:32]
+    search_from = max(0, len(previous) - max_overlap_chars)
+    position = previous.find(probe, search_from) if probe else -1
+    while position != -1:
+        overlap = len(previous) - position
+        if following.startswith(previous[position:]):
+            return previous + following[overlap:]
+        position = previous.find(probe, position + 1)
+    return f"{previous}\n{following}"
+
+
+def _chunk_key(doc: Document) -> str:
+    metadata = doc.metadata
+    return str(metadata.get("id") or f"{metadata.get('case_name', '')}#{metadata.get('chunk_id', '')}")
+
+
+def _case_key(doc: Document) -> Tuple[str, str]:
+    metadata = doc.metadata
+    return (metadata.get("doc_id") or metadata.get("case_name", ""), metadata.get("citation", ""))
+
+
+class ContextBuilder:
+    """
+    Builds the retrieved-cases section of the generation prompt under a token budget.
+
+    Chunks are grouped by case. Runs of consecutive ``chunk_id``s are merged
+    into one excerpt, with the overlap between neighbouring chunks dropped.
+    Cases are then added in retrieval rank order (best chunk first) until
+    the budget is spent. The case that crosses the budget is cut to fit, if
+    enough room is left to be useful, and the rest are left out.
+    """
+
+    def __init__(self, token_budget: int = None, min_truncated_tokens: int = None):
+        """
+        Initialize context builder.
+
+        Args:
+            token_budget: Maximum tokens of context (default from settings)
+            min_truncated_tokens: Smallest useful remainder for a truncated case (default from settings)
+        """
+        self.token_budget = token_budget or settings.context_token_budget
+        self.min_truncated_tokens = min_truncated_tokens or settings.context_min_truncated_tokens
+
+    def _case_blocks(self, documents: List[Document]) -> List[Dict[str, Any]]:
+        """Group documents into per-case blocks of merged excerpts, best-ranked case first."""
+        cases: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for rank, doc in enumerate(documents):
+            case = cases.setdefault(_case_key(doc), {"rank": rank, "metadata": doc.metadata, "chunks": []})
+            case["chunks"].append(doc)
+
+        blocks = []
+        for case in sorted(cases.values(), key=lambda c: c["rank"]):
+            chunks = sorted(case["chunks"], key=lambda d: d.metadata.get("chunk_id", 0))
+            segments, previous_id = [], None
+            for doc in chunks:
+                chunk_id = doc.metadata.get("chunk_id")
+                if segments and chunk_id is not None and previous_id is not None and chunk_id == previous_id + 1:
+                    segments[-1] = merge_overlapping(segments[-1], doc.page_content)
+                else:
+                    segments.append(doc.page_content)
+                previous_id = chunk_id
+
+            scores = [doc.metadata["score"] for doc in chunks if doc.metadata.get("score") is not None]
+            metadata = case["metadata"]
+            header = (
+                f"Case Name: {metadata.get('case_name', 'Unknown')}\n"
+                f"Court: {metadata.get('court', 'Unknown')}\n"
+                f"Date: {metadata.get('date', 'Unknown')}\n"
+                f"Citation: {metadata.get('citation', 'Unknown')}\n"
+            )
+            if scores:
+                header += f"Relevance Score: {max(scores):.2f}\n"
+            blocks.append({
+                "header": header,
+                "content": SEGMENT_SEPARATOR.join(segments),
+                "chunk_ids": [_chunk_key(doc) for doc in chunks]
+            })
+        return blocks
+
+    def build(self, documents: List[Document]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Format documents as prompt context within the token budget.
+
+        Args:
+            documents: Retrieved chunks, best first
+
+        Returns:
+            Tuple of (context text, report with token counts and the ids of
+            included, truncated and omitted chunks)
+        """
+        report = {
+            "budget": self.token_budget,
+            "tokens": 0,
+            "source_tokens": sum(count_tokens(doc.page_content) for doc in documents),
+            "included": [],
+            "truncated": [],
+            "omitted": []
+        }
+        if not documents:
+            return "No relevant cases found.", report
+
+        encoding = get_encoding()
+        formatted = []
+        remaining = self.token_budget
+        for block in self._case_blocks(documents):
+            title = f"\n--- Case {len(formatted) + 1} ---\n"
+            header = f"{title}{block['header']}Content:\n"
+            header_tokens = count_tokens(header)
+            content_tokens = encoding.encode_ordinary(block["content"])
+
+            if header_tokens + len(content_tokens) <= remaining:
+                formatted.append(f"{header}{block['content']}\n")
+                report["included"].extend(block["chunk_ids"])
+                remaining -= header_tokens + len(content_tokens)
+            elif remaining - header_tokens >= self.min_truncated_tokens:
+                kept = content_tokens[:remaining - header_tokens]
+                formatted.append(f"{header}{encoding.decode(kept)} [truncated]\n")
+                report["truncated"].extend(block["chunk_ids"])
+                remaining = 0
+            else:
+                report["omitted"].extend(block["chunk_ids"])
+                remaining = 0 if remaining < self.min_truncated_tokens else remaining
+
+        report["tokens"] = self.token_budget - remaining
+        return "\n".join(formatted), report
@@ -0,0 +1,144 @@
+"""Server-side conversation history per session, so clients send only the new message."""
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+from backend.config import settings
+from backend.services.cache import TTLCache
+
+
+class ConversationConflict(Exception):
+    """The client's view of a session does not match the server's."""
+
+    def __init__(self, message: str, server_turn: Optional[int]):
+        super().__init__(message)
+        self.server_turn = server_turn
+
+
+class Conversation:
+    """One session's recent messages and completed-turn counter."""
+
+    def __init__(self, max_messages: int, history: List[Dict[str, str]] = None):
+        self.messages = deque(history or [], maxlen=max_messages)
+        self.turn = sum(1 for msg in (history or []) if msg["role"] == "user")
+        self.pending = False
+
+
+class ConversationStore:
+    """
+    Bounded store of conversation history keyed by session id.
+
+    A turn is reserved with ``begin_turn``, which checks the client's turn
+    counter, and finished with ``complete_turn`` (or released with
+    ``abort_turn`` on failure). Clients that send their full history, or
+    that hit a missing or mismatched session, rehydrate the server's copy.
+    Sessions expire after a TTL, the least recently used are evicted past
+    ``max_sessions``, and only the last ``max_messages`` are kept per session.
+    """
+
+    def __init__(self, max_sessions: int = None, ttl_seconds: float = None, max_messages: int = None):
+        """
+        Initialize store.
+
+        Args:
+            max_sessions: Maximum sessions held (default from settings)
+            ttl_seconds: Idle lifetime of a session (default from settings)
+            max_messages: Messages kept per session (default from settings)
+        """
+        self.max_messages = max_messages or settings.conversation_max_messages
+        self.sessions = TTLCache(
+            max_size=max_sessions or settings.conversation_store_size,
+            ttl_seconds=ttl_seconds or settings.conversation_ttl_seconds
+        )
+        self._lock = threading.Lock()
+
+    def begin_turn(
+        self,
+        session_id: str,
+        turn: Optional[int] = None,
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Reserve the next turn of a session and return its prior messages.
+
+        Args:
+            session_id: Session identifier
+            turn: Completed turns the client has seen (None skips the check)
+            history: Full history from the client, replacing the server's copy
+
+        Returns:
+            Messages before this turn, oldest first
+
+        Raises:
+            ConversationConflict: If the session is unknown, its turn counter
+                differs from ``turn``, or another turn is in progress
+        """
+        with self._lock:
+            conversation = self.sessions.get(session_id)
+
+            if history is not None:
+                conversation = Conversation(self.max_messages, history)
+            elif conversation is None:
+                if turn:
+                    raise ConversationConflict(
+                        "Session not found; resend with conversation_history to rehydrate it", None
+                    )
+                conversation = Conversation(self.max_messages)
+            elif turn is not None and turn != conversation.turn:
+                raise ConversationConflict(
+                    f"Turn mismatch: client is at turn {turn}, server is at turn {conversation.turn}",
+                    conversation.turn
+                )
+            elif turn is not None and conversation.pending:
+                raise ConversationConflict(
+                    f"Turn {turn} is already in progress for this session", conversation.turn
+                )
+
+            conversation.pending = True
+            self.sessions.set(session_id, conversation)
+            return list(conversation.messages)
+
+    def complete_turn(self, session_id: str, message: str, answer: str) -> int:
+        """
+        Record a finished turn.
+
+        Args:
+            session_id: Session identifier
+            message: User's message
+            answer: Assistant's answer
+
+        Returns:
+            Completed turns in the session, including this one
+        """
+        with self._lock:
+            conversation = self.sessions.get(session_id)
+            if conversation is None:
+                # Evicted mid-turn; start over from this exchange
+                conversation = Conversation(self.max_messages)
+            conversation.messages.append({"role": "user", "content": message})
+            conversation.messages.append({"role": "assistant", "content": answer})
+            conversation.turn += 1
+            conversation.pending = False
+            self.sessions.set(session_id, conversation)
+            return conversation.turn
+
+    def abort_turn(self, session_id: str) -> None:
+        """Release a reserved turn without recording it."""
+        with self._lock:
+            conversation = self.sessions.get(session_id)
+            if conversation is not None:
+                conversation.pending = False
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+
+# Global store instance
+_conversation_store_instance = None
+
+
+def get_conversation_store() -> ConversationStore:
+    """Get or create global conversation store instance."""
+    global _conversation_store_instance
+    if _conversation_store_instance is None:
+        _conversation_store_instance = ConversationStore()
+    return _conversation_store_instance
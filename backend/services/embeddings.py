@@ -0,0 +1,150 @@
+"""Abstract embedding provider interface with OpenAI and offline hash implementations."""
+import asyncio
+import hashlib
+import math
+import re
+import time
+from abc import ABC, abstractmethod
+from typing import List
+from openai import OpenAI, AsyncOpenAI
+from backend.config import settings
+
+
+class EmbeddingProvider(ABC):
+    """Abstract base class for embedding providers."""
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts, returning vectors in input order."""
+        pass
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts without blocking the event loop."""
+        return await asyncio.to_thread(self.embed, texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query string."""
+        return self.embed([text])[0]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Embed a single query string without blocking the event loop."""
+        return (await self.aembed([text]))[0]
+
+    async def aclose(self) -> None:
+        """Release network clients. No-op by default."""
+        pass
+
+    @property
+    @abstractmethod
+    def model_name(self) -> str:
+        """Return the embedding model name, used to key caches."""
+        pass
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """OpenAI embeddings API."""
+
+    def __init__(self, model: str = None):
+        self.model = model or settings.embedding_model
+        self.client = OpenAI(api_key=settings.openai_api_key)
+        self.async_client = AsyncOpenAI(api_key=settings.openai_api_key)
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        response = self.client.embeddings.create(
+            model=self.model,
+            input=texts
+        )
+        return [item.embedding for item in response.data]
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        response = await self.async_client.embeddings.create(
+            model=self.model,
+            input=texts
+        )
+        return [item.embedding for item in response.data]
+
+    async def aclose(self) -> None:
+        await self.async_client.close()
+        self.client.close()
+
+    @property
+    def model_name(self) -> str:
+        return self.model
+
+
+class HashEmbeddingProvider(EmbeddingProvider):
+    """
+    Deterministic offline embedder using feature hashing.
+
+    Word unigrams and bigrams are hashed into a fixed number of signed buckets
+    and the result is L2-normalized. Texts sharing words get similar vectors,
+    which is enough to exercise retrieval end to end without network calls.
+    An optional artificial latency simulates a remote embedding service.
+    """
+
+    _token_pattern = re.compile(r"[a-z0-9]+")
+
+    def __init__(self, dimension: int = None, latency_seconds: float = 0.0):
+        """
+        Initialize hash embedder.
+
+        Args:
+            dimension: Vector dimension (default from settings)
+            latency_seconds: Artificial delay added to every batch call
+        """
+        self.dimension = dimension or settings.embedding_dimension
+        self.latency_seconds = latency_seconds
+
+    def _embed_one(self, text: str) -> List[float]:
+        tokens = self._token_pattern.findall(text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+        vector = [0.0] * self.dimension
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dimension
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[bucket] += sign
+
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return [self._embed_one(text) for text in texts]
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        return [self._embed_one(text) for text in texts]
+
+    @property
+    def model_name(self) -> str:
+        return f"hash-{self.dimension}"
+
+
+def get_embedding_provider(provider_name: str = None) -> EmbeddingProvider:
+    """
+    Factory function to get an embedding provider.
+
+    Args:
+        provider_name: Name of the provider ('openai' or 'hash')
+
+    Returns:
+        EmbeddingProvider instance
+
+    Raises:
+        ValueError: If provider name is invalid
+    """
+    provider_name = provider_name or settings.embedding_provider
+
+    providers = {
+        "openai": OpenAIEmbeddingProvider,
+        "hash": HashEmbeddingProvider
+    }
+
+    if provider_name not in providers:
+        raise ValueError(f"Invalid embedding provider: {provider_name}. Must be one of {list(providers.keys())}")
+
+    return providers[provider_name]()
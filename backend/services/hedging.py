@@ -0,0 +1,184 @@
+"""Hedged LLM calls: start the fallback when the primary is slow to produce its first token."""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from uuid import UUID
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.language_models import BaseChatModel
+from backend.config import settings
+from backend.services.llm_provider import get_llm_registry
+
+
+# Time-to-first-token samples kept per provider
+TTFT_WINDOW = 200
+
+
+class FirstTokenLatency:
+    """Rolling time-to-first-token samples per provider, for picking the hedge delay."""
+
+    def __init__(self, window: int = TTFT_WINDOW):
+        self.window = window
+        self.hedges = 0
+        self.fallback_wins = 0
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, provider_key: str, seconds: float) -> None:
+        """Add a time-to-first-token sample."""
+        self._samples.setdefault(provider_key, deque(maxlen=self.window)).append(seconds)
+
+    def p95(self, provider_key: str) -> Optional[float]:
+        """95th percentile time to first token, or None until ``llm_hedge_min_samples`` are recorded."""
+        samples = self._samples.get(provider_key)
+        if not samples or len(samples) < settings.llm_hedge_min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def hedge_delay(self, provider_key: str) -> float:
+        """Seconds to wait for the primary's first token: the deadline, or the p95 if sooner."""
+        p95 = self.p95(provider_key)
+        deadline = settings.llm_hedge_deadline_seconds
+        return deadline if p95 is None else min(deadline, p95)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hedge counters and per-provider p95 time to first token."""
+        return {
+            "hedges": self.hedges,
+            "fallback_wins": self.fallback_wins,
+            "ttft_p95_seconds": {
+                provider_key: round(self.p95(provider_key), 3) if self.p95(provider_key) is not None else None
+                for provider_key in self._samples
+            }
+        }
+
+
+class _FirstTokenHandler(AsyncCallbackHandler):
+    """Signals and times the first streamed token of one contender."""
+
+    def __init__(self, provider_key: str, on_first_token: Callable[[], None], latency: FirstTokenLatency):
+        self.provider_key = provider_key
+        self.on_first_token = on_first_token
+        self.latency = latency
+        self._started_at: Optional[float] = None
+        self._seen = False
+
+    async def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[Any], *, run_id: UUID, **kwargs: Any) -> None:
+        self._started_at = time.monotonic()
+
+    async def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        if self._seen:
+            return
+        self._seen = True
+        if self._started_at is not None:
+            self.latency.record(self.provider_key, time.monotonic() - self._started_at)
+        self.on_first_token()
+
+
+async def hedged_call(
+    primary_llm: BaseChatModel,
+    fallback_llm: Optional[BaseChatModel],
+    call: Callable[[BaseChatModel, List[AsyncCallbackHandler]], Awaitable[Any]],
+    latency: FirstTokenLatency = None
+) -> Tuple[Any, BaseChatModel]:
+    """
+    Run an LLM call on the primary, hedging to the fallback if it is slow to start.
+
+    The fallback is started when the primary has produced no token within
+    ``hedge_delay``, or straight away if the primary fails first. The first
+    contender to stream a token wins, and the other is cancelled. If the
+    winner later fails and the fallback has not run yet, it is tried next.
+    With hedging disabled this reduces to trying the fallback after the
+    primary fails.
+
+    Args:
+        primary_llm: Preferred model
+        fallback_llm: Alternative model, or None
+        call: Coroutine function running the call on a model with the given callbacks
+        latency: Time-to-first-token tracker (default: the global one)
+
+    Returns:
+        Tuple of (call result, model that produced it)
+
+    Raises:
+        Exception: The last contender's error, if every contender failed
+    """
+    latency = latency or get_first_token_latency()
+    registry = get_llm_registry()
+    tasks: Dict[asyncio.Task, BaseChatModel] = {}
+    started_first_token = asyncio.Event()
+    winner: List[asyncio.Task] = []
+
+    def start(llm: BaseChatModel) -> None:
+        task: Optional[asyncio.Task] = None
+
+        def claim() -> None:
+            if not winner:
+                winner.append(task)
+                started_first_token.set()
+
+        handler = _FirstTokenHandler(registry.provider_key_of(llm), claim, latency)
+        task = asyncio.create_task(call(llm, [handler]))
+        tasks[task] = llm
+
+    loop = asyncio.get_running_loop()
+    start(primary_llm)
+    fallback_started = fallback_llm is None
+    hedge_at = None
+    if settings.llm_hedging_enabled and not fallback_started:
+        hedge_at = loop.time() + latency.hedge_delay(registry.provider_key_of(primary_llm))
+
+    error: Optional[BaseException] = None
+    try:
+        while tasks:
+            if winner and winner[0] in tasks:
+                # First token wins: stop the other contender
+                for task in [task for task in tasks if task is not winner[0]]:
+                    task.cancel()
+                    tasks.pop(task)
+
+            timeout = None
+            if not fallback_started and not winner and hedge_at is not None:
+                timeout = max(0.0, hedge_at - loop.time())
+            waits = set(tasks)
+            token_wait = None
+            if not winner:
+                token_wait = asyncio.ensure_future(started_first_token.wait())
+                waits.add(token_wait)
+            done, _ = await asyncio.wait(waits, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if token_wait is not None:
+                token_wait.cancel()
+
+            for task in done & set(tasks):
+                llm = tasks.pop(task)
+                if task.exception() is None:
+                    if llm is not primary_llm:
+                        latency.fallback_wins += 1
+                    return task.result(), llm
+                error = task.exception()
+
+            if not fallback_started and (not tasks or (not done and not winner)):
+                # The primary failed, or missed its first-token deadline
+                if tasks:
+                    latency.hedges += 1
+                start(fallback_llm)
+                fallback_started = True
+                if winner and winner[0] not in tasks:
+                    winner.clear()
+                    started_first_token.clear()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+# Global time-to-first-token tracker
+_first_token_latency_instance = None
+
+
+def get_first_token_latency() -> FirstTokenLatency:
+    """Get or create global time-to-first-token tracker."""
+    global _first_token_latency_instance
+    if _first_token_latency_instance is None:
+        _first_token_latency_instance = FirstTokenLatency()
+    return _first_token_latency_instance
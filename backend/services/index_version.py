@@ -0,0 +1,50 @@
+"""Corpus index version shared between ingestion and the API for cache invalidation."""
+import os
+import threading
+import time
+import uuid
+from backend.config import settings
+
+
+_lock = threading.Lock()
+_cached_mtime = None
+_cached_version = ""
+
+
+def get_index_version() -> str:
+    """
+    Return the current index version written by the last ingestion run.
+
+    The version file is only re-read when its modification time changes, so
+    this is cheap enough to call on every request.
+
+    Returns:
+        Version string, or an empty string if ingestion has not recorded one
+    """
+    global _cached_mtime, _cached_version
+    try:
+        mtime = os.stat(settings.index_version_path).st_mtime_ns
+    except FileNotFoundError:
+        return ""
+
+    with _lock:
+        if mtime != _cached_mtime:
+            with open(settings.index_version_path, 'r', encoding='utf-8') as f:
+                _cached_version = f.read().strip()
+            _cached_mtime = mtime
+        return _cached_version
+
+
+def bump_index_version() -> str:
+    """
+    Record a new index version, invalidating caches derived from the old index.
+
+    Returns:
+        The new version string
+    """
+    version = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+    tmp_path = f"{settings.index_version_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(version)
+    os.replace(tmp_path, settings.index_version_path)
+    return version
@@ -0,0 +1,219 @@
+"""BM25 lexical index over document chunks, fused with vector search via reciprocal-rank fusion."""
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List
+import numpy as np
+
+
+# Keeps reporter cites like "cal.4th" and "f.3d" together as single tokens
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\.[a-z0-9]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Tokenize text for lexical search.
+
+    Dotted tokens such as reporter abbreviations ("Cal.4th") are kept whole
+    and also split into their parts, so both exact cites and partial matches score.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of lowercase tokens
+    """
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(token)
+        if "." in token:
+            tokens.extend(token.split("."))
+    return tokens
+
+
+class BM25Index:
+    """
+    Inverted index with Okapi BM25 scoring.
+
+    Postings are stored as flat NumPy arrays (CSR layout: per-term offsets into
+    shared document-id and term-frequency arrays), which keeps the on-disk
+    ``.npz`` file compact and makes scoring a handful of vectorized adds.
+    Only chunk ids are stored alongside the postings; chunk text and metadata
+    live in the vector store, which callers fetch matches from.
+    """
+
+    def __init__(
+        self,
+        terms: List[str],
+        offsets: np.ndarray,
+        postings_docs: np.ndarray,
+        postings_tfs: np.ndarray,
+        doc_lengths: np.ndarray,
+        doc_ids: List[str],
+        k1: float = 1.5,
+        b: float = 0.75
+    ):
+        self.term_to_index = {term: idx for idx, term in enumerate(terms)}
+        self.offsets = offsets
+        self.postings_docs = postings_docs
+        self.postings_tfs = postings_tfs
+        self.doc_lengths = doc_lengths
+        self.doc_ids = doc_ids
+        self.k1 = k1
+        self.b = b
+        self.avg_doc_length = float(doc_lengths.mean()) if len(doc_lengths) else 0.0
+
+    @classmethod
+    def build(
+        cls,
+        entries: Iterable[Dict[str, Any]],
+        indexed_fields: tuple = ("case_name", "citation"),
+        k1: float = 1.5,
+        b: float = 0.75
+    ) -> "BM25Index":
+        """
+        Build an index from chunks in one pass, so entries can be streamed.
+
+        Args:
+            entries: Dicts with id, text and metadata (one per chunk)
+            indexed_fields: Metadata fields indexed alongside the chunk text
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+
+        Returns:
+            BM25Index instance
+        """
+        postings: Dict[str, List[tuple]] = {}
+        doc_lengths = []
+        doc_ids = []
+        for doc_idx, entry in enumerate(entries):
+            doc_ids.append(entry["id"])
+            fields = [str(entry["metadata"].get(name, "")) for name in indexed_fields]
+            tokens = tokenize(" ".join(fields + [entry["text"]]))
+            doc_lengths.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                postings.setdefault(term, []).append((doc_idx, tf))
+
+        terms = sorted(postings)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        docs, tfs = [], []
+        for idx, term in enumerate(terms):
+            for doc_idx, tf in postings[term]:
+                docs.append(doc_idx)
+                tfs.append(tf)
+            offsets[idx + 1] = len(docs)
+
+        return cls(
+            terms=terms,
+            offsets=offsets,
+            postings_docs=np.asarray(docs, dtype=np.int32),
+            postings_tfs=np.asarray(tfs, dtype=np.uint16),
+            doc_lengths=np.asarray(doc_lengths, dtype=np.int32),
+            doc_ids=doc_ids,
+            k1=k1,
+            b=b
+        )
+
+    def save(self, path: str) -> None:
+        """
+        Write the index to a compressed ``.npz`` file.
+
+        Args:
+            path: File path to write
+        """
+        terms = sorted(self.term_to_index, key=self.term_to_index.get)
+        np.savez_compressed(
+            path,
+            terms=np.asarray(terms, dtype=str),
+            offsets=self.offsets,
+            postings_docs=self.postings_docs,
+            postings_tfs=self.postings_tfs,
+            doc_lengths=self.doc_lengths,
+            doc_ids=np.asarray(self.doc_ids, dtype=str),
+            params=np.asarray([self.k1, self.b], dtype=np.float64)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        """
+        Load an index written by ``save``.
+
+        Args:
+            path: File path to read
+
+        Returns:
+            BM25Index instance
+        """
+        with np.load(path) as data:
+            k1, b = data["params"].tolist()
+            return cls(
+                terms=data["terms"].tolist(),
+                offsets=data["offsets"],
+                postings_docs=data["postings_docs"],
+                postings_tfs=data["postings_tfs"],
+                doc_lengths=data["doc_lengths"],
+                doc_ids=data["doc_ids"].tolist(),
+                k1=k1,
+                b=b
+            )
+
+    def search(self, query: str, top_k: int) -> List[Dict[str, Any]]:
+        """
+        Score chunks against a query with BM25.
+
+        Args:
+            query: Search query
+            top_k: Number of results to return
+
+        Returns:
+            List of match dicts with id and score, best first
+        """
+        num_docs = len(self.doc_ids)
+        if num_docs == 0:
+            return []
+
+        scores = np.zeros(num_docs, dtype=np.float32)
+        length_norm = self.k1 * (1 - self.b + self.b * self.doc_lengths / max(self.avg_doc_length, 1.0))
+
+        for term in set(tokenize(query)):
+            term_idx = self.term_to_index.get(term)
+            if term_idx is None:
+                continue
+            start, end = self.offsets[term_idx], self.offsets[term_idx + 1]
+            docs = self.postings_docs[start:end]
+            tfs = self.postings_tfs[start:end].astype(np.float32)
+            df = end - start
+            idf = np.log(1 + (num_docs - df + 0.5) / (df + 0.5))
+            scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + length_norm[docs])
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) == 0:
+            return []
+
+        k = min(top_k, len(candidates))
+        top = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        top = top[np.argsort(-scores[top])]
+
+        return [{"id": self.doc_ids[idx], "score": float(scores[idx])} for idx in top]
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: List[List[Dict[str, Any]]],
+    k: int = 60
+) -> List[tuple]:
+    """
+    Fuse ranked result lists with reciprocal-rank fusion.
+
+    Each result contributes 1 / (k + rank) to its id's fused score.
+
+    Args:
+        ranked_lists: Lists of match dicts (with an id), each best first
+        k: RRF damping constant
+
+    Returns:
+        List of (id, fused_score) tuples, best first
+    """
+    fused: Dict[str, float] = {}
+    for ranked in ranked_lists:
+        for rank, match in enumerate(ranked, 1):
+            fused[match["id"]] = fused.get(match["id"], 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
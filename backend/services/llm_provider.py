@@ -1,6 +1,8 @@
 """Abstract LLM provider interface with OpenAI and Mistral implementations."""
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+import httpx
 from langchain_core.language_models import BaseChatModel
 from langchain_openai import ChatOpenAI
 from langchain_mistralai import ChatMistralAI
@@ -10,9 +12,22 @@ from backend.config import settings
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
 
+    def __init__(self, model: str, temperature: float = 0.0):
+        self.model = model
+        self.temperature = temperature
+
     @abstractmethod
-    def get_llm(self) -> BaseChatModel:
-        """Return a configured LLM instance."""
+    def build_http_clients(
+        self,
+        limits: httpx.Limits,
+        timeout: float
+    ) -> Tuple[httpx.Client, httpx.AsyncClient]:
+        """Create the sync and async HTTP clients shared by this provider's models."""
+        pass
+
+    @abstractmethod
+    def build_llm(self, http_client: httpx.Client, http_async_client: httpx.AsyncClient) -> BaseChatModel:
+        """Create a new LLM instance that uses the given HTTP clients."""
         pass
 
     @property
@@ -21,48 +36,186 @@ class LLMProvider(ABC):
         """Return the provider name."""
         pass
 
+    @property
+    @abstractmethod
+    def provider_key(self) -> str:
+        """Return the key identifying this provider's connection pool."""
+        pass
+
+    def get_llm(self) -> BaseChatModel:
+        """Return the shared, long-lived LLM instance for this provider configuration."""
+        return get_llm_registry().get_llm(self)
+
 
 class OpenAIProvider(LLMProvider):
     """OpenAI GPT provider."""
 
     def __init__(self, model: str = None, temperature: float = 0.0):
-        self.model = model or settings.openai_model
-        self.temperature = temperature
+        super().__init__(model or settings.openai_model, temperature)
 
-    def get_llm(self) -> BaseChatModel:
+    def build_http_clients(
+        self,
+        limits: httpx.Limits,
+        timeout: float
+    ) -> Tuple[httpx.Client, httpx.AsyncClient]:
+        """Create pooled HTTP clients; the OpenAI SDK supplies base URL and auth per request."""
+        return (
+            httpx.Client(limits=limits, timeout=timeout),
+            httpx.AsyncClient(limits=limits, timeout=timeout)
+        )
+
+    def build_llm(self, http_client: httpx.Client, http_async_client: httpx.AsyncClient) -> BaseChatModel:
         """Return configured OpenAI ChatGPT instance."""
         return ChatOpenAI(
             model=self.model,
             temperature=self.temperature,
             api_key=settings.openai_api_key,
-            streaming=False
+            streaming=True,  # Lets hedging observe time to first token
+            stream_usage=True,
+            http_client=http_client,
+            http_async_client=http_async_client
         )
 
     @property
     def name(self) -> str:
         return f"OpenAI-{self.model}"
 
+    @property
+    def provider_key(self) -> str:
+        return "openai"
+
 
 class MistralProvider(LLMProvider):
     """Mistral AI provider."""
 
+    base_url = "https://api.mistral.ai/v1"
+
     def __init__(self, model: str = None, temperature: float = 0.0):
-        self.model = model or settings.mistral_model
-        self.temperature = temperature
+        super().__init__(model or settings.mistral_model, temperature)
 
-    def get_llm(self) -> BaseChatModel:
+    def build_http_clients(
+        self,
+        limits: httpx.Limits,
+        timeout: float
+    ) -> Tuple[httpx.Client, httpx.AsyncClient]:
+        """Create pooled HTTP clients preconfigured with the Mistral base URL and auth headers."""
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Authorization": f"Bearer {settings.mistral_api_key}",
+        }
+        return (
+            httpx.Client(base_url=self.base_url, headers=headers, limits=limits, timeout=timeout),
+            httpx.AsyncClient(base_url=self.base_url, headers=headers, limits=limits, timeout=timeout)
+        )
+
+    def build_llm(self, http_client: httpx.Client, http_async_client: httpx.AsyncClient) -> BaseChatModel:
         """Return configured Mistral AI instance."""
         return ChatMistralAI(
             model=self.model,
             temperature=self.temperature,
             api_key=settings.mistral_api_key,
-            streaming=False
+            streaming=True,  # Lets hedging observe time to first token
+            client=http_client,
+            async_client=http_async_client
         )
 
     @property
     def name(self) -> str:
         return f"Mistral-{self.model}"
 
+    @property
+    def provider_key(self) -> str:
+        return "mistral"
+
+
+class LLMClientRegistry:
+    """
+    Process-wide registry of long-lived LLM clients.
+
+    Keeps one LLM instance per (provider, model, temperature) and one pair of
+    keep-alive HTTP connection pools per provider, so LLM calls reuse open
+    connections instead of paying for a new pool and TLS handshake each time.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = None,
+        max_keepalive_connections: int = None,
+        keepalive_expiry: float = None,
+        timeout: float = None
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            max_connections: Maximum open connections per provider pool
+            max_keepalive_connections: Maximum idle keep-alive connections per pool
+            keepalive_expiry: Seconds an idle connection is kept open
+            timeout: HTTP request timeout in seconds
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections or settings.llm_max_connections,
+            max_keepalive_connections=max_keepalive_connections or settings.llm_max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry or settings.llm_keepalive_expiry
+        )
+        self.timeout = timeout or settings.llm_request_timeout
+        self._llms: Dict[Tuple[str, str, float], BaseChatModel] = {}
+        self._http_clients: Dict[str, Tuple[httpx.Client, httpx.AsyncClient]] = {}
+        self._lock = threading.Lock()
+
+    def get_llm(self, provider: LLMProvider) -> BaseChatModel:
+        """
+        Return the shared LLM instance for a provider configuration, creating it on first use.
+
+        Args:
+            provider: Provider describing the model and temperature
+
+        Returns:
+            Shared LLM instance
+        """
+        key = (provider.provider_key, provider.model, provider.temperature)
+        llm = self._llms.get(key)
+        if llm is not None:
+            return llm
+
+        with self._lock:
+            if key not in self._llms:
+                if provider.provider_key not in self._http_clients:
+                    self._http_clients[provider.provider_key] = provider.build_http_clients(
+                        self.limits,
+                        self.timeout
+                    )
+                http_client, http_async_client = self._http_clients[provider.provider_key]
+                self._llms[key] = provider.build_llm(http_client, http_async_client)
+            return self._llms[key]
+
+    def provider_key_of(self, llm: BaseChatModel) -> str:
+        """
+        Return the provider key of an LLM instance created by this registry.
+
+        Args:
+            llm: LLM instance
+
+        Returns:
+            Provider key, or the configured primary provider for LLMs built elsewhere
+        """
+        for (provider_key, _, _), registered in list(self._llms.items()):
+            if registered is llm:
+                return provider_key
+        return settings.llm_provider
+
+    async def aclose(self) -> None:
+        """Close all connection pools and forget the cached LLM instances."""
+        with self._lock:
+            clients = list(self._http_clients.values())
+            self._http_clients.clear()
+            self._llms.clear()
+
+        for http_client, http_async_client in clients:
+            http_client.close()
+            await http_async_client.aclose()
+
 
 def get_llm_provider(provider_name: str = None, fallback: bool = False) -> LLMProvider:
     """
@@ -126,3 +279,24 @@ def get_primary_and_fallback_llms() -> tuple[BaseChatModel, BaseChatModel | None
             pass  # Fallback not available
 
     return primary_llm, fallback_llm
+
+
+
+# Global registry instance
+_registry_instance = None
+
+
+def get_llm_registry() -> LLMClientRegistry:
+    """Get or create global LLM client registry."""
+    global _registry_instance
+    if _registry_instance is None:
+        _registry_instance = LLMClientRegistry()
+    return _registry_instance
+
+
+async def close_llm_registry() -> None:
+    """Close the global registry's connection pools, if it was created."""
+    global _registry_instance
+    if _registry_instance is not None:
+        await _registry_instance.aclose()
+        _registry_instance = None
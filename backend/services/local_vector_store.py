@@ -0,0 +1,400 @@
+"""In-process NumPy vector stores for small corpora and offline testing."""
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+import numpy as np
+from backend.config import settings
+from backend.services.vector_store import VectorStore
+
+
+VECTORS_FILE = "vectors.npy"
+METADATA_FILE = "metadata.json"
+
+# Rows allocated the first time vectors are added to an empty store
+MIN_CAPACITY = 1024
+
+
+class LocalVectorStore(VectorStore):
+    """
+    Vector store backed by a contiguous NumPy matrix.
+
+    Rows are unit-normalized so cosine similarity is a single matrix-vector
+    product, and top-k selection uses argpartition. Metadata is kept in
+    columnar arrays (one array per field) so filters are vectorized too.
+    The matrix can be memory-mapped from disk for fast startup.
+
+    The matrix and columns are preallocated buffers whose first
+    ``len(self._ids)`` rows are in use. Capacity doubles when it runs out, so
+    a stream of upserts copies each row O(1) times on average instead of
+    reallocating the whole matrix per batch.
+
+    Reads and writes hold one lock. Writes replace the matrix, ids and
+    columns together (``delete``, ``reload``), so a read that saw only some
+    of them could return one record's id with another's metadata.
+    """
+
+    def __init__(self, dimension: int, dtype: str = "float32", path: str = None):
+        """
+        Initialize an empty store.
+
+        Args:
+            dimension: Embedding dimension
+            dtype: Storage dtype for vectors ('float32' or 'float16')
+            path: Directory the store is saved to
+        """
+        self.dimension = dimension
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self._matrix = np.zeros((0, dimension), dtype=self.dtype)
+        self._ids: List[str] = []
+        self._id_to_row: Dict[str, int] = {}
+        self._columns: Dict[str, np.ndarray] = {}
+        self._mmap = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str, dtype: str = "float32", mmap: bool = True) -> "LocalVectorStore":
+        """
+        Load a store saved with ``save``.
+
+        Args:
+            path: Directory containing the store files
+            dtype: Storage dtype to use if the saved matrix differs
+            mmap: Memory-map the vector matrix instead of reading it into memory
+
+        Returns:
+            LocalVectorStore instance
+        """
+        matrix = np.load(os.path.join(path, VECTORS_FILE), mmap_mode="r" if mmap else None)
+        with open(os.path.join(path, METADATA_FILE), 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+
+        store = cls(dimension=matrix.shape[1], dtype=dtype, path=path)
+        store._matrix = matrix if matrix.dtype == store.dtype else matrix.astype(store.dtype)
+        store._ids = saved["ids"]
+        store._id_to_row = {vector_id: row for row, vector_id in enumerate(store._ids)}
+        store._columns = {
+            name: np.array(values, dtype=object)
+            for name, values in saved["columns"].items()
+        }
+        store._mmap = mmap
+        return store
+
+    @classmethod
+    def load_or_create(
+        cls,
+        path: str,
+        dimension: int,
+        dtype: str = "float32",
+        mmap: bool = True
+    ) -> "LocalVectorStore":
+        """Load the store at ``path`` if it exists, otherwise create an empty one."""
+        if os.path.exists(os.path.join(path, VECTORS_FILE)):
+            return cls.load(path, dtype=dtype, mmap=mmap)
+        return cls(dimension=dimension, dtype=dtype, path=path)
+
+    def save(self, path: str = None) -> None:
+        """
+        Write the store to a directory.
+
+        Args:
+            path: Directory to write the store files to (default: the path it was loaded from)
+        """
+        path = path or self.path
+        if path is None:
+            return
+        os.makedirs(path, exist_ok=True)
+        vectors_path = os.path.join(path, VECTORS_FILE)
+        metadata_path = os.path.join(path, METADATA_FILE)
+        with self._lock:
+            count = len(self._ids)
+            # Write to temporary files and swap them in, so processes memory-mapping
+            # the old file keep a valid mapping until they reload
+            with open(f"{vectors_path}.tmp", 'wb') as f:
+                np.save(f, np.asarray(self._matrix[:count]))
+            saved = {
+                "ids": self._ids,
+                "columns": {name: column[:count].tolist() for name, column in self._columns.items()}
+            }
+        with open(f"{metadata_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(saved, f)
+        os.replace(f"{vectors_path}.tmp", vectors_path)
+        os.replace(f"{metadata_path}.tmp", metadata_path)
+
+    def reload(self) -> None:
+        """Re-read the store from its path, picking up vectors saved by another process."""
+        if self.path is None or not os.path.exists(os.path.join(self.path, VECTORS_FILE)):
+            return
+        loaded = type(self).load(self.path, dtype=self.dtype.name, mmap=self._mmap)
+        with self._lock:
+            self._matrix = loaded._matrix
+            self._columns = loaded._columns
+            self._id_to_row = loaded._id_to_row
+            self._ids = loaded._ids
+
+    def _reserve(self, size: int) -> None:
+        """
+        Make the buffers hold at least ``size`` rows and be writable.
+
+        Capacity at least doubles when it grows. A read-only memory-mapped
+        matrix is copied into memory on the first write.
+        """
+        capacity = len(self._matrix)
+        if size <= capacity and self._matrix.flags.writeable:
+            return
+        if size > capacity:
+            capacity = max(size, 2 * capacity, MIN_CAPACITY)
+
+        count = len(self._ids)
+        matrix = np.zeros((capacity, self.dimension), dtype=self.dtype)
+        matrix[:count] = self._matrix[:count]
+        columns = {}
+        for name, column in self._columns.items():
+            columns[name] = np.full(capacity, None, dtype=object)
+            columns[name][:count] = column[:count]
+        self._matrix = matrix
+        self._columns = columns
+
+    def upsert(self, vectors: List[Dict[str, Any]]) -> None:
+        """
+        Insert or replace vectors.
+
+        Args:
+            vectors: List of dicts with id, values and metadata (Pinecone upsert format)
+        """
+        if not vectors:
+            return
+
+        with self._lock:
+            count = len(self._ids)
+            new_ids = list(dict.fromkeys(v["id"] for v in vectors if v["id"] not in self._id_to_row))
+            new_rows = {vector_id: count + idx for idx, vector_id in enumerate(new_ids)}
+            self._reserve(count + len(new_ids))
+
+            for vector in vectors:
+                row = self._id_to_row.get(vector["id"], new_rows.get(vector["id"]))
+                values = np.asarray(vector["values"], dtype=np.float32)
+                norm = np.linalg.norm(values)
+                self._matrix[row] = values / norm if norm else values
+
+                # Upserts replace the whole record, including metadata
+                for column in self._columns.values():
+                    column[row] = None
+                for name, value in (vector.get("metadata") or {}).items():
+                    if name not in self._columns:
+                        self._columns[name] = np.full(len(self._matrix), None, dtype=object)
+                    self._columns[name][row] = value
+
+            self._id_to_row.update(new_rows)
+            self._ids.extend(new_ids)
+
+    def _row_metadata(self, row: int) -> Dict[str, Any]:
+        """Assemble one row's metadata from the columns, skipping unset fields."""
+        return {
+            name: column[row]
+            for name, column in self._columns.items()
+            if column[row] is not None
+        }
+
+    def fetch(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the metadata of the given vectors by id. Unknown ids are left out.
+
+        Args:
+            ids: Vector ids to look up
+
+        Returns:
+            Dict of vector id to metadata
+        """
+        with self._lock:
+            return {
+                vector_id: self._row_metadata(self._id_to_row[vector_id])
+                for vector_id in ids
+                if vector_id in self._id_to_row
+            }
+
+    async def afetch(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        return self.fetch(ids)
+
+    def delete(self, ids: List[str]) -> None:
+        """
+        Delete vectors by id. Unknown ids are ignored.
+
+        Args:
+            ids: Vector ids to delete
+        """
+        with self._lock:
+            rows = [self._id_to_row[i] for i in ids if i in self._id_to_row]
+            if not rows:
+                return
+            count = len(self._ids)
+            keep = np.ones(count, dtype=bool)
+            keep[rows] = False
+            self._matrix = np.asarray(self._matrix[:count])[keep]
+            self._columns = {name: column[:count][keep] for name, column in self._columns.items()}
+            self._ids = [vector_id for row, vector_id in enumerate(self._ids) if keep[row]]
+            self._id_to_row = {vector_id: row for row, vector_id in enumerate(self._ids)}
+
+    def _filter_mask(self, filter_dict: Dict[str, Any], count: int) -> np.ndarray:
+        """
+        Build a mask over the first ``count`` rows for a Pinecone-style metadata filter.
+
+        Supports ``{"field": value}``, ``{"field": {"$eq": value}}``,
+        ``{"field": {"$ne": value}}`` and ``{"field": {"$in": [...]}}``.
+        """
+        mask = np.ones(count, dtype=bool)
+        for name, condition in filter_dict.items():
+            column = self._columns.get(name)
+            if column is None:
+                return np.zeros(count, dtype=bool)
+            column = column[:count]
+
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            for op, value in condition.items():
+                if op == "$eq":
+                    mask &= column == value
+                elif op == "$ne":
+                    mask &= column != value
+                elif op == "$in":
+                    allowed = set(value)
+                    mask &= np.fromiter((item in allowed for item in column), dtype=bool, count=len(column))
+                else:
+                    raise ValueError(f"Unsupported filter operator: {op}")
+        return mask
+
+    def query(
+        self,
+        vector: List[float],
+        top_k: int,
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the most similar vectors by cosine similarity.
+
+        Args:
+            vector: Query embedding
+            top_k: Number of results to return
+            filter_dict: Optional metadata filters
+
+        Returns:
+            List of match dicts with id, score and metadata, best first
+        """
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        with self._lock:
+            count = len(self._ids)
+            if count == 0:
+                return []
+            matrix = self._matrix[:count]
+            scores = matrix.dot(query.astype(matrix.dtype)).astype(np.float32)
+            if filter_dict:
+                scores[~self._filter_mask(filter_dict, count)] = -np.inf
+
+            k = min(top_k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+
+            matches = []
+            for row in top:
+                if scores[row] == -np.inf:
+                    break
+                matches.append({
+                    "id": self._ids[row],
+                    "score": float(scores[row]),
+                    "metadata": self._row_metadata(row)
+                })
+            return matches
+
+    async def aquery(
+        self,
+        vector: List[float],
+        top_k: int,
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        # In-process search is sub-millisecond, so no worker thread is needed
+        return self.query(vector, top_k, filter_dict)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return vector count and dimension."""
+        return {
+            "total_vector_count": len(self._ids),
+            "dimension": self.dimension
+        }
+
+    @property
+    def name(self) -> str:
+        return "Local-NumPy"
+
+
+class InMemoryVectorStore(LocalVectorStore):
+    """
+    Non-persistent vector store with injectable latency, for offline benchmarks and tests.
+
+    Adds a fixed artificial delay to every query and write, so pipeline
+    overhead can be measured with a controlled stand-in for vendor latency.
+    """
+
+    def __init__(self, dimension: int = None, latency_seconds: float = 0.0):
+        """
+        Initialize in-memory store.
+
+        Args:
+            dimension: Embedding dimension (default from settings)
+            latency_seconds: Artificial delay added to every call
+        """
+        super().__init__(dimension=dimension or settings.embedding_dimension)
+        self.latency_seconds = latency_seconds
+
+    def _simulate_latency(self) -> None:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+
+    def upsert(self, vectors: List[Dict[str, Any]]) -> None:
+        self._simulate_latency()
+        super().upsert(vectors)
+
+    def query(
+        self,
+        vector: List[float],
+        top_k: int,
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        self._simulate_latency()
+        return super().query(vector, top_k, filter_dict)
+
+    async def aquery(
+        self,
+        vector: List[float],
+        top_k: int,
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        return LocalVectorStore.query(self, vector, top_k, filter_dict)
+
+    def fetch(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        self._simulate_latency()
+        return super().fetch(ids)
+
+    async def afetch(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        return LocalVectorStore.fetch(self, ids)
+
+    def delete(self, ids: List[str]) -> None:
+        self._simulate_latency()
+        super().delete(ids)
+
+    def save(self, path: str = None) -> None:
+        pass  # Nothing to persist
+
+    @property
+    def name(self) -> str:
+        return "In-Memory"
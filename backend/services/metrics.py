@@ -0,0 +1,228 @@
+"""Prometheus metrics and per-request Server-Timing for the RAG pipeline."""
+import asyncio
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+from uuid import UUID
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.outputs import LLMResult
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+
+# Wall-time buckets in seconds, wide enough for full LLM generations
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0)
+# Token-count buckets for a single LLM call
+TOKEN_BUCKETS = (50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+NODE_SECONDS = Histogram(
+    "legal_ai_graph_node_seconds",
+    "Wall time of each LangGraph node",
+    ["node"],
+    buckets=LATENCY_BUCKETS
+)
+EXTERNAL_CALL_SECONDS = Histogram(
+    "legal_ai_external_call_seconds",
+    "Wall time of calls to embedding, vector store and LLM services",
+    ["service", "operation", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+LLM_CALL_TOKENS = Histogram(
+    "legal_ai_llm_call_tokens",
+    "Prompt and completion tokens per LLM call",
+    ["provider", "kind"],
+    buckets=TOKEN_BUCKETS
+)
+LLM_TOKENS = Counter(
+    "legal_ai_llm_tokens",
+    "Prompt and completion tokens used across LLM calls",
+    ["provider", "kind"]
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "legal_ai_http_request_seconds",
+    "Time from request receipt to the start of the response",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "legal_ai_http_requests_in_flight",
+    "HTTP requests currently being handled"
+)
+
+# Timings of the current request, by Server-Timing metric name
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+# Cache name -> zero-argument function returning a dict with "hits" and "misses"
+_cache_sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def _add_request_timing(name: str, seconds: float) -> None:
+    """Add a duration to the current request's Server-Timing, if a request is being timed."""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+@contextmanager
+def track_call(service: str, operation: str) -> Iterator[None]:
+    """
+    Time a call to an external service.
+
+    Args:
+        service: Service called, e.g. 'embeddings', 'vector_store' or 'openai'
+        operation: Operation performed, e.g. 'embed', 'query' or 'chat'
+    """
+    started_at = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        raise
+    finally:
+        elapsed = time.perf_counter() - started_at
+        EXTERNAL_CALL_SECONDS.labels(service, operation, outcome).observe(elapsed)
+        _add_request_timing(f"{service}-{operation}", elapsed)
+
+
+def timed_node(name: str, node: Callable[[Any], Awaitable[Any]]) -> Callable[[Any], Awaitable[Any]]:
+    """
+    Wrap a LangGraph node so its wall time is recorded.
+
+    Args:
+        name: Node name as registered in the graph
+        node: Async node function
+
+    Returns:
+        Async node function with the same signature
+    """
+    @functools.wraps(node)
+    async def wrapper(state: Any) -> Any:
+        started_at = time.perf_counter()
+        try:
+            return await node(state)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            NODE_SECONDS.labels(name).observe(elapsed)
+            _add_request_timing(name, elapsed)
+
+    return wrapper
+
+
+class TokenUsageHandler(AsyncCallbackHandler):
+    """Records prompt and completion tokens reported by an LLM call."""
+
+    def __init__(self, provider_key: str):
+        self.provider_key = provider_key
+
+    async def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        usage = None
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or usage
+        if usage:
+            prompt_tokens, completion_tokens = usage.get("input_tokens"), usage.get("output_tokens")
+        else:
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            prompt_tokens, completion_tokens = token_usage.get("prompt_tokens"), token_usage.get("completion_tokens")
+
+        for kind, tokens in (("prompt", prompt_tokens), ("completion", completion_tokens)):
+            if tokens is not None:
+                LLM_CALL_TOKENS.labels(self.provider_key, kind).observe(tokens)
+                LLM_TOKENS.labels(self.provider_key, kind).inc(tokens)
+
+
+def register_cache(name: str, stats: Callable[[], Dict[str, Any]]) -> None:
+    """
+    Export a cache's hit and miss counters.
+
+    Args:
+        name: Cache label, e.g. 'query_embeddings'
+        stats: Function returning the cache's stats dict, with 'hits' and 'misses'
+    """
+    _cache_sources[name] = stats
+
+
+class _StatsCollector:
+    """Reads cache counters and in-flight gauges from the services' stats at scrape time."""
+
+    def collect(self) -> Iterator[Any]:
+        from backend.services.admission import get_admission_controller, provider_limiter_stats
+
+        hits = CounterMetricFamily("legal_ai_cache_hits", "Cache lookups that were hits", labels=["cache"])
+        misses = CounterMetricFamily("legal_ai_cache_misses", "Cache lookups that were misses", labels=["cache"])
+        hit_ratio = GaugeMetricFamily("legal_ai_cache_hit_ratio", "Fraction of cache lookups that were hits", labels=["cache"])
+        for name, stats in list(_cache_sources.items()):
+            values = stats()
+            hits.add_metric([name], values["hits"])
+            misses.add_metric([name], values["misses"])
+            hit_ratio.add_metric([name], values["hit_rate"])
+        yield hits
+        yield misses
+        yield hit_ratio
+
+        admission = get_admission_controller().stats()
+        yield GaugeMetricFamily("legal_ai_chat_requests_active", "Chat requests holding a processing slot", value=admission["active"])
+        yield GaugeMetricFamily("legal_ai_chat_requests_queued", "Chat requests waiting for a processing slot", value=admission["queued"])
+        yield CounterMetricFamily("legal_ai_chat_requests_rejected", "Chat requests rejected at capacity", value=admission["rejected"] + admission["timed_out"])
+
+        llm_in_flight = GaugeMetricFamily("legal_ai_llm_calls_in_flight", "LLM calls in flight per provider", labels=["provider"])
+        for provider_key, stats in provider_limiter_stats().items():
+            llm_in_flight.add_metric([provider_key], stats["in_flight"])
+        yield llm_in_flight
+
+
+REGISTRY.register(_StatsCollector())
+
+
+def _server_timing(timings: Dict[str, float], total: float) -> bytes:
+    """Format timings (seconds) as a Server-Timing header value in milliseconds."""
+    entries: List[str] = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries).encode("latin-1")
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request.
+
+    Records request latency by route and the number of requests in flight,
+    and adds a ``Server-Timing`` header with the time spent in each pipeline
+    node and external call. Streaming responses send their headers before
+    the pipeline runs, so their header only covers work done up to then.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: Dict[str, float] = {}
+        token = _request_timings.set(timings)
+        started_at = time.perf_counter()
+
+        async def send_with_timing(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter() - started_at
+                route = scope.get("route")
+                HTTP_REQUEST_SECONDS.labels(
+                    scope["method"], getattr(route, "path", "unmatched"), str(message["status"])
+                ).observe(elapsed)
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", _server_timing(timings, elapsed))
+                ]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            _request_timings.reset(token)
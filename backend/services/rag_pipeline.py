@@ -1,13 +1,33 @@
 """LangGraph-based RAG pipeline for legal research assistant."""
+import asyncio
+import hashlib
+import json
 import os
-from typing import TypedDict, List, Optional, Dict, Any, Annotated
+import re
+import uuid
+from typing import TypedDict, List, Optional, Dict, Any, AsyncIterator, Literal, Tuple
+from pydantic import BaseModel, Field
+from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
 from langchain_core.documents import Document
+from langchain_core.exceptions import OutputParserException
+from langchain_core.runnables import ensure_config
+from langchain_core.runnables.config import merge_configs
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
-from backend.services.llm_provider import get_primary_and_fallback_llms
+from backend.services.admission import (
+    AdmissionRejected, get_admission_controller, get_provider_limiter, rate_limit_retry_after
+)
+from backend.services.checkpointer import create_checkpointer
+from backend.services.llm_provider import get_llm_registry, get_primary_and_fallback_llms
 from backend.services.retriever import get_retriever
+from backend.services.answer_cache import get_answer_cache
+from backend.services.cache import normalize_text
 from backend.services.confidence import ConfidenceAssessor, parse_llm_self_assessment
+from backend.services.context_builder import ContextBuilder, count_tokens
+from backend.services.hedging import hedged_call
+from backend.services.lexical_index import tokenize
+from backend.services.metrics import TokenUsageHandler, timed_node, track_call
+from backend.services.single_flight import SingleFlight
 from backend.config import settings
 
 
@@ -34,14 +54,66 @@ class RAGState(TypedDict):
     llm_confidence: float
     llm_confidence_level: str
     citations: List[Dict[str, Any]]
+    retrieval_prefetched: bool
+    answer_cache_hit: bool
+    confidence_assessed: bool
+    context_report: Optional[Dict[str, Any]]
+    provider: Optional[str]
     error: Optional[str]
 
 
-def rewrite_question(state: RAGState) -> RAGState:
+class StructuredAnswer(BaseModel):
+    """Generation output with inline self-assessed confidence (single LLM call)."""
+    answer: str = Field(..., description="Citation-grounded answer to the user's question, including the legal disclaimer")
+    cited_cases: List[str] = Field(
+        default_factory=list,
+        description="Names of the retrieved cases cited in the answer, exactly as they appear in the retrieved cases"
+    )
+    confidence: Literal["HIGH", "MEDIUM", "LOW", "INSUFFICIENT"] = Field(
+        ...,
+        description="Confidence in the answer, based on how directly the retrieved cases address the question"
+    )
+
+
+async def _ainvoke_limited(
+    llm: BaseChatModel,
+    messages: List[BaseMessage],
+    schema: Optional[type] = None,
+    callbacks: Optional[List[Any]] = None
+) -> Any:
+    """
+    Call an LLM within its provider's concurrency slot and request/token quotas.
+
+    The call's wall time and reported token usage are recorded as metrics.
+
+    Args:
+        llm: Chat model to call
+        messages: Prompt messages
+        schema: Structured output schema, if any
+        callbacks: Extra callback handlers for this call, added to the inherited ones
+
+    Returns:
+        Model response (or parsed schema instance)
+    """
+    provider_key = get_llm_registry().provider_key_of(llm)
+    limiter = get_provider_limiter(provider_key)
+    tokens = sum(count_tokens(str(msg.content)) for msg in messages) + settings.llm_estimated_output_tokens
+    callbacks = [*(callbacks or []), TokenUsageHandler(provider_key)]
+    async with limiter.slot(tokens):
+        runnable = llm.with_structured_output(schema) if schema is not None else llm
+        with track_call(provider_key, "chat"):
+            # Merge into the inherited config: replacing its callbacks would hide the
+            # call from the graph's tracing and from astream_events token streaming
+            return await runnable.ainvoke(messages, config=merge_configs(ensure_config(), {"callbacks": callbacks}))
+
+
+async def rewrite_question(state: RAGState) -> RAGState:
     """
     Node 1: Rewrite the question based on conversation history.
 
-    If this is a follow-up question, reformulate it to be standalone.
+    If this is a follow-up question, reformulate it to be standalone. A local
+    gate skips the LLM call for follow-ups that are already standalone, and in
+    speculative mode the raw query is retrieved while the rewrite runs.
     """
     messages = state["messages"]
     current_query = state["query"]
@@ -51,6 +123,11 @@ def rewrite_question(state: RAGState) -> RAGState:
         state["rewritten_query"] = current_query
         return state
 
+    # Skip the LLM call when the follow-up doesn't depend on earlier turns
+    if settings.rewrite_gate_enabled and not _needs_rewrite(current_query, messages[:-1]):
+        state["rewritten_query"] = current_query
+        return state
+
     # If there's conversation history, reformulate the question
     primary_llm, _ = get_primary_and_fallback_llms()
 
@@ -63,27 +140,75 @@ Follow-up question: {current_query}
 
 Rewritten standalone question:"""
 
-    try:
-        response = primary_llm.invoke([HumanMessage(content=reformulation_prompt)])
-        rewritten = response.content.strip()
-        state["rewritten_query"] = rewritten
-    except Exception as e:
+    rewrite = _ainvoke_limited(primary_llm, [HumanMessage(content=reformulation_prompt)])
+    if settings.speculative_retrieval:
+        # Retrieve for the raw query in parallel; kept if the rewrite barely changes it
+        response, speculative = await asyncio.gather(
+            rewrite,
+            get_retriever().aretrieve(query=current_query, top_k=settings.top_k_chunks),
+            return_exceptions=True
+        )
+    else:
+        (response,) = await asyncio.gather(rewrite, return_exceptions=True)
+        speculative = None
+
+    if isinstance(response, Exception):
         # If reformulation fails, use original query
         state["rewritten_query"] = current_query
-        state["error"] = f"Query reformulation failed: {str(e)}"
+        state["error"] = f"Query reformulation failed: {str(response)}"
+    else:
+        state["rewritten_query"] = response.content.strip()
+
+    if (
+        speculative is not None
+        and not isinstance(speculative, Exception)
+        and _token_similarity(state["rewritten_query"], current_query) >= settings.speculative_similarity_threshold
+    ):
+        state["retrieved_chunks"], state["retrieval_confidence"] = speculative
+        state["retrieval_prefetched"] = True
+
+    return state
+
+
+async def check_answer_cache(state: RAGState) -> RAGState:
+    """
+    Return a previously generated answer for a semantically equivalent question.
+
+    On a hit the graph ends here, skipping retrieval, generation and self-assessment.
+    """
+    state["answer_cache_hit"] = False
+    if not settings.answer_cache_enabled:
+        return state
+
+    query = state["rewritten_query"] or state["query"]
+    try:
+        embedding = await get_retriever().aembed_query(query)
+        cached = get_answer_cache().lookup(embedding)
+    except Exception:
+        # The cache is an optimization; fall through to the full pipeline
+        return state
+
+    if cached is not None:
+        state.update(cached)
+        state["answer_cache_hit"] = True
 
     return state
 
 
-def retrieve_documents(state: RAGState) -> RAGState:
+async def retrieve_documents(state: RAGState) -> RAGState:
     """
-    Node 2: Retrieve relevant documents from Pinecone.
+    Node 2: Retrieve relevant documents from the vector store.
+
+    Skipped when speculative retrieval already fetched results for an unchanged query.
     """
+    if state["retrieval_prefetched"]:
+        return state
+
     query = state["rewritten_query"] or state["query"]
     retriever = get_retriever()
 
     try:
-        documents, avg_score = retriever.retrieve(
+        documents, avg_score = await retriever.aretrieve(
             query=query,
             top_k=settings.top_k_chunks
         )
@@ -97,7 +222,7 @@ def retrieve_documents(state: RAGState) -> RAGState:
     return state
 
 
-def assess_retrieval(state: RAGState) -> RAGState:
+async def assess_retrieval(state: RAGState) -> RAGState:
     """
     Node 3: Assess the quality of retrieved documents.
 
@@ -109,7 +234,49 @@ def assess_retrieval(state: RAGState) -> RAGState:
     return state
 
 
-def generate_answer(state: RAGState) -> RAGState:
+INLINE_CONFIDENCE_INSTRUCTIONS = """5. List the names of the cases you cited
+6. Assess your confidence (HIGH, MEDIUM, LOW, or INSUFFICIENT) based on how directly the retrieved cases address the question, the quality and relevance of the citations, and whether you had to make inferences beyond what they state
+"""
+
+
+async def _run_generation(
+    llm: BaseChatModel,
+    messages: List[BaseMessage],
+    documents: List[Document],
+    callbacks: Optional[List[Any]] = None
+) -> Dict[str, Any]:
+    """
+    Generate the answer with one LLM.
+
+    With inline confidence enabled, the answer, cited cases and self-assessed
+    confidence come back from a single structured-output call, so the separate
+    assess_llm_confidence round trip is skipped. Output that does not parse
+    raises, so the hedged call fails over to the other LLM.
+
+    Returns:
+        State updates with the answer, citations and (inline) confidence
+    """
+    if settings.inline_confidence:
+        structured = await _ainvoke_limited(llm, messages, StructuredAnswer, callbacks)
+        if structured is None:
+            # Tool-calling parsers return None when the model answers without calling the tool
+            raise OutputParserException("LLM returned no structured answer")
+        answer = structured.answer.strip()
+        llm_score, llm_level = parse_llm_self_assessment(structured.confidence)
+        return {
+            "answer": answer,
+            "llm_confidence": llm_score,
+            "llm_confidence_level": llm_level,
+            "confidence_assessed": True,
+            "citations": _extract_citations(answer, documents, structured.cited_cases)
+        }
+
+    response = await _ainvoke_limited(llm, messages, callbacks=callbacks)
+    answer = response.content.strip()
+    return {"answer": answer, "citations": _extract_citations(answer, documents)}
+
+
+async def generate_answer(state: RAGState) -> RAGState:
     """
     Node 4: Generate answer using LLM with retrieved context.
     """
@@ -117,8 +284,8 @@ def generate_answer(state: RAGState) -> RAGState:
     documents = state["retrieved_chunks"]
     primary_llm, fallback_llm = get_primary_and_fallback_llms()
 
-    # Format retrieved documents as context
-    context = _format_retrieved_documents(documents)
+    # Format retrieved documents as context, within the prompt token budget
+    context, state["context_report"] = ContextBuilder().build(documents)
 
     # Build the generation prompt
     generation_prompt = f"""Based on the following retrieved legal cases, answer the user's question.
@@ -133,50 +300,41 @@ Remember to:
 2. Ground all claims in the retrieved cases
 3. If the retrieved cases don't adequately address the question, say so
 4. Include the legal disclaimer
-
+{INLINE_CONFIDENCE_INSTRUCTIONS if settings.inline_confidence else ""}
 Answer:"""
+    generation_messages = [
+        SystemMessage(content=SYSTEM_PROMPT),
+        HumanMessage(content=generation_prompt)
+    ]
 
-    # Try primary LLM
+    # Primary LLM, hedged with the fallback if it is slow to start or fails
     try:
-        response = primary_llm.invoke([
-            SystemMessage(content=SYSTEM_PROMPT),
-            HumanMessage(content=generation_prompt)
-        ])
-        answer = response.content.strip()
-        state["answer"] = answer
-
-        # Extract citations
-        state["citations"] = _extract_citations(answer, documents)
-
+        updates, llm = await hedged_call(
+            primary_llm,
+            fallback_llm,
+            lambda llm, callbacks: _run_generation(llm, generation_messages, documents, callbacks)
+        )
+        state.update(updates)
+        state["provider"] = get_llm_registry().provider_key_of(llm)
     except Exception as e:
-        # Try fallback LLM if available
+        if isinstance(e, AdmissionRejected) or rate_limit_retry_after(e) is not None:
+            raise  # Over capacity: the client gets a 429 with Retry-After instead of an apology
+        state["answer"] = "I apologize, but I'm currently unable to generate a response. Please try again later."
         if fallback_llm:
-            try:
-                response = fallback_llm.invoke([
-                    SystemMessage(content=SYSTEM_PROMPT),
-                    HumanMessage(content=generation_prompt)
-                ])
-                answer = response.content.strip()
-                state["answer"] = answer
-                state["citations"] = _extract_citations(answer, documents)
-            except Exception as fallback_error:
-                state["answer"] = "I apologize, but I'm currently unable to generate a response. Please try again later."
-                state["error"] = f"Both primary and fallback LLMs failed: {str(e)}, {str(fallback_error)}"
-                state["citations"] = []
+            state["error"] = f"Both primary and fallback LLMs failed: {str(e)}"
         else:
-            state["answer"] = "I apologize, but I'm currently unable to generate a response. Please try again later."
             state["error"] = f"LLM generation failed: {str(e)}"
-            state["citations"] = []
+        state["citations"] = []
 
     return state
 
 
-def assess_llm_confidence(state: RAGState) -> RAGState:
+async def assess_llm_confidence(state: RAGState) -> RAGState:
     """
     Node 5: Assess LLM's confidence in its answer.
     """
     answer = state["answer"]
-    primary_llm, _ = get_primary_and_fallback_llms()
+    primary_llm, fallback_llm = get_primary_and_fallback_llms()
 
     # Ask LLM to self-assess confidence
     confidence_prompt = f"""You previously generated this answer to a legal research question:
@@ -193,7 +351,11 @@ Provide ONLY one word as your confidence level: HIGH, MEDIUM, LOW, or INSUFFICIE
 Confidence:"""
 
     try:
-        response = primary_llm.invoke([HumanMessage(content=confidence_prompt)])
+        response, _ = await hedged_call(
+            primary_llm,
+            fallback_llm,
+            lambda llm, callbacks: _ainvoke_limited(llm, [HumanMessage(content=confidence_prompt)], callbacks=callbacks)
+        )
         assessment = response.content.strip()
 
         # Parse the assessment
@@ -210,11 +372,107 @@ Confidence:"""
 
         state["llm_confidence"] = llm_score
         state["llm_confidence_level"] = llm_level
-        state["error"] = state.get("error", "") + f" | Confidence assessment failed: {str(e)}"
+        state["error"] = (state.get("error") or "") + f" | Confidence assessment failed: {str(e)}"
 
     return state
 
 
+async def store_answer_cache(state: RAGState) -> RAGState:
+    """
+    Cache a freshly generated answer for future semantically equivalent questions.
+    """
+    if (
+        not settings.answer_cache_enabled
+        or state["answer_cache_hit"]
+        or state.get("error")
+        or not state["retrieved_chunks"]
+    ):
+        return state
+
+    query = state["rewritten_query"] or state["query"]
+    try:
+        embedding = await get_retriever().aembed_query(query)
+        get_answer_cache().store(embedding, {
+            "answer": state["answer"],
+            "citations": state["citations"],
+            "retrieved_chunks": state["retrieved_chunks"],
+            "retrieval_confidence": state["retrieval_confidence"],
+            "llm_confidence": state["llm_confidence"],
+            "llm_confidence_level": state["llm_confidence_level"],
+            "provider": state.get("provider"),
+        })
+    except Exception:
+        pass  # Caching failures never affect the response
+
+    return state
+
+
+def _route_after_answer_cache(state: RAGState) -> str:
+    """Skip the rest of the pipeline when the answer cache hit."""
+    return END if state["answer_cache_hit"] else "retrieve_documents"
+
+
+def _route_after_generation(state: RAGState) -> str:
+    """Skip self-assessment when generation already returned a confidence."""
+    return "store_answer_cache" if state["confidence_assessed"] else "assess_llm_confidence"
+
+
+# Words and openers that refer back to earlier turns
+_ANAPHORA_PATTERN = re.compile(
+    r"\b(it|its|they|them|their|this|that|these|those|he|she|him|her|his|such|same|"
+    r"above|former|latter|previous|earlier|aforementioned)\b|"
+    r"^(and|also|but|so|then|what about|how about|what if)\b",
+    re.IGNORECASE
+)
+
+
+# Function words ignored when comparing questions
+_STOPWORDS = frozenset(
+    "a an and are as at be by can could do does for from how in is of on or the to under "
+    "was what when where which who why with would".split()
+)
+
+
+def _content_words(text: str) -> set:
+    return {token for token in tokenize(text) if token not in _STOPWORDS}
+
+
+def _token_similarity(a: str, b: str) -> float:
+    """Jaccard similarity of the two texts' content-word sets (0-1)."""
+    tokens_a, tokens_b = _content_words(a), _content_words(b)
+    if not tokens_a or not tokens_b:
+        return 1.0 if tokens_a == tokens_b else 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+
+def _needs_rewrite(query: str, history: List[BaseMessage]) -> bool:
+    """
+    Decide locally whether a follow-up question needs LLM reformulation.
+
+    A follow-up needs rewriting if it refers back with pronouns or anaphoric
+    openers ("it", "that case", "what about ..."), or if it is short and
+    shares vocabulary with the previous question, which marks an elliptical
+    refinement such as "Consideration in California?". Anything else is
+    treated as already standalone.
+
+    Args:
+        query: The follow-up question
+        history: Earlier conversation messages
+
+    Returns:
+        True if the rewrite LLM call should run
+    """
+    if _ANAPHORA_PATTERN.search(query.strip()):
+        return True
+
+    previous_questions = [msg.content for msg in history if isinstance(msg, HumanMessage)]
+    if not previous_questions:
+        return False
+
+    is_short = len(_content_words(query)) <= settings.rewrite_short_query_words
+    return is_short and _token_similarity(query, previous_questions[-1]) >= settings.rewrite_similarity_threshold
+
+
 def _format_conversation_history(messages: List[BaseMessage]) -> str:
     """Format conversation history for context."""
     formatted = []
@@ -226,39 +484,28 @@ def _format_conversation_history(messages: List[BaseMessage]) -> str:
     return "\n".join(formatted)
 
 
-def _format_retrieved_documents(documents: List[Document]) -> str:
-    """Format retrieved documents for context."""
-    if not documents:
-        return "No relevant cases found."
-
-    formatted = []
-    for idx, doc in enumerate(documents, 1):
-        metadata = doc.metadata
-        formatted.append(
-            f"\n--- Case {idx} ---\n"
-            f"Case Name: {metadata.get('case_name', 'Unknown')}\n"
-            f"Court: {metadata.get('court', 'Unknown')}\n"
-            f"Date: {metadata.get('date', 'Unknown')}\n"
-            f"Citation: {metadata.get('citation', 'Unknown')}\n"
-            f"Relevance Score: {metadata.get('score', 0.0):.2f}\n"
-            f"Content:\n{doc.page_content}\n"
-        )
-    return "\n".join(formatted)
-
-
-def _extract_citations(answer: str, documents: List[Document]) -> List[Dict[str, Any]]:
+def _extract_citations(
+    answer: str,
+    documents: List[Document],
+    cited_cases: List[str] = None
+) -> List[Dict[str, Any]]:
     """
     Extract citations from the answer and match them to retrieved documents.
+
+    Cases listed in ``cited_cases`` (from structured generation output) count
+    as cited even if the answer text abbreviates their names.
     """
     citations = []
     seen_cases = set()
+    cited_names = {name.strip().lower() for name in cited_cases or []}
 
     for doc in documents:
         case_name = doc.metadata.get('case_name', '')
         citation = doc.metadata.get('citation', '')
+        mentioned = case_name in answer or case_name.lower() in cited_names
 
         # Check if this case is mentioned in the answer
-        if case_name and case_name in answer and case_name not in seen_cases:
+        if case_name and mentioned and case_name not in seen_cases:
             citations.append({
                 "case_name": case_name,
                 "court": doc.metadata.get('court', 'Unknown'),
@@ -272,28 +519,52 @@ def _extract_citations(answer: str, documents: List[Document]) -> List[Dict[str,
     return citations
 
 
+# Node names in execution order; streamed to clients as pipeline progress events
+PIPELINE_NODES = (
+    "rewrite_question",
+    "check_answer_cache",
+    "retrieve_documents",
+    "assess_retrieval",
+    "generate_answer",
+    "assess_llm_confidence",
+    "store_answer_cache",
+)
+
+
 # Build the LangGraph
 def create_rag_graph():
     """Create the RAG pipeline graph."""
     workflow = StateGraph(RAGState)
 
-    # Add nodes
-    workflow.add_node("rewrite_question", rewrite_question)
-    workflow.add_node("retrieve_documents", retrieve_documents)
-    workflow.add_node("assess_retrieval", assess_retrieval)
-    workflow.add_node("generate_answer", generate_answer)
-    workflow.add_node("assess_llm_confidence", assess_llm_confidence)
+    # Add nodes, each timed for the metrics endpoint
+    workflow.add_node("rewrite_question", timed_node("rewrite_question", rewrite_question))
+    workflow.add_node("check_answer_cache", timed_node("check_answer_cache", check_answer_cache))
+    workflow.add_node("retrieve_documents", timed_node("retrieve_documents", retrieve_documents))
+    workflow.add_node("assess_retrieval", timed_node("assess_retrieval", assess_retrieval))
+    workflow.add_node("generate_answer", timed_node("generate_answer", generate_answer))
+    workflow.add_node("assess_llm_confidence", timed_node("assess_llm_confidence", assess_llm_confidence))
+    workflow.add_node("store_answer_cache", timed_node("store_answer_cache", store_answer_cache))
 
     # Define edges
     workflow.set_entry_point("rewrite_question")
-    workflow.add_edge("rewrite_question", "retrieve_documents")
+    workflow.add_edge("rewrite_question", "check_answer_cache")
+    workflow.add_conditional_edges(
+        "check_answer_cache",
+        _route_after_answer_cache,
+        ["retrieve_documents", END]
+    )
     workflow.add_edge("retrieve_documents", "assess_retrieval")
     workflow.add_edge("assess_retrieval", "generate_answer")
-    workflow.add_edge("generate_answer", "assess_llm_confidence")
-    workflow.add_edge("assess_llm_confidence", END)
+    workflow.add_conditional_edges(
+        "generate_answer",
+        _route_after_generation,
+        ["assess_llm_confidence", "store_answer_cache"]
+    )
+    workflow.add_edge("assess_llm_confidence", "store_answer_cache")
+    workflow.add_edge("store_answer_cache", END)
 
-    # Add memory for conversation history
-    memory = MemorySaver()
+    # Add memory for conversation history (bounded: TTL, LRU memory cap, history cap)
+    memory = create_checkpointer()
 
     return workflow.compile(checkpointer=memory)
 
@@ -310,20 +581,32 @@ def get_rag_graph():
     return _graph_instance
 
 
-async def run_rag_query(query: str, session_id: str, conversation_history: List[Dict[str, str]] = None) -> Dict[str, Any]:
-    """
-    Run a RAG query through the pipeline.
+async def close_rag_graph() -> None:
+    """Commit the global graph's queued checkpoints and stop its writer, if it was created."""
+    global _graph_instance
+    if _graph_instance is not None:
+        await asyncio.to_thread(_graph_instance.checkpointer.close)
+        _graph_instance = None
 
-    Args:
-        query: User's question
-        session_id: Session identifier for conversation memory
-        conversation_history: Optional list of previous messages
 
-    Returns:
-        Dictionary containing answer, confidence, citations, etc.
-    """
-    graph = get_rag_graph()
+# Global single-flight group for whole queries
+_query_flights_instance = None
+
+
+def get_query_flights() -> SingleFlight:
+    """Get or create global single-flight group for run_rag_query."""
+    global _query_flights_instance
+    if _query_flights_instance is None:
+        _query_flights_instance = SingleFlight(enabled=settings.single_flight_enabled)
+    return _query_flights_instance
+
 
+def _build_initial_state(
+    query: str,
+    session_id: str,
+    conversation_history: List[Dict[str, str]] = None
+) -> RAGState:
+    """Build the initial graph state from the query and conversation history."""
     # Build messages from conversation history
     messages = []
     if conversation_history:
@@ -336,8 +619,7 @@ async def run_rag_query(query: str, session_id: str, conversation_history: List[
     # Add current query
     messages.append(HumanMessage(content=query))
 
-    # Initial state
-    initial_state: RAGState = {
+    return {
         "messages": messages,
         "session_id": session_id,
         "query": query,
@@ -348,14 +630,17 @@ async def run_rag_query(query: str, session_id: str, conversation_history: List[
         "llm_confidence": 0.0,
         "llm_confidence_level": "insufficient",
         "citations": [],
+        "retrieval_prefetched": False,
+        "answer_cache_hit": False,
+        "confidence_assessed": False,
+        "context_report": None,
+        "provider": None,
         "error": None
     }
 
-    # Run the graph
-    config = {"configurable": {"thread_id": session_id}}
-    result = await graph.ainvoke(initial_state, config)
 
-    # Calculate final confidence
+def _build_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine confidence scores and convert final graph state to a response dict."""
     assessor = ConfidenceAssessor()
     final_score, final_level = assessor.assess(
         result["retrieval_confidence"],
@@ -376,5 +661,166 @@ async def run_rag_query(query: str, session_id: str, conversation_history: List[
             }
             for doc in result["retrieved_chunks"]
         ],
+        "cached": result.get("answer_cache_hit", False),
+        "context": result.get("context_report"),
+        "provider": result.get("provider"),
         "error": result.get("error")
     }
+
+
+def _query_flight_key(
+    query: str,
+    session_id: str,
+    conversation_history: List[Dict[str, str]] = None
+) -> Tuple[str, str, str]:
+    """
+    Coalescing key for a query: its session, normalized text and a fingerprint of the history.
+
+    The session is part of the key because each run records its turn in that
+    session's checkpoint; a run shared across sessions would leave the others
+    without it.
+    """
+    history = [(msg["role"], normalize_text(msg["content"])) for msg in conversation_history or []]
+    fingerprint = hashlib.sha256(json.dumps(history).encode("utf-8")).hexdigest()
+    return session_id, normalize_text(query), fingerprint
+
+
+async def run_rag_query(query: str, session_id: str, conversation_history: List[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Run a RAG query through the pipeline.
+
+    Identical concurrent queries in a session (same normalized question and
+    history, e.g. a retried request) share one pipeline run, and each caller
+    gets its own copy of the result.
+
+    Args:
+        query: User's question
+        session_id: Session identifier for conversation memory
+        conversation_history: Optional list of previous messages
+
+    Returns:
+        Dictionary containing answer, confidence, citations, etc.
+    """
+    async def run() -> Dict[str, Any]:
+        graph = get_rag_graph()
+        initial_state = _build_initial_state(query, session_id, conversation_history)
+
+        # Run the graph
+        config = {"configurable": {"thread_id": session_id}}
+        result = await graph.ainvoke(initial_state, config)
+
+        return _build_result(result)
+
+    return await get_query_flights().do(_query_flight_key(query, session_id, conversation_history), run)
+
+
+async def stream_rag_query(
+    query: str,
+    session_id: str,
+    conversation_history: List[Dict[str, str]] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run a RAG query through the pipeline, yielding progress events as they happen.
+
+    Events are dictionaries with an ``event`` name and a ``data`` payload:
+
+    - ``node_start`` / ``node_end``: a pipeline node started or finished
+    - ``token``: a chunk of answer text produced by ``generate_answer``
+      (not emitted with inline confidence, which generates structured output).
+      If generation is hedged, only the first provider to stream is forwarded
+    - ``result``: the final response (same shape as ``run_rag_query``)
+
+    Args:
+        query: User's question
+        session_id: Session identifier for conversation memory
+        conversation_history: Optional list of previous messages
+
+    Yields:
+        Event dictionaries in the order they occur
+    """
+    graph = get_rag_graph()
+    initial_state = _build_initial_state(query, session_id, conversation_history)
+    config = {"configurable": {"thread_id": session_id}}
+
+    # With hedging, both providers may stream; only the first to produce a token is forwarded
+    answer_run_id = None
+    async for event in graph.astream_events(initial_state, config, version="v2"):
+        kind = event["event"]
+        node = event.get("metadata", {}).get("langgraph_node")
+
+        if kind in ("on_chain_start", "on_chain_end") and event["name"] in PIPELINE_NODES and node == event["name"]:
+            yield {
+                "event": "node_start" if kind == "on_chain_start" else "node_end",
+                "data": {"node": event["name"]}
+            }
+        elif kind == "on_chat_model_stream" and node == "generate_answer":
+            content = event["data"]["chunk"].content
+            answer_run_id = answer_run_id or event["run_id"]
+            if content and event["run_id"] == answer_run_id:
+                yield {"event": "token", "data": {"content": content}}
+
+    # The checkpointer holds the final state for this thread
+    snapshot = await graph.aget_state(config)
+    yield {"event": "result", "data": _build_result(snapshot.values)}
+
+
+async def run_rag_batch(queries: List[str]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Answer many independent questions, yielding each result as it finishes.
+
+    All questions are embedded in batched embeddings requests up front, so the
+    per-item retrievals hit the query embedding cache. Retrievals then run
+    concurrently, and each item enters the graph with its retrieval prefetched
+    under a bounded generation concurrency. Every generating item also holds
+    a chat admission slot, so a batch competes for capacity like the same
+    number of chat requests. A failed or rejected item yields an error and
+    the rest of the batch carries on.
+
+    Args:
+        queries: Standalone questions (no conversation history)
+
+    Yields:
+        ``{"index": i, "result": ...}`` with a ``run_rag_query``-shaped result,
+        or ``{"index": i, "error": ...}``, in completion order
+    """
+    graph = get_rag_graph()
+    retriever = get_retriever()
+    admission = get_admission_controller()
+    batch_id = uuid.uuid4().hex
+    retrieval_slots = asyncio.Semaphore(settings.batch_retrieval_concurrency)
+    generation_slots = asyncio.Semaphore(settings.batch_generation_concurrency)
+
+    try:
+        await retriever.aembed_queries(queries)
+    except Exception:
+        pass  # Each item embeds on its own during retrieval instead
+
+    async def run_item(index: int, query: str) -> Dict[str, Any]:
+        thread_id = f"batch-{batch_id}-{index}"
+        try:
+            async with retrieval_slots:
+                documents, avg_score = await retriever.aretrieve(query=query, top_k=settings.top_k_chunks)
+
+            initial_state = _build_initial_state(query, thread_id)
+            initial_state.update(
+                rewritten_query=query,
+                retrieved_chunks=documents,
+                retrieval_confidence=avg_score,
+                retrieval_prefetched=True
+            )
+            async with generation_slots, admission.admit():
+                result = await graph.ainvoke(initial_state, {"configurable": {"thread_id": thread_id}})
+            return {"index": index, "result": _build_result(result)}
+        except Exception as e:
+            return {"index": index, "error": str(e)}
+        finally:
+            # Batch items have no follow-ups, so their checkpoints are not kept
+            await graph.checkpointer.adelete_thread(thread_id)
+
+    tasks = [asyncio.create_task(run_item(index, query)) for index, query in enumerate(queries)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,90 @@
+"""Token-bucket rate limiting for vendor request and token quotas."""
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Holds up to ``capacity`` tokens and refills continuously at ``rate``
+    tokens per second. Requests larger than the capacity are clamped to it,
+    so an oversized request waits for a full bucket instead of forever.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize bucket, starting full.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, limit: float) -> "TokenBucket":
+        """Create a bucket for a per-minute quota, allowing up to one minute of burst."""
+        return cls(rate=limit / 60.0, capacity=limit)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self, amount: float = 1.0) -> float:
+        """
+        Take tokens if available.
+
+        Args:
+            amount: Tokens to take
+
+        Returns:
+            0.0 if the tokens were taken, otherwise the seconds to wait before retrying
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) / self.rate
+
+    def acquire(self, amount: float = 1.0) -> None:
+        """Block until the tokens are taken."""
+        while True:
+            wait = self.try_acquire(amount)
+            if wait == 0.0:
+                return
+            time.sleep(wait)
+
+    async def aacquire(self, amount: float = 1.0, max_wait: float = None) -> float:
+        """
+        Wait without blocking the event loop until the tokens are taken.
+
+        Args:
+            amount: Tokens to take
+            max_wait: Give up, without waiting, once the tokens cannot be had within this many seconds
+
+        Returns:
+            0.0 if the tokens were taken, otherwise the seconds until they would be available
+        """
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+        while True:
+            wait = self.try_acquire(amount)
+            if wait == 0.0:
+                return 0.0
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return wait
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Drain the bucket so no tokens are available for roughly ``seconds``."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
@@ -1,23 +1,99 @@
-"""Pinecone retriever for legal document search."""
-from typing import List, Dict, Any, Tuple
-from pinecone import Pinecone
-from openai import OpenAI
+"""Retriever for legal document search over a pluggable vector store."""
+import asyncio
+import os
+from typing import List, Dict, Any, Optional, Tuple
 from langchain_core.documents import Document
 from backend.config import settings
+from backend.services.cache import EmbeddingCache, RetrievalCache
+from backend.services.embeddings import EmbeddingProvider, get_embedding_provider
+from backend.services.index_version import get_index_version
+from backend.services.lexical_index import BM25Index, reciprocal_rank_fusion
+from backend.services.metrics import register_cache, track_call
+from backend.services.single_flight import SingleFlight
+from backend.services.vector_store import VectorStore, get_vector_store, matches_filter
 
 
 class LegalDocumentRetriever:
-    """Retriever for legal documents from Pinecone vector database."""
+    """
+    Retriever for legal documents from the configured vector store.
 
-    def __init__(self):
-        """Initialize Pinecone and OpenAI clients."""
-        self.pc = Pinecone(api_key=settings.pinecone_api_key)
-        self.index = self.pc.Index(settings.pinecone_index_name)
-        self.openai_client = OpenAI(api_key=settings.openai_api_key)
+    When a BM25 lexical index is available, vector and lexical results are
+    fused with reciprocal-rank fusion so exact case names and reporter
+    citations rank well even when dense similarity misses them. The lexical
+    index and local vector store written by ingestion are reloaded when the
+    index version changes.
+    """
+
+    def __init__(
+        self,
+        vector_store: VectorStore = None,
+        embedding_provider: EmbeddingProvider = None,
+        lexical_index: BM25Index = None
+    ):
+        """
+        Initialize vector store, embedding provider and lexical index.
+
+        Args:
+            vector_store: Vector store to search (default from settings)
+            embedding_provider: Query embedding provider (default from settings)
+            lexical_index: BM25 index for hybrid search (default: loaded from settings path if present)
+        """
+        self.vector_store = vector_store or get_vector_store()
+        self.embedding_provider = embedding_provider or get_embedding_provider()
+        self.lexical_index = lexical_index
+        # Only the index ingestion writes is reloaded; an injected one is kept as is
+        self._reload_lexical_index = lexical_index is None and settings.hybrid_retrieval
+        self._loaded_index_version = get_index_version()
+        if self._reload_lexical_index:
+            self.lexical_index = self._load_lexical_index()
+        self.embedding_cache = EmbeddingCache()
+        self.result_cache = RetrievalCache() if settings.retrieval_cache_enabled else None
+        self.flights = SingleFlight(enabled=settings.single_flight_enabled)
+
+    @staticmethod
+    def _load_lexical_index() -> Optional[BM25Index]:
+        """Load the BM25 index written by ingestion, if it exists."""
+        if os.path.exists(settings.lexical_index_path):
+            return BM25Index.load(settings.lexical_index_path)
+        return None
+
+    def _indexes_stale(self) -> bool:
+        """Whether ingestion has bumped the index version since the indexes were loaded."""
+        return get_index_version() != self._loaded_index_version
+
+    def _reload_indexes(self) -> None:
+        """Reload the vector store and lexical index after a re-ingestion."""
+        version = get_index_version()
+        self.vector_store.reload()
+        if self._reload_lexical_index:
+            self.lexical_index = self._load_lexical_index()
+        self._loaded_index_version = version
 
     def _generate_query_embedding(self, query: str) -> List[float]:
         """
-        Generate embedding for a query string.
+        Generate embedding for a query string, using the embedding cache when possible.
+
+        Args:
+            query: The search query
+
+        Returns:
+            Embedding vector
+        """
+        model = self.embedding_provider.model_name
+        cached = self.embedding_cache.get(model, query)
+        if cached is not None:
+            return cached
+
+        with track_call("embeddings", "embed"):
+            embedding = self.embedding_provider.embed_query(query)
+        self.embedding_cache.set(model, query, embedding)
+        return embedding
+
+    async def aembed_query(self, query: str) -> List[float]:
+        """
+        Generate embedding for a query string without blocking the event loop.
+
+        Concurrent calls for the same (normalized) query share one request.
 
         Args:
             query: The search query
@@ -25,11 +101,237 @@ class LegalDocumentRetriever:
         Returns:
             Embedding vector
         """
-        response = self.openai_client.embeddings.create(
-            model=settings.embedding_model,
-            input=query
+        model = self.embedding_provider.model_name
+        cached = await self.embedding_cache.aget(model, query)
+        if cached is not None:
+            return cached
+
+        async def embed() -> List[float]:
+            with track_call("embeddings", "embed"):
+                embedding = await self.embedding_provider.aembed_query(query)
+            await self.embedding_cache.aset(model, query, embedding)
+            return embedding
+
+        return await self.flights.do(("embed", EmbeddingCache.make_key(model, query)), embed)
+
+    async def aembed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Embed many queries with batched embeddings requests, using the embedding cache when possible.
+
+        Queries missing from the cache are deduplicated and sent in requests of
+        up to ``embedding_batch_max_items`` inputs, and the results are cached
+        so later ``aretrieve`` calls for the same queries skip the embedding step.
+
+        Args:
+            queries: Search queries
+
+        Returns:
+            Embedding vectors, one per query
+        """
+        model = self.embedding_provider.model_name
+        embeddings = await self.embedding_cache.aget_many(model, queries)
+        missing = list(dict.fromkeys(query for query, embedding in zip(queries, embeddings) if embedding is None))
+        if missing:
+            size = settings.embedding_batch_max_items
+
+            async def embed(texts: List[str]) -> List[List[float]]:
+                with track_call("embeddings", "embed_batch"):
+                    return await self.embedding_provider.aembed(texts)
+
+            batches = await asyncio.gather(*[
+                embed(missing[start:start + size])
+                for start in range(0, len(missing), size)
+            ])
+            fetched = dict(zip(missing, (vector for batch in batches for vector in batch)))
+            await self.embedding_cache.aset_many(model, fetched)
+            embeddings = [
+                embedding if embedding is not None else fetched[query]
+                for query, embedding in zip(queries, embeddings)
+            ]
+        return embeddings
+
+    def _candidate_count(self, top_k: int) -> int:
+        """Number of results to request from each ranker before fusion."""
+        if self.lexical_index is None:
+            return top_k
+        return max(top_k, settings.hybrid_candidates)
+
+    def _lexical_candidates(
+        self,
+        query: str,
+        vector_matches: List[Dict[str, Any]],
+        top_k: int,
+        filter_dict: Dict[str, Any] = None
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Rank chunks with BM25 and list the ones whose metadata must be fetched.
+
+        The lexical index holds no metadata, so chunks found only lexically are
+        fetched from the vector store. With a filter, extra candidates are
+        ranked because some are dropped once their metadata is known.
+
+        Args:
+            query: The search query
+            vector_matches: Vector store matches, best first
+            top_k: Number of fused results to return
+            filter_dict: Optional metadata filters
+
+        Returns:
+            Tuple of (BM25 matches with id and score, ids missing from vector_matches)
+        """
+        limit = self._candidate_count(top_k)
+        if filter_dict:
+            limit *= settings.hybrid_filter_overfetch
+        lexical_matches = self.lexical_index.search(query, limit)
+        vector_ids = {match["id"] for match in vector_matches}
+        return lexical_matches, [match["id"] for match in lexical_matches if match["id"] not in vector_ids]
+
+    def _fuse(
+        self,
+        vector_matches: List[Dict[str, Any]],
+        lexical_matches: List[Dict[str, Any]],
+        fetched: Dict[str, Dict[str, Any]],
+        top_k: int,
+        filter_dict: Dict[str, Any] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fuse vector and BM25 matches using reciprocal-rank fusion.
+
+        Chunks found only lexically have no vector similarity, so their score is None.
+
+        Args:
+            vector_matches: Vector store matches, best first
+            lexical_matches: BM25 matches, best first
+            fetched: Metadata of lexical matches that are not vector matches, by id
+            top_k: Number of fused results to return
+            filter_dict: Optional metadata filters
+
+        Returns:
+            Fused match dictionaries, best first
+        """
+        vector_by_id = {match["id"]: match for match in vector_matches}
+        lexical_by_id = {}
+        for match in lexical_matches:
+            if match["id"] in vector_by_id:
+                metadata = vector_by_id[match["id"]].get("metadata") or {}
+            else:
+                metadata = fetched.get(match["id"])
+                # Skip chunks deleted since the index was built, and ones the filter excludes
+                if metadata is None or (filter_dict and not matches_filter(metadata, filter_dict)):
+                    continue
+            lexical_by_id[match["id"]] = {**match, "metadata": metadata}
+        lexical_matches = list(lexical_by_id.values())[:self._candidate_count(top_k)]
+
+        fused = []
+        for vector_id, rrf_score in reciprocal_rank_fusion(
+            [vector_matches, lexical_matches],
+            k=settings.rrf_k
+        )[:top_k]:
+            vector_match = vector_by_id.get(vector_id)
+            lexical_match = lexical_by_id.get(vector_id)
+            source = vector_match or lexical_match
+            metadata = {**(source.get("metadata") or {}), "rrf_score": rrf_score}
+            if lexical_match is not None:
+                metadata["bm25_score"] = lexical_match["score"]
+            fused.append({
+                "id": vector_id,
+                "score": vector_match["score"] if vector_match is not None else None,
+                "metadata": metadata
+            })
+        return fused
+
+    def _fuse_with_lexical(
+        self,
+        query: str,
+        vector_matches: List[Dict[str, Any]],
+        top_k: int,
+        filter_dict: Dict[str, Any] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fuse vector matches with BM25 matches, fetching metadata of lexical-only matches.
+
+        Args:
+            query: The search query
+            vector_matches: Vector store matches, best first
+            top_k: Number of fused results to return
+            filter_dict: Optional metadata filters
+
+        Returns:
+            Fused match dictionaries, best first
+        """
+        if self.lexical_index is None:
+            return vector_matches[:top_k]
+
+        lexical_matches, missing = self._lexical_candidates(query, vector_matches, top_k, filter_dict)
+        fetched = {}
+        if missing:
+            with track_call("vector_store", "fetch"):
+                fetched = self.vector_store.fetch(missing)
+        return self._fuse(vector_matches, lexical_matches, fetched, top_k, filter_dict)
+
+    async def _afuse_with_lexical(
+        self,
+        query: str,
+        vector_matches: List[Dict[str, Any]],
+        top_k: int,
+        filter_dict: Dict[str, Any] = None
+    ) -> List[Dict[str, Any]]:
+        """Async counterpart of ``_fuse_with_lexical``."""
+        if self.lexical_index is None:
+            return vector_matches[:top_k]
+
+        lexical_matches, missing = self._lexical_candidates(query, vector_matches, top_k, filter_dict)
+        fetched = {}
+        if missing:
+            with track_call("vector_store", "fetch"):
+                fetched = await self.vector_store.afetch(missing)
+        return self._fuse(vector_matches, lexical_matches, fetched, top_k, filter_dict)
+
+    def _retrieval_key(
+        self,
+        query: str,
+        query_embedding: List[float],
+        top_k: int,
+        filter_dict: Dict[str, Any] = None
+    ) -> str:
+        """Identity of a retrieval for the result cache and coalescing. BM25 ranks on the query text, so hybrid keys include it."""
+        return RetrievalCache.make_key(
+            query_embedding,
+            top_k,
+            filter_dict,
+            query if self.lexical_index is not None else None
         )
-        return response.data[0].embedding
+
+    @staticmethod
+    def _build_documents(matches: List[Dict[str, Any]]) -> Tuple[List[Document], float]:
+        """
+        Convert matches to LangChain Documents.
+
+        Args:
+            matches: List of match dictionaries with id, score and metadata
+
+        Returns:
+            Tuple of (list of Documents, average vector similarity score)
+        """
+        documents = []
+        total_score = 0.0
+        scored = 0
+
+        for match in matches:
+            metadata = dict(match.get("metadata") or {})
+            text = metadata.pop("text", "")
+            metadata["id"] = match["id"]
+            if match.get("score") is not None:
+                metadata["score"] = match["score"]
+                total_score += match["score"]
+                scored += 1
+
+            documents.append(Document(page_content=text, metadata=metadata))
+
+        # Calculate average similarity score over vector-scored chunks
+        avg_score = total_score / scored if scored else 0.0
+
+        return documents, avg_score
 
     def retrieve(
         self,
@@ -38,7 +340,10 @@ class LegalDocumentRetriever:
         filter_dict: Dict[str, Any] = None
     ) -> Tuple[List[Document], float]:
         """
-        Retrieve relevant documents from Pinecone.
+        Retrieve relevant documents from the vector store.
+
+        Results are served from the result cache when the same embedding,
+        top_k and filter were retrieved since the last re-ingestion.
 
         Args:
             query: The search query
@@ -49,56 +354,70 @@ class LegalDocumentRetriever:
             Tuple of (list of Documents, average similarity score)
         """
         top_k = top_k or settings.top_k_chunks
+        if self._indexes_stale():
+            self._reload_indexes()
 
-        # Generate query embedding
         query_embedding = self._generate_query_embedding(query)
+        key = self._retrieval_key(query, query_embedding, top_k, filter_dict)
+        fused = self.result_cache.get(key) if self.result_cache is not None else None
+        if fused is None:
+            with track_call("vector_store", "query"):
+                matches = self.vector_store.query(query_embedding, self._candidate_count(top_k), filter_dict)
+            fused = self._fuse_with_lexical(query, matches, top_k, filter_dict)
+            if self.result_cache is not None:
+                self.result_cache.set(key, fused)
+        return self._build_documents(fused)
 
-        # Search Pinecone
-        results = self.index.query(
-            vector=query_embedding,
-            top_k=top_k,
-            include_metadata=True,
-            filter=filter_dict
-        )
+    async def aretrieve(
+        self,
+        query: str,
+        top_k: int = None,
+        filter_dict: Dict[str, Any] = None
+    ) -> Tuple[List[Document], float]:
+        """
+        Retrieve relevant documents without blocking the event loop.
 
-        # Convert to LangChain Documents and calculate average score
-        documents = []
-        total_score = 0.0
+        Concurrent identical retrievals share one vector store query.
 
-        for match in results.matches:
-            metadata = match.metadata.copy()
-            text = metadata.pop("text", "")
+        Args:
+            query: The search query
+            top_k: Number of results to return (default from settings)
+            filter_dict: Optional metadata filters
 
-            doc = Document(
-                page_content=text,
-                metadata={
-                    **metadata,
-                    "score": match.score,
-                    "id": match.id
-                }
-            )
-            documents.append(doc)
-            total_score += match.score
+        Returns:
+            Tuple of (list of Documents, average similarity score)
+        """
+        top_k = top_k or settings.top_k_chunks
+        if self._indexes_stale():
+            await asyncio.to_thread(self._reload_indexes)
 
-        # Calculate average similarity score
-        avg_score = total_score / len(documents) if documents else 0.0
+        query_embedding = await self.aembed_query(query)
+        key = self._retrieval_key(query, query_embedding, top_k, filter_dict)
+        fused = self.result_cache.get(key) if self.result_cache is not None else None
+        if fused is None:
+            async def search() -> List[Dict[str, Any]]:
+                with track_call("vector_store", "query"):
+                    matches = await self.vector_store.aquery(query_embedding, self._candidate_count(top_k), filter_dict)
+                fused = await self._afuse_with_lexical(query, matches, top_k, filter_dict)
+                if self.result_cache is not None:
+                    self.result_cache.set(key, fused)
+                return fused
 
-        return documents, avg_score
+            fused = await self.flights.do(("retrieve", key), search)
+        return self._build_documents(fused)
 
     def health_check(self) -> Dict[str, Any]:
         """
-        Check connection to Pinecone.
+        Check connection to the vector store.
 
         Returns:
             Dictionary with health status
         """
         try:
-            stats = self.index.describe_index_stats()
             return {
                 "status": "healthy",
-                "total_vectors": stats.total_vector_count,
-                "dimension": stats.dimension,
-                "index_fullness": stats.index_fullness
+                "backend": self.vector_store.name,
+                **self.vector_store.stats()
             }
         except Exception as e:
             return {
@@ -106,6 +425,11 @@ class LegalDocumentRetriever:
                 "error": str(e)
             }
 
+    async def aclose(self) -> None:
+        """Close the vector store and embedding provider clients."""
+        await self.vector_store.aclose()
+        await self.embedding_provider.aclose()
+
 
 # Global retriever instance
 _retriever_instance = None
@@ -116,4 +440,15 @@ def get_retriever() -> LegalDocumentRetriever:
     global _retriever_instance
     if _retriever_instance is None:
         _retriever_instance = LegalDocumentRetriever()
+        register_cache("query_embeddings", _retriever_instance.embedding_cache.stats)
+        if _retriever_instance.result_cache is not None:
+            register_cache("retrieval_results", _retriever_instance.result_cache.stats)
     return _retriever_instance
+
+
+async def close_retriever() -> None:
+    """Close the global retriever's async clients, if it was created."""
+    global _retriever_instance
+    if _retriever_instance is not None:
+        await _retriever_instance.aclose()
+        _retriever_instance = None
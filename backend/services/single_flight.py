@@ -0,0 +1,68 @@
+"""Coalescing of identical concurrent async calls into one shared execution."""
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time. Callers that arrive while one is
+    in flight wait for it instead of starting their own.
+
+    The shared call runs as its own task, so a caller that is cancelled (for
+    example, a disconnected client) does not cancel it for the others.
+    Every caller receives a deep copy of the result and is free to mutate
+    it. Exceptions are raised to every waiter. Nothing is kept once the
+    call finishes, so results are never stale.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        Initialize single-flight group.
+
+        Args:
+            enabled: When False, every call runs on its own
+        """
+        self.enabled = enabled
+        self.calls = 0
+        self.coalesced = 0
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``fn`` or join the in-flight call with the same key.
+
+        Args:
+            key: Identity of the call; equal keys must produce equal results
+            fn: Zero-argument coroutine function performing the call
+
+        Returns:
+            Copy of the call's result
+        """
+        if not self.enabled:
+            return await fn()
+
+        task = self._in_flight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return executed and coalesced call counts."""
+        total = self.calls + self.coalesced
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+            "coalesced_rate": round(self.coalesced / total, 4) if total else 0.0
+        }
@@ -0,0 +1,290 @@
+"""Abstract vector store interface with a Pinecone implementation."""
+import asyncio
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional
+import httpx
+from pinecone import Pinecone, ServerlessSpec
+from backend.config import settings
+
+
+# Vector ids per Pinecone fetch request
+FETCH_BATCH_SIZE = 100
+
+
+def matches_filter(metadata: Dict[str, Any], filter_dict: Dict[str, Any]) -> bool:
+    """
+    Check one vector's metadata against a Pinecone-style filter.
+
+    Supports ``{"field": value}``, ``{"field": {"$eq": value}}``,
+    ``{"field": {"$ne": value}}`` and ``{"field": {"$in": [...]}}``.
+
+    Args:
+        metadata: Vector metadata
+        filter_dict: Metadata filter
+
+    Returns:
+        True if the metadata satisfies every condition
+    """
+    for name, condition in filter_dict.items():
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        value = metadata.get(name)
+        for op, expected in condition.items():
+            if op == "$eq" and value != expected:
+                return False
+            if op == "$ne" and value == expected:
+                return False
+            if op == "$in" and value not in expected:
+                return False
+            if op not in ("$eq", "$ne", "$in"):
+                raise ValueError(f"Unsupported filter operator: {op}")
+    return True
+
+
+class VectorStore(ABC):
+    """
+    Abstract base class for vector stores.
+
+    Vectors are exchanged in Pinecone's upsert format (dicts with id, values
+    and metadata), and queries return match dicts with id, score and metadata,
+    best match first.
+    """
+
+    @abstractmethod
+    def upsert(self, vectors: List[Dict[str, Any]]) -> None:
+        """Insert or replace vectors."""
+        pass
+
+    @abstractmethod
+    def query(
+        self,
+        vector: List[float],
+        top_k: int,
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Return the top_k most similar vectors."""
+        pass
+
+    async def aquery(
+        self,
+        vector: List[float],
+        top_k: int,
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Return the top_k most similar vectors without blocking the event loop."""
+        return await asyncio.to_thread(self.query, vector, top_k, filter_dict)
+
+    @abstractmethod
+    def fetch(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Return the metadata of the given vectors by id. Unknown ids are left out."""
+        pass
+
+    async def afetch(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Return the metadata of the given vectors by id without blocking the event loop."""
+        return await asyncio.to_thread(self.fetch, ids)
+
+    @abstractmethod
+    def delete(self, ids: List[str]) -> None:
+        """Delete vectors by id."""
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Return store statistics, including total_vector_count and dimension."""
+        pass
+
+    def create_index_if_missing(self, dimension: int) -> None:
+        """Create the backing index if the store needs one. No-op by default."""
+        pass
+
+    def save(self) -> None:
+        """Persist pending writes. No-op for stores that write through."""
+        pass
+
+    def reload(self) -> None:
+        """Pick up writes saved by another process, such as ingestion. No-op for remote stores."""
+        pass
+
+    async def aclose(self) -> None:
+        """Release network clients. No-op by default."""
+        pass
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Return the store name."""
+        pass
+
+
+class PineconeVectorStore(VectorStore):
+    """Pinecone serverless index."""
+
+    def __init__(self, index_name: str = None, api_key: str = None):
+        self.index_name = index_name or settings.pinecone_index_name
+        self.api_key = api_key or settings.pinecone_api_key
+        self.pc = Pinecone(api_key=self.api_key)
+        self._index = None
+        self._index_host: Optional[str] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def index(self):
+        """Pinecone index handle, connected on first use."""
+        if self._index is None:
+            self._index = self.pc.Index(self.index_name)
+        return self._index
+
+    def create_index_if_missing(self, dimension: int) -> None:
+        """
+        Create the Pinecone index if it doesn't exist.
+
+        Args:
+            dimension: Dimension of the embedding vectors
+        """
+        existing_indexes = [index.name for index in self.pc.list_indexes()]
+
+        if self.index_name not in existing_indexes:
+            self.pc.create_index(
+                name=self.index_name,
+                dimension=dimension,
+                metric="cosine",
+                spec=ServerlessSpec(
+                    cloud="aws",
+                    region=settings.pinecone_environment
+                )
+            )
+            print(f"Created index: {self.index_name}")
+        else:
+            print(f"Index {self.index_name} already exists")
+
+    def upsert(self, vectors: List[Dict[str, Any]]) -> None:
+        self.index.upsert(vectors=vectors)
+
+    def query(
+        self,
+        vector: List[float],
+        top_k: int,
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        results = self.index.query(
+            vector=vector,
+            top_k=top_k,
+            include_metadata=True,
+            filter=filter_dict
+        )
+        return [
+            {"id": match.id, "score": match.score, "metadata": match.metadata}
+            for match in results.matches
+        ]
+
+    async def aquery(
+        self,
+        vector: List[float],
+        top_k: int,
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Query the Pinecone data plane over async HTTP.
+
+        The Pinecone client only offers a thread-pool based async mode, so the
+        query REST endpoint is called directly on the index host.
+        """
+        http_client = await self._get_http_client()
+        payload = {
+            "vector": vector,
+            "topK": top_k,
+            "includeMetadata": True
+        }
+        if filter_dict:
+            payload["filter"] = filter_dict
+
+        response = await http_client.post("/query", json=payload)
+        response.raise_for_status()
+        return response.json().get("matches", [])
+
+    async def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the async HTTP client for the index host, creating it on first use."""
+        if self._index_host is None:
+            description = await asyncio.to_thread(self.pc.describe_index, self.index_name)
+            self._index_host = description.host
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                base_url=f"https://{self._index_host}",
+                headers={"Api-Key": self.api_key}
+            )
+        return self._http_client
+
+    def fetch(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        metadata = {}
+        # Fetch ids travel in the query string, so keep requests short
+        for start in range(0, len(ids), FETCH_BATCH_SIZE):
+            response = self.index.fetch(ids=ids[start:start + FETCH_BATCH_SIZE])
+            for vector_id, vector in response.vectors.items():
+                metadata[vector_id] = dict(vector.metadata or {})
+        return metadata
+
+    async def afetch(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        http_client = await self._get_http_client()
+        metadata = {}
+        for start in range(0, len(ids), FETCH_BATCH_SIZE):
+            response = await http_client.get(
+                "/vectors/fetch",
+                params=[("ids", vector_id) for vector_id in ids[start:start + FETCH_BATCH_SIZE]]
+            )
+            response.raise_for_status()
+            for vector_id, vector in response.json().get("vectors", {}).items():
+                metadata[vector_id] = vector.get("metadata") or {}
+        return metadata
+
+    def delete(self, ids: List[str]) -> None:
+        # Pinecone accepts at most 1000 ids per delete request
+        for start in range(0, len(ids), 1000):
+            self.index.delete(ids=ids[start:start + 1000])
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.index.describe_index_stats()
+        return {
+            "total_vector_count": stats.total_vector_count,
+            "dimension": stats.dimension,
+            "index_fullness": stats.index_fullness
+        }
+
+    async def aclose(self) -> None:
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    @property
+    def name(self) -> str:
+        return f"Pinecone-{self.index_name}"
+
+
+def get_vector_store(store_name: str = None, for_writing: bool = False) -> VectorStore:
+    """
+    Factory function to get a vector store.
+
+    Args:
+        store_name: Name of the store ('pinecone' or 'local')
+        for_writing: Open the local store fully in memory (no memory map) so it can be modified
+
+    Returns:
+        VectorStore instance
+
+    Raises:
+        ValueError: If store name is invalid
+    """
+    store_name = store_name or settings.vector_store
+
+    if store_name == "pinecone":
+        return PineconeVectorStore()
+
+    if store_name == "local":
+        from backend.services.local_vector_store import LocalVectorStore
+        return LocalVectorStore.load_or_create(
+            settings.local_vector_store_path,
+            settings.embedding_dimension,
+            dtype=settings.local_vector_store_dtype,
+            mmap=settings.local_vector_store_mmap and not for_writing
+        )
+
+    raise ValueError(f"Invalid vector store: {store_name}. Must be one of ['pinecone', 'local']")
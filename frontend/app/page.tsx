@@ -17,6 +17,7 @@ export default function Home() {
   const [selectedMessage, setSelectedMessage] = useState<Message | null>(null);
   const [drawerOpen, setDrawerOpen] = useState(false);
   const latestAssistantIdRef = useRef<string | null>(null);
+  const turnRef = useRef(0);
 
   useEffect(() => {
     setSessionId(uuidv4());
@@ -28,6 +29,7 @@ export default function Home() {
     setDrawerOpen(false);
     setSessionId(uuidv4());
     latestAssistantIdRef.current = null;
+    turnRef.current = 0;
   };
 
   const handleSendMessage = async (content: string) => {
@@ -44,6 +46,7 @@ export default function Home() {
     setIsLoading(true);
 
     try {
+      // The server keeps the history; it is only resent if the session needs rehydrating
       const conversationHistory = messages.map((msg) => ({
         role: msg.role,
         content: msg.content,
@@ -52,10 +55,11 @@ export default function Home() {
       const request: ChatRequest = {
         session_id: sessionId,
         message: content,
-        conversation_history: conversationHistory,
+        turn: turnRef.current,
       };
 
-      const response = await sendMessage(request);
+      const response = await sendMessage(request, conversationHistory);
+      turnRef.current = response.turn;
 
       const assistantId = uuidv4();
       latestAssistantIdRef.current = assistantId;
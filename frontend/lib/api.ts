@@ -1,16 +1,44 @@
-import { ChatRequest, ChatResponse } from '@/types';
+import { ChatRequest, ChatResponse, ConversationMessage } from '@/types';
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
+const MAX_RETRY_AFTER_SECONDS = 10;
 
-export async function sendMessage(request: ChatRequest): Promise<ChatResponse> {
+function postChat(request: ChatRequest): Promise<Response> {
+  return fetch(`${API_URL}/chat`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify(request),
+  });
+}
+
+export async function sendMessage(
+  request: ChatRequest,
+  history: ConversationMessage[] = []
+): Promise<ChatResponse> {
   try {
-    const response = await fetch(`${API_URL}/chat`, {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-      },
-      body: JSON.stringify(request),
-    });
+    let payload = request;
+    let response = await postChat(payload);
+
+    // The server lost or disagrees about the session: resend the full history to rehydrate it
+    if (response.status === 409) {
+      payload = {
+        session_id: request.session_id,
+        message: request.message,
+        conversation_history: history,
+      };
+      response = await postChat(payload);
+    }
+
+    // The server is at capacity: wait as asked (briefly) and retry once
+    if (response.status === 429) {
+      const retryAfter = Number(response.headers.get('Retry-After')) || 1;
+      if (retryAfter <= MAX_RETRY_AFTER_SECONDS) {
+        await new Promise((resolve) => setTimeout(resolve, retryAfter * 1000));
+        response = await postChat(payload);
+      }
+    }
 
     if (!response.ok) {
       const error = await response.json().catch(() => ({ detail: 'Unknown error' }));
@@ -15,6 +15,7 @@ export interface RetrievedChunk {
 export interface ChatRequest {
   session_id: string;
   message: string;
+  turn?: number;
   conversation_history?: ConversationMessage[];
 }
 
@@ -27,6 +28,7 @@ export interface ChatResponse {
   citations: Citation[];
   retrieved_chunks: RetrievedChunk[];
   disclaimer: string;
+  turn: number;
   error?: string;
 }
 
@@ -0,0 +1,95 @@
+"""Shared test configuration: offline settings, a seeded retriever and fake LLMs."""
+import os
+import tempfile
+
+# Settings are read at import time, so point everything at offline backends first
+_DATA_DIR = tempfile.mkdtemp(prefix="legal-ai-tests-")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.update(
+    MISTRAL_API_KEY="",
+    VECTOR_STORE="local",
+    EMBEDDING_PROVIDER="hash",
+    EMBEDDING_DIMENSION="64",
+    EMBEDDING_CACHE_PATH="",
+    CHECKPOINT_SQLITE_PATH="",
+    LOCAL_VECTOR_STORE_PATH=os.path.join(_DATA_DIR, "vector_store"),
+    EMBEDDING_STORE_PATH=os.path.join(_DATA_DIR, "embedding_store"),
+    INGESTION_MANIFEST_PATH=os.path.join(_DATA_DIR, "ingestion_manifest.json"),
+    LEXICAL_INDEX_PATH=os.path.join(_DATA_DIR, "lexical_index.npz"),
+    INDEX_VERSION_PATH=os.path.join(_DATA_DIR, ".index_version"),
+)
+
+import pytest  # noqa: E402
+import tiktoken  # noqa: E402
+
+
+def _encoding_available() -> bool:
+    try:
+        tiktoken.get_encoding("cl100k_base")
+        return True
+    except Exception:
+        return False
+
+
+# Token counting needs the cl100k encoding, which tiktoken downloads on first use
+requires_encoding = pytest.mark.skipif(
+    not _encoding_available(),
+    reason="cl100k_base encoding is not available (tiktoken needs network access to fetch it once)"
+)
+
+CASES = [
+    ("Smith v. Jones Manufacturing Co.", "123 Cal.4th 456",
+     "Time was of the essence in the supply contract, so the late delivery was a material breach."),
+    ("Doe v. City of Springfield", "45 F.4th 789",
+     "Qualified immunity shields officers unless they violated clearly established law."),
+    ("Brown v. Green Holdings", "78 N.E.3d 12",
+     "A promise without consideration is unenforceable absent detrimental reliance."),
+]
+
+
+@pytest.fixture
+def retriever(monkeypatch):
+    """Global retriever over a small in-memory corpus, with hash embeddings."""
+    from backend.services import retriever as retriever_module
+    from backend.services.embeddings import HashEmbeddingProvider
+    from backend.services.local_vector_store import InMemoryVectorStore
+
+    embedder = HashEmbeddingProvider()
+    store = InMemoryVectorStore()
+    texts = [text for _, _, text in CASES]
+    store.upsert([
+        {
+            "id": f"case-{i}-0",
+            "values": vector,
+            "metadata": {
+                "text": text, "case_name": name, "citation": citation,
+                "court": "Test Court", "date": "2023-01-01", "case_id": f"case-{i}", "chunk_id": 0
+            }
+        }
+        for i, ((name, citation, text), vector) in enumerate(zip(CASES, embedder.embed(texts)))
+    ])
+    instance = retriever_module.LegalDocumentRetriever(vector_store=store, embedding_provider=embedder)
+    monkeypatch.setattr(retriever_module, "_retriever_instance", instance)
+    return instance
+
+
+@pytest.fixture
+def fresh_pipeline(monkeypatch):
+    """Fresh graph, answer cache and coalescing state for each test."""
+    from backend.services import answer_cache, rag_pipeline
+
+    monkeypatch.setattr(rag_pipeline, "_graph_instance", None)
+    monkeypatch.setattr(rag_pipeline, "_query_flights_instance", None)
+    monkeypatch.setattr(answer_cache, "_answer_cache_instance", None)
+
+
+@pytest.fixture
+def use_llms(monkeypatch, fresh_pipeline):
+    """Install fake primary and fallback LLMs for the pipeline: ``use_llms(primary, fallback=None)``."""
+    from backend.services import rag_pipeline
+
+    def install(primary, fallback=None):
+        monkeypatch.setattr(rag_pipeline, "get_primary_and_fallback_llms", lambda: (primary, fallback))
+        return primary, fallback
+
+    return install
@@ -0,0 +1,97 @@
+"""Fake chat models and embedding providers for exercising the pipeline without network calls."""
+import asyncio
+import re
+import threading
+from typing import Any, AsyncIterator, List, Optional
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable, RunnableLambda
+from backend.services.embeddings import HashEmbeddingProvider
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model that streams a canned reply word by word (sync calls get it whole).
+
+    Delays before the first and between later tokens simulate a slow
+    provider, and ``fail`` raises before any token is produced. Calls and
+    cancellations are counted so tests can assert on hedging behaviour.
+    """
+
+    reply: str = "Under Smith v. Jones Manufacturing Co. the late delivery was a material breach. HIGH"
+    first_token_delay: float = 0.0
+    token_delay: float = 0.0
+    fail: bool = False
+    prompt_tokens: int = 120
+    calls: int = 0
+    cancelled: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _should_stream(self, *, async_api: bool, run_manager: Any = None, **kwargs: Any) -> bool:
+        # Async calls stream like the provider models, which are built with streaming=True
+        return async_api
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any) -> ChatResult:
+        """Return the whole reply at once, for sync callers (delays apply to async streaming only)."""
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("provider unavailable")
+        output_tokens = len(self._words())
+        message = AIMessage(content=self.reply, usage_metadata={
+            "input_tokens": self.prompt_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": self.prompt_tokens + output_tokens
+        })
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _words(self) -> List[str]:
+        """Split the reply into word tokens, each with its trailing whitespace."""
+        return re.findall(r"\S+\s*", self.reply)
+
+    def with_structured_output(self, schema: Any, **kwargs: Any) -> Runnable:
+        """Parse the reply as JSON into ``schema``; a malformed reply raises like a provider's parser."""
+        return self | RunnableLambda(lambda message: schema.model_validate_json(message.content))
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        self.calls += 1
+        words = self._words()
+        try:
+            await asyncio.sleep(self.first_token_delay)
+            if self.fail:
+                raise RuntimeError("provider unavailable")
+            for i, word in enumerate(words):
+                if i:
+                    await asyncio.sleep(self.token_delay)
+                yield ChatGenerationChunk(message=AIMessageChunk(content=word))
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata={
+            "input_tokens": self.prompt_tokens,
+            "output_tokens": len(words),
+            "total_tokens": self.prompt_tokens + len(words)
+        }))
+
+
+class RecordingEmbeddingProvider(HashEmbeddingProvider):
+    """Hash embedder that records the texts of every request."""
+
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def embed(self, texts):
+        with self._lock:
+            self.requests.append(list(texts))
+        return super().embed(texts)
@@ -0,0 +1,149 @@
+"""Admission control for chat requests and per-provider LLM limits."""
+import asyncio
+import json
+import time
+import pytest
+from fastapi.testclient import TestClient
+from backend.main import app
+from backend.services import admission, conversation_store
+from backend.services.admission import AdmissionController, AdmissionRejected, ProviderLimiter
+from tests.conftest import requires_encoding
+from tests.fakes import FakeChatModel
+
+
+@pytest.fixture
+def fresh_admission(monkeypatch):
+    """Fresh admission controller and conversation store."""
+    monkeypatch.setattr(admission, "_admission_controller_instance", None)
+    monkeypatch.setattr(conversation_store, "_conversation_store_instance", None)
+
+
+async def _post_and_disconnect(path: str, body: dict) -> list:
+    """Drive the ASGI app with a client that disconnects before reading the response body."""
+    payload = json.dumps(body).encode()
+    messages = iter([{"type": "http.request", "body": payload, "more_body": False}])
+    sent = []
+
+    async def receive():
+        return next(messages, {"type": "http.disconnect"})
+
+    async def send(message):
+        await asyncio.sleep(0)  # A real server yields here, so the disconnect lands before the body starts
+        sent.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())],
+        "client": ("test", 1234), "server": ("test", 80)
+    }
+    await app(scope, receive, send)
+    return sent
+
+
+def test_stream_releases_slot_and_turn_when_client_disconnects_early(fresh_admission):
+    body = {"session_id": "disconnect-early", "message": "What is consideration?"}
+
+    asyncio.run(_post_and_disconnect("/chat/stream", body))
+
+    assert admission.get_admission_controller().stats()["active"] == 0
+    # The reserved turn was given back, so the same turn can be started again
+    conversation_store.get_conversation_store().begin_turn("disconnect-early", turn=0)
+
+
+def test_admission_queues_then_rejects_with_retry_after():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queue=1, max_wait_seconds=0.2)
+        first = await controller.acquire()
+        queued = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire()  # Queue is full
+        assert rejected.value.retry_after >= 1
+
+        controller.release(first)
+        controller.release(await queued)
+        assert controller.stats()["active"] == 0
+
+        await controller.acquire()
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire()  # Waits past max_wait_seconds
+        stats = controller.stats()
+        assert (stats["rejected"], stats["timed_out"], stats["queued"]) == (1, 1, 0)
+
+    asyncio.run(scenario())
+
+
+def test_provider_limiter_rejects_instead_of_waiting_for_quota():
+    async def scenario():
+        limiter = ProviderLimiter(max_concurrency=2, tokens_per_minute=600, max_wait_seconds=0.2)
+        async with limiter.slot(600):
+            pass  # Drains the minute's quota
+        started = time.monotonic()
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with limiter.slot(300):
+                pass
+        assert time.monotonic() - started < 0.1  # Fails fast rather than waiting for a refill
+        assert rejected.value.retry_after >= 29
+        assert limiter.stats()["rejected"] == 1
+        assert limiter.stats()["in_flight"] == 0
+        # The concurrency slot was given back
+        assert limiter._semaphore._value == 2
+
+    asyncio.run(scenario())
+
+
+def test_provider_limiter_bounds_the_wait_for_a_concurrency_slot():
+    async def scenario():
+        limiter = ProviderLimiter(max_concurrency=1, max_wait_seconds=0.1)
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter.slot(10):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected):
+            async with limiter.slot(10):
+                pass
+        release.set()
+        await holder
+        async with limiter.slot(10):
+            pass
+
+    asyncio.run(scenario())
+
+
+@requires_encoding
+def test_chat_returns_429_when_provider_quota_is_exhausted(retriever, use_llms, fresh_admission, monkeypatch):
+    use_llms(FakeChatModel())
+    limiter = ProviderLimiter(max_concurrency=4, tokens_per_minute=1000, max_wait_seconds=0.1)
+    limiter.tokens.try_acquire(1000)
+    monkeypatch.setitem(admission._provider_limiters, "openai", limiter)
+
+    response = TestClient(app).post("/chat", json={"session_id": "quota", "message": "What is consideration?"})
+
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    assert admission.get_admission_controller().stats()["active"] == 0
+
+
+def test_batch_items_are_admitted_like_chat_requests(retriever, use_llms, monkeypatch):
+    use_llms(FakeChatModel())
+    controller = AdmissionController(max_concurrent=1, max_queue=0)
+    monkeypatch.setattr(admission, "_admission_controller_instance", controller)
+    asyncio.run(controller.acquire())  # The service is busy with another request
+
+    response = TestClient(app).post("/chat/batch", json={"questions": ["What is consideration?", "What is a breach?"]})
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["index"] for line in lines) == [0, 1]
+    assert all("capacity" in line["error"] for line in lines)
+    assert controller.stats()["rejected"] == 2
+
+
+def test_batch_rejects_empty_questions():
+    response = TestClient(app).post("/chat/batch", json={"questions": ["What is consideration?", ""]})
+
+    assert response.status_code == 422
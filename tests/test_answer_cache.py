@@ -0,0 +1,60 @@
+"""Semantic answer cache: similarity hits, eviction and index-version invalidation."""
+import pytest
+from backend.config import settings
+from backend.services.answer_cache import SemanticAnswerCache
+from backend.services.index_version import bump_index_version
+
+
+@pytest.fixture(autouse=True)
+def index_version_path(monkeypatch, tmp_path):
+    """Point the index version at a per-test file."""
+    monkeypatch.setattr(settings, "index_version_path", str(tmp_path / ".index_version"))
+
+
+def _cache(**kwargs):
+    return SemanticAnswerCache(**{"max_size": 4, "similarity_threshold": 0.95, "ttl_seconds": 60, **kwargs})
+
+
+def test_similar_queries_hit_and_dissimilar_queries_miss():
+    cache = _cache()
+    cache.store([1.0, 0.0, 0.0], {"answer": "cached"})
+
+    # Scale does not matter, only direction
+    assert cache.lookup([2.0, 0.1, 0.0]) == {"answer": "cached"}
+    assert cache.lookup([0.7, 0.7, 0.0]) is None
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_hits_return_independent_copies():
+    cache = _cache()
+    cache.store([1.0, 0.0], {"citations": ["a"]})
+
+    cache.lookup([1.0, 0.0])["citations"].append("b")
+
+    assert cache.lookup([1.0, 0.0]) == {"citations": ["a"]}
+
+
+def test_least_recently_used_entry_is_evicted_when_full():
+    cache = _cache(max_size=2)
+    cache.store([1.0, 0.0, 0.0], {"answer": "x"})
+    cache.store([0.0, 1.0, 0.0], {"answer": "y"})
+    cache.lookup([1.0, 0.0, 0.0])
+
+    cache.store([0.0, 0.0, 1.0], {"answer": "z"})
+
+    assert cache.lookup([0.0, 1.0, 0.0]) is None
+    assert cache.lookup([1.0, 0.0, 0.0]) == {"answer": "x"}
+    assert cache.stats.evictions == 1
+
+
+def test_a_new_index_version_drops_every_entry():
+    bump_index_version()
+    cache = _cache()
+    cache.store([1.0, 0.0], {"answer": "from the old corpus"})
+
+    bump_index_version()
+
+    assert cache.lookup([1.0, 0.0]) is None
+    assert len(cache) == 0
+    cache.store([1.0, 0.0], {"answer": "from the new corpus"})
+    assert cache.lookup([1.0, 0.0]) == {"answer": "from the new corpus"}
@@ -0,0 +1,51 @@
+"""Token-budgeted batch embedding: batch planning and tokens-per-minute throttling."""
+import time
+from backend.ingestion.batch_embedder import BatchEmbedder, plan_batches
+from backend.ingestion.chunker import count_tokens
+from backend.services.embeddings import HashEmbeddingProvider
+from backend.services.rate_limit import TokenBucket
+from tests.conftest import CASES, requires_encoding
+from tests.fakes import RecordingEmbeddingProvider
+
+
+TEXTS = [text for _, _, text in CASES] * 4
+
+
+def test_plan_batches_respects_the_token_budget_and_item_limit():
+    batches = plan_batches([4, 4, 4, 9, 1, 1, 1], max_tokens=8, max_items=2)
+
+    assert batches == [range(0, 2), range(2, 3), range(3, 4), range(4, 6), range(6, 7)]
+
+
+def test_plan_batches_gives_an_oversized_text_its_own_batch():
+    assert plan_batches([3, 50, 3], max_tokens=10, max_items=10) == [range(0, 1), range(1, 2), range(2, 3)]
+
+
+@requires_encoding
+def test_requests_stay_under_the_token_budget_and_keep_input_order():
+    provider = RecordingEmbeddingProvider()
+    max_tokens = 2 * max(count_tokens(text) for text in TEXTS)
+    embedder = BatchEmbedder(provider, max_tokens=max_tokens, max_items=100, concurrency=4, tokens_per_minute=0)
+
+    embeddings = embedder.embed(TEXTS)
+
+    assert len(provider.requests) > 1
+    for request in provider.requests:
+        assert sum(count_tokens(text) for text in request) <= max_tokens
+    assert embeddings == HashEmbeddingProvider().embed(TEXTS)
+
+
+@requires_encoding
+def test_tokens_per_minute_limit_throttles_requests():
+    provider = RecordingEmbeddingProvider()
+    batch_tokens = max(count_tokens(text) for text in TEXTS)
+    embedder = BatchEmbedder(provider, max_tokens=batch_tokens, max_items=1, concurrency=4, tokens_per_minute=0)
+    total_tokens = sum(count_tokens(text) for text in TEXTS)
+    # A burst of one batch, refilled so the rest take about half a second
+    embedder.rate_limiter = TokenBucket(rate=(total_tokens - batch_tokens) / 0.5, capacity=batch_tokens)
+
+    started = time.monotonic()
+    embedder.embed(TEXTS)
+
+    assert len(provider.requests) == len(TEXTS)
+    assert time.monotonic() - started >= 0.4
@@ -0,0 +1,46 @@
+"""Payload-size-aware batch upserts."""
+import threading
+from backend.ingestion.batch_upserter import BatchUpserter, plan_upsert_batches, vector_payload_bytes
+from backend.services.local_vector_store import InMemoryVectorStore
+
+
+class RecordingStore(InMemoryVectorStore):
+    """In-memory store that records the payload size of every upsert request."""
+
+    def __init__(self):
+        super().__init__(dimension=8)
+        self.request_bytes = []
+        self._requests_lock = threading.Lock()
+
+    def upsert(self, vectors):
+        with self._requests_lock:
+            self.request_bytes.append(sum(vector_payload_bytes(vector) for vector in vectors))
+        super().upsert(vectors)
+
+
+def _vectors(count):
+    return [
+        {"id": f"chunk-{idx}", "values": [float(idx + 1)] * 8, "metadata": {"text": "word " * (idx % 50)}}
+        for idx in range(count)
+    ]
+
+
+def test_plan_upsert_batches_respects_the_byte_budget_and_count_limit():
+    batches = plan_upsert_batches([40, 40, 30, 500, 10, 10, 10], max_bytes=100, max_count=2)
+
+    assert batches == [range(0, 2), range(2, 3), range(3, 4), range(4, 6), range(6, 7)]
+
+
+def test_concurrent_upserts_stay_under_the_byte_limit_and_deliver_every_vector():
+    store = RecordingStore()
+    vectors = _vectors(500)
+    max_bytes = 2000
+    upserter = BatchUpserter(store, max_batch_bytes=max_bytes, max_batch_size=100, concurrency=4, max_retries=0)
+
+    upserter.upsert(vectors)
+
+    assert len(store.request_bytes) > 1
+    assert max(store.request_bytes) <= max_bytes
+    assert upserter.total_bytes == sum(store.request_bytes)
+    assert store.stats()["total_vector_count"] == len(vectors)
+    assert store.fetch(["chunk-0", "chunk-499"]) == {"chunk-0": {"text": ""}, "chunk-499": {"text": "word " * 49}}
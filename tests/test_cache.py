@@ -0,0 +1,106 @@
+"""Embedding cache tiers and the retrieval result cache."""
+import asyncio
+import sqlite3
+import time
+from array import array
+import pytest
+from backend.services import cache as cache_module
+from backend.services.cache import EmbeddingCache, RetrievalCache, TTLCache
+
+
+@pytest.fixture
+def disk_cache(tmp_path, monkeypatch):
+    """Embedding cache with a one-entry memory tier, so lookups reach SQLite, pruned on every write."""
+    monkeypatch.setattr(EmbeddingCache, "_PRUNE_INTERVAL", 1)
+
+    def create(**kwargs):
+        return EmbeddingCache(max_size=1, path=str(tmp_path / "embeddings.sqlite"), **kwargs)
+
+    return create
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats.evictions == 1
+
+
+def test_disk_tier_survives_restarts(disk_cache):
+    disk_cache().set("model", "Breach of contract", [0.5, 1.5])
+
+    assert disk_cache().get("model", "breach   of CONTRACT") == [0.5, 1.5]
+
+
+def test_disk_tier_prunes_least_recently_used_rows(disk_cache):
+    cache = disk_cache(disk_max_entries=2)
+    cache.set("model", "a", [1.0])
+    cache.set("model", "b", [2.0])
+    time.sleep(0.01)
+    assert cache.get("model", "a") == [1.0]  # From disk: "b" is in memory
+    cache.set("model", "c", [3.0])
+
+    restarted = disk_cache()
+    assert restarted.get("model", "b") is None
+    assert restarted.get("model", "a") == [1.0]
+    assert cache.stats()["disk_evictions"] == 1
+
+
+def test_disk_tier_expires_unused_rows(disk_cache, tmp_path):
+    disk_cache().set("model", "old", [1.0])
+    with sqlite3.connect(str(tmp_path / "embeddings.sqlite")) as connection:
+        connection.execute("UPDATE embeddings SET last_used = ?", (time.time() - 120,))
+
+    cache = disk_cache(disk_ttl_seconds=60)
+
+    assert cache.get("model", "old") is None
+    assert cache.stats()["disk_evictions"] == 1
+
+
+def test_tables_from_before_pruning_are_migrated(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+        connection.execute(
+            "INSERT INTO embeddings VALUES (?, ?)",
+            (EmbeddingCache.make_key("model", "kept"), array("f", [4.0]).tobytes())
+        )
+
+    assert EmbeddingCache(path=path).get("model", "kept") == [4.0]
+
+
+def test_async_lookups_read_disk_on_a_worker_thread(disk_cache, monkeypatch):
+    cache = disk_cache()
+    calls = []
+    to_thread = asyncio.to_thread
+
+    async def recording_to_thread(function, *args):
+        calls.append(function.__name__)
+        return await to_thread(function, *args)
+
+    monkeypatch.setattr(cache_module.asyncio, "to_thread", recording_to_thread)
+
+    async def run():
+        await cache.aset_many("model", {"a": [1.0], "b": [2.0]})
+        return await cache.aget_many("model", ["a", "b", "c"])
+
+    assert asyncio.run(run()) == [[1.0], [2.0], None]
+    assert calls == ["_disk_set", "_disk_get"]
+
+
+def test_retrieval_cache_returns_copies_and_caps_bytes():
+    cache = RetrievalCache(max_bytes=200, ttl_seconds=60)
+    matches = [{"id": "a", "score": 0.9, "metadata": {"text": "x"}}]
+    cache.set("key", matches)
+
+    cached = cache.get("key")
+    cached[0]["metadata"]["text"] = "changed"
+    cache.set("big", [{"id": "b", "metadata": {"text": "y" * 500}}])
+
+    assert cache.get("key") == matches
+    assert cache.get("big") is None
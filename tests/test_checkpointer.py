@@ -0,0 +1,95 @@
+"""Bounded checkpointer: eviction, write-key tracking and the write-behind SQLite tier."""
+import sqlite3
+from typing import TypedDict
+from langgraph.graph import END, StateGraph
+from backend.services.checkpointer import BoundedMemorySaver
+
+
+class State(TypedDict):
+    text: str
+
+
+def _graph(checkpointer):
+    workflow = StateGraph(State)
+    workflow.add_node("echo", lambda state: {"text": state["text"].upper()})
+    workflow.set_entry_point("echo")
+    workflow.add_edge("echo", END)
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def _config(thread_id):
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def _disk_rows(path):
+    with sqlite3.connect(path) as connection:
+        return connection.execute("SELECT COUNT(*) FROM checkpoint_threads").fetchone()[0]
+
+
+def test_least_recently_used_threads_are_evicted_over_the_memory_cap():
+    saver = BoundedMemorySaver(ttl_seconds=3600, max_bytes=1, max_history=2, path="")
+    graph = _graph(saver)
+
+    graph.invoke({"text": "first"}, _config("a"))
+    graph.invoke({"text": "second"}, _config("b"))
+
+    assert saver.get_tuple(_config("a")) is None
+    assert saver.get_tuple(_config("b")).checkpoint["channel_values"]["text"] == "SECOND"
+    assert saver.stats()["evictions"] >= 1
+
+
+def test_writes_entries_created_by_lookups_are_evicted_with_their_thread():
+    saver = BoundedMemorySaver(ttl_seconds=3600, max_bytes=10 ** 9, max_history=2, path="")
+    graph = _graph(saver)
+    graph.invoke({"text": "hello"}, _config("a"))
+
+    # The base lookup creates an empty writes entry for the latest checkpoint
+    for _ in range(3):
+        saver.get_tuple(_config("a"))
+    assert any(key[0] == "a" for key in saver.writes)
+
+    saver.delete_thread("a")
+
+    assert not any(key[0] == "a" for key in saver.writes)
+    assert saver.stats()["bytes"] == 0
+
+
+def test_sqlite_tier_is_written_behind_and_restores_evicted_threads(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite")
+    saver = BoundedMemorySaver(ttl_seconds=3600, max_bytes=10 ** 9, max_history=2, path=path, flush_seconds=60)
+    graph = _graph(saver)
+
+    graph.invoke({"text": "hello"}, _config("a"))
+
+    # Nothing is committed on the caller's thread; the snapshot waits in the queue
+    assert _disk_rows(path) == 0
+    assert saver.stats()["queued_writes"] == 1
+    saver._drop("a")
+    assert saver.get_tuple(_config("a")).checkpoint["channel_values"]["text"] == "HELLO"
+
+    saver.close()
+    assert _disk_rows(path) == 1
+
+    restarted = BoundedMemorySaver(ttl_seconds=3600, max_bytes=10 ** 9, max_history=2, path=path, flush_seconds=60)
+    assert restarted.get_tuple(_config("a")).checkpoint["channel_values"]["text"] == "HELLO"
+    assert restarted.stats()["restores"] == 1
+
+    restarted.delete_thread("a")
+    restarted.close()
+    assert _disk_rows(path) == 0
+
+
+def test_pending_writes_survive_a_restart(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite")
+    saver = BoundedMemorySaver(ttl_seconds=3600, max_bytes=10 ** 9, max_history=2, path=path, flush_seconds=60)
+    graph = _graph(saver)
+    graph.invoke({"text": "hello"}, _config("a"))
+    config = saver.get_tuple(_config("a")).config
+
+    saver.put_writes(config, [("text", "interrupted")], task_id="task-1")
+    saver.close()
+
+    restarted = BoundedMemorySaver(ttl_seconds=3600, max_bytes=10 ** 9, max_history=2, path=path, flush_seconds=60)
+    pending = restarted.get_tuple(_config("a")).pending_writes
+    assert pending == [("task-1", "text", "interrupted")]
+    restarted.close()
@@ -0,0 +1,62 @@
+"""Token chunking of case text."""
+import pytest
+from backend.ingestion.chunker import TokenChunker
+from tests.conftest import requires_encoding
+
+
+SENTENCES = [
+    "The appellant argues that time was of the essence in the supply agreement.",
+    "Delivery arrived eleven days late, after the seasonal market had closed.",
+    "The trial court found the delay immaterial and entered judgment for the seller.",
+    "We review the materiality of a breach as a question of fact.",
+    "Zoë's café ordered pâtisserie équipement — naïve façade, résumé.",
+]
+# Numbered so every chunk is a unique slice of the text
+TEXT = "\n\n".join(
+    " ".join(f"Finding {i * 6 + j}: {SENTENCES[(i + j) % len(SENTENCES)]}" for j in range(6))
+    for i in range(12)
+)
+
+
+def _assert_covers(text: str, chunks: list) -> None:
+    """Every chunk is a slice of the text, and consecutive chunks leave no gap but whitespace."""
+    covered_to = 0
+    search_from = 0
+    for chunk in chunks:
+        position = text.find(chunk, search_from)
+        assert position != -1, f"chunk is not a slice of the text: {chunk[:60]!r}"
+        assert text[covered_to:position].strip() == "", f"text lost between chunks: {text[covered_to:position]!r}"
+        covered_to = max(covered_to, position + len(chunk))
+        search_from = position + 1
+    assert text[covered_to:].strip() == ""
+
+
+@requires_encoding
+@pytest.mark.parametrize("chunk_size,chunk_overlap", [(64, 0), (64, 16), (128, 0), (128, 40), (512, 50)])
+def test_chunks_keep_every_word(chunk_size, chunk_overlap):
+    chunks = TokenChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap).split_text(TEXT)
+
+    assert len(chunks) > 1
+    _assert_covers(TEXT, chunks)
+    words = set(TEXT.split())
+    assert words == {word for chunk in chunks for word in chunk.split()}
+
+
+@requires_encoding
+def test_chunks_without_overlap_rejoin_to_the_text():
+    chunks = TokenChunker(chunk_size=48, chunk_overlap=0).split_text(TEXT)
+
+    assert " ".join(chunks).split() == TEXT.split()
+
+
+@requires_encoding
+def test_chunks_with_overlap_share_text():
+    chunks = TokenChunker(chunk_size=64, chunk_overlap=16).split_text(TEXT)
+
+    for previous, following in zip(chunks, chunks[1:]):
+        assert following.split()[0] in previous.split()[-20:]
+
+
+def test_overlap_must_be_smaller_than_chunk_size():
+    with pytest.raises(ValueError):
+        TokenChunker(chunk_size=10, chunk_overlap=10)
@@ -0,0 +1,37 @@
+"""Token-budgeted context assembly."""
+from langchain_core.documents import Document
+from backend.services.context_builder import ContextBuilder, count_tokens, merge_overlapping
+from tests.conftest import CASES, requires_encoding
+
+
+def _documents():
+    return [
+        Document(
+            page_content=text * 20,
+            metadata={"id": f"case-{i}-0", "case_name": name, "citation": citation, "chunk_id": 0, "score": 0.9 - i / 10}
+        )
+        for i, (name, citation, text) in enumerate(CASES)
+    ]
+
+
+def test_merge_overlapping_drops_the_repeated_tail():
+    previous = "On appeal, the court held that the supply contract made time of the essence"
+    following = "the court held that the supply contract made time of the essence, so delay was a breach"
+
+    assert merge_overlapping(previous, following) == (
+        "On appeal, the court held that the supply contract made time of the essence, so delay was a breach"
+    )
+
+
+@requires_encoding
+def test_count_tokens_treats_special_token_markup_as_text():
+    assert count_tokens("<|endoftext|>") > 1
+
+
+@requires_encoding
+def test_context_stays_within_the_token_budget():
+    _, report = ContextBuilder(token_budget=150, min_truncated_tokens=20).build(_documents())
+
+    assert report["tokens"] <= 150
+    assert report["included"] or report["truncated"]
+    assert report["omitted"]
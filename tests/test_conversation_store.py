@@ -0,0 +1,85 @@
+"""Server-side conversation history: turn reservation, conflicts and rehydration."""
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from backend.main import app
+from backend.routes import chat as chat_route
+from backend.services import conversation_store
+from backend.services.conversation_store import ConversationConflict, ConversationStore
+
+
+HISTORY = [
+    {"role": "user", "content": "What is consideration?"},
+    {"role": "assistant", "content": "Something of value exchanged by each party."},
+]
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """Fresh global conversation store."""
+    instance = ConversationStore(max_sessions=10, ttl_seconds=60, max_messages=10)
+    monkeypatch.setattr(conversation_store, "_conversation_store_instance", instance)
+    return instance
+
+
+def test_completed_turns_are_recorded_and_returned_as_history(store):
+    assert store.begin_turn("s", turn=0) == []
+    assert store.complete_turn("s", "first question", "first answer") == 1
+
+    history = store.begin_turn("s", turn=1)
+
+    assert history == [
+        {"role": "user", "content": "first question"},
+        {"role": "assistant", "content": "first answer"},
+    ]
+
+
+def test_a_turn_in_progress_blocks_the_next_until_it_is_aborted(store):
+    store.begin_turn("s", turn=0)
+
+    with pytest.raises(ConversationConflict):
+        store.begin_turn("s", turn=0)
+
+    store.abort_turn("s")
+    assert store.begin_turn("s", turn=0) == []
+
+
+def test_stale_turns_and_unknown_sessions_conflict(store):
+    store.begin_turn("s", turn=0)
+    store.complete_turn("s", "question", "answer")
+
+    with pytest.raises(ConversationConflict) as stale:
+        store.begin_turn("s", turn=0)
+    with pytest.raises(ConversationConflict) as unknown:
+        store.begin_turn("missing", turn=3)
+
+    assert stale.value.server_turn == 1
+    assert unknown.value.server_turn is None
+
+
+def test_client_history_rehydrates_a_session(store):
+    assert store.begin_turn("missing", turn=1, history=HISTORY) == HISTORY
+    assert store.complete_turn("missing", "follow-up", "answer") == 2
+
+
+def test_chat_returns_409_for_stale_turns_and_unknown_sessions(store):
+    store.begin_turn("s", turn=0)
+    store.complete_turn("s", "question", "answer")
+    client = TestClient(app)
+
+    stale = client.post("/chat", json={"session_id": "s", "message": "next", "turn": 0})
+    unknown = client.post("/chat", json={"session_id": "missing", "message": "next", "turn": 2})
+
+    assert stale.status_code == 409
+    assert unknown.status_code == 409
+
+
+def test_a_cancelled_chat_request_releases_its_turn(store, monkeypatch):
+    async def cancelled(**kwargs):
+        raise asyncio.CancelledError()
+    monkeypatch.setattr(chat_route, "run_rag_query", cancelled)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(chat_route.chat(chat_route.ChatRequest(session_id="s", message="question", turn=0)))
+
+    assert store.begin_turn("s", turn=0) == []
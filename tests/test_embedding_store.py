@@ -0,0 +1,60 @@
+"""Persistent embedding store: reuse across runs, keyed by model."""
+import numpy as np
+from backend.ingestion.batch_embedder import BatchEmbedder
+from backend.ingestion.embedding_store import EmbeddingStore
+from backend.services.embeddings import HashEmbeddingProvider
+from tests.conftest import CASES, requires_encoding
+from tests.fakes import RecordingEmbeddingProvider
+
+
+TEXTS = [text for _, _, text in CASES]
+
+
+def _seed(path, model, texts=TEXTS):
+    store = EmbeddingStore(path, model)
+    store.put_many(texts, HashEmbeddingProvider().embed(texts))
+    store.save()
+    return store
+
+
+def test_saved_embeddings_are_read_back_by_a_later_run(tmp_path):
+    _seed(str(tmp_path), "text-embedding-3-small")
+
+    reopened = EmbeddingStore(str(tmp_path), "text-embedding-3-small")
+    embeddings = reopened.get_many(TEXTS + ["never embedded"])
+
+    assert len(reopened) == len(TEXTS)
+    # Stored as float32
+    assert np.allclose(embeddings[:-1], HashEmbeddingProvider().embed(TEXTS))
+    assert embeddings[-1] is None
+
+
+def test_entries_are_keyed_by_model_name(tmp_path):
+    _seed(str(tmp_path), "text-embedding-3-small")
+
+    other_model = EmbeddingStore(str(tmp_path), "text-embedding-3-large")
+
+    assert other_model.get_many(TEXTS) == [None] * len(TEXTS)
+    assert len(EmbeddingStore(str(tmp_path), "text-embedding-3-small")) == len(TEXTS)
+
+
+def test_fully_stored_texts_are_not_sent_to_the_provider(tmp_path):
+    _seed(str(tmp_path), "hash")
+    provider = RecordingEmbeddingProvider()
+
+    embeddings = BatchEmbedder(provider, embedding_store=EmbeddingStore(str(tmp_path), "hash")).embed(TEXTS)
+
+    assert provider.requests == []
+    assert np.allclose(embeddings, HashEmbeddingProvider().embed(TEXTS))
+
+
+@requires_encoding
+def test_only_new_texts_are_embedded_and_recorded(tmp_path):
+    _seed(str(tmp_path), "hash", TEXTS[:2])
+    provider = RecordingEmbeddingProvider()
+    store = EmbeddingStore(str(tmp_path), "hash")
+
+    BatchEmbedder(provider, tokens_per_minute=0, embedding_store=store).embed(TEXTS)
+
+    assert provider.requests == [TEXTS[2:]]
+    assert np.allclose(store.get_many(TEXTS[2:]), HashEmbeddingProvider().embed(TEXTS[2:]))
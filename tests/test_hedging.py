@@ -0,0 +1,81 @@
+"""Hedged LLM calls: deadline hedging, failover and cancellation of the loser."""
+import asyncio
+import pytest
+from backend.config import settings
+from backend.services.hedging import FirstTokenLatency, hedged_call
+from tests.fakes import FakeChatModel
+
+
+@pytest.fixture(autouse=True)
+def short_deadline(monkeypatch):
+    monkeypatch.setattr(settings, "llm_hedging_enabled", True)
+    monkeypatch.setattr(settings, "llm_hedge_deadline_seconds", 0.05)
+    monkeypatch.setattr(settings, "llm_hedge_min_samples", 5)
+
+
+async def _invoke(llm, callbacks):
+    message = await llm.ainvoke("question", config={"callbacks": callbacks})
+    return message.content
+
+
+def _run(primary, fallback, latency):
+    return asyncio.run(hedged_call(primary, fallback, _invoke, latency))
+
+
+def test_fast_primary_wins_without_starting_the_fallback():
+    primary, fallback = FakeChatModel(reply="primary answer"), FakeChatModel(reply="fallback answer")
+    latency = FirstTokenLatency()
+
+    result, llm = _run(primary, fallback, latency)
+
+    assert (result, llm) == ("primary answer", primary)
+    assert fallback.calls == 0
+    assert latency.hedges == 0
+
+
+def test_slow_primary_is_hedged_and_cancelled_when_the_fallback_streams_first():
+    primary = FakeChatModel(reply="primary answer", first_token_delay=2.0)
+    fallback = FakeChatModel(reply="fallback answer")
+    latency = FirstTokenLatency()
+
+    result, llm = _run(primary, fallback, latency)
+
+    assert (result, llm) == ("fallback answer", fallback)
+    assert primary.cancelled == 1
+    assert (latency.hedges, latency.fallback_wins) == (1, 1)
+
+
+def test_primary_that_streams_first_keeps_the_win_and_cancels_the_hedge():
+    primary = FakeChatModel(reply="primary answer with many words", first_token_delay=0.08, token_delay=0.02)
+    fallback = FakeChatModel(reply="fallback answer", first_token_delay=1.0)
+
+    result, llm = _run(primary, fallback, FirstTokenLatency())
+
+    assert llm is primary
+    assert fallback.cancelled == 1
+
+
+def test_failed_primary_falls_back_even_with_hedging_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "llm_hedging_enabled", False)
+    primary, fallback = FakeChatModel(fail=True), FakeChatModel(reply="fallback answer")
+
+    result, llm = _run(primary, fallback, FirstTokenLatency())
+
+    assert (result, llm) == ("fallback answer", fallback)
+
+
+def test_error_is_raised_when_every_contender_fails():
+    with pytest.raises(RuntimeError, match="provider unavailable"):
+        _run(FakeChatModel(fail=True), FakeChatModel(fail=True), FirstTokenLatency())
+
+
+def test_hedge_delay_tracks_the_p95_first_token_time_under_the_deadline():
+    latency = FirstTokenLatency()
+    assert latency.hedge_delay("openai") == 0.05
+
+    for seconds in (0.01, 0.01, 0.02, 0.02, 0.03):
+        latency.record("openai", seconds)
+
+    assert latency.hedge_delay("openai") == 0.03
+    latency.record("openai", 1.0)
+    assert latency.hedge_delay("openai") == 0.05
@@ -0,0 +1,85 @@
+"""Incremental ingestion: manifest diffs, orphan deletion and the lexical index."""
+import json
+import os
+import pytest
+from backend.config import settings
+from backend.ingestion.ingest import legacy_chunk_vector_id, run_ingestion
+from backend.ingestion.streaming import SpillFile
+from backend.services.embeddings import HashEmbeddingProvider
+from backend.services.lexical_index import BM25Index
+from backend.services.local_vector_store import InMemoryVectorStore
+from tests.conftest import CASES, requires_encoding
+
+
+def _write_source(path, cases=CASES):
+    with open(path, "w", encoding="utf-8") as f:
+        for name, citation, text in cases:
+            document = {"case_name": name, "court": "Test Court", "date": "2023-01-01", "citation": citation, "topic": "Test", "content": text}
+            f.write(json.dumps(document) + "\n")
+    return str(path)
+
+
+@pytest.fixture
+def ingestion_paths(monkeypatch, tmp_path):
+    """Point every ingestion output at a per-test directory."""
+    data_dir = tmp_path / "data"
+    monkeypatch.setattr(settings, "lexical_index_path", str(data_dir / "lexical_index.npz"))
+    monkeypatch.setattr(settings, "ingestion_manifest_path", str(data_dir / "ingestion_manifest.json"))
+    monkeypatch.setattr(settings, "index_version_path", str(data_dir / ".index_version"))
+    monkeypatch.setattr(settings, "embedding_store_enabled", False)
+    return data_dir
+
+
+def test_spill_file_reads_records_back_in_order(tmp_path):
+    with SpillFile(str(tmp_path)) as spill:
+        for idx in range(3):
+            spill.append({"id": f"chunk-{idx}"})
+
+        assert spill.count == 3
+        assert [record["id"] for record in spill] == ["chunk-0", "chunk-1", "chunk-2"]
+        assert list(spill) == list(spill)
+    assert os.listdir(tmp_path) == []
+
+
+@requires_encoding
+def test_first_run_deletes_legacy_vectors_and_builds_the_lexical_index(ingestion_paths, tmp_path):
+    store = InMemoryVectorStore()
+    legacy_id = legacy_chunk_vector_id({"metadata": {"case_name": CASES[0][0], "chunk_id": 0}})
+    store.upsert([{"id": legacy_id, "values": [1.0] * store.dimension, "metadata": {"text": "old"}}])
+
+    run_ingestion(vector_store=store, embedding_provider=HashEmbeddingProvider(), source=_write_source(tmp_path / "cases.jsonl"))
+
+    assert store.fetch([legacy_id]) == {}
+    index = BM25Index.load(settings.lexical_index_path)
+    assert store.stats()["total_vector_count"] == len(index.doc_ids)
+    top = index.search("45 F.4th 789", top_k=1)[0]["id"]
+    assert store.fetch([top])[top]["case_name"] == CASES[1][0]
+    # Spill files are temporary and leave nothing behind
+    assert sorted(os.listdir(ingestion_paths)) == [".index_version", "ingestion_manifest.json", "lexical_index.npz"]
+
+
+@requires_encoding
+def test_rerun_deletes_chunks_of_removed_documents(ingestion_paths, tmp_path):
+    store = InMemoryVectorStore()
+    provider = HashEmbeddingProvider()
+    run_ingestion(vector_store=store, embedding_provider=provider, source=_write_source(tmp_path / "all.jsonl"))
+
+    run_ingestion(vector_store=store, embedding_provider=provider, source=_write_source(tmp_path / "two.jsonl", CASES[:2]))
+
+    case_names = {metadata["case_name"] for metadata in store.fetch(BM25Index.load(settings.lexical_index_path).doc_ids).values()}
+    assert case_names == {CASES[0][0], CASES[1][0]}
+    assert store.stats()["total_vector_count"] == len(BM25Index.load(settings.lexical_index_path).doc_ids)
+
+
+@requires_encoding
+def test_duplicate_documents_do_not_abort_ingestion(ingestion_paths, tmp_path):
+    store = InMemoryVectorStore()
+
+    run_ingestion(
+        vector_store=store,
+        embedding_provider=HashEmbeddingProvider(),
+        source=_write_source(tmp_path / "cases.jsonl", CASES + CASES[:1])
+    )
+
+    case_names = {metadata["case_name"] for metadata in store.fetch(BM25Index.load(settings.lexical_index_path).doc_ids).values()}
+    assert case_names == {name for name, _, _ in CASES}
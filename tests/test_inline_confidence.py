@@ -0,0 +1,68 @@
+"""Single-call generation with inline confidence, and self-assessment parsing."""
+import asyncio
+import json
+import pytest
+from backend.config import settings
+from backend.services.confidence import parse_llm_self_assessment
+from backend.services.rag_pipeline import run_rag_query
+from tests.conftest import requires_encoding
+from tests.fakes import FakeChatModel
+
+
+QUESTION = "Was the late delivery under the supply contract a material breach?"
+
+
+def _structured(answer, cited_cases, confidence):
+    return json.dumps({"answer": answer, "cited_cases": cited_cases, "confidence": confidence})
+
+
+@pytest.fixture
+def inline_confidence(monkeypatch):
+    monkeypatch.setattr(settings, "inline_confidence", True)
+    monkeypatch.setattr(settings, "llm_hedging_enabled", False)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("HIGH", (0.9, "high")),
+    ("Confidence: medium", (0.6, "medium")),
+    ("LOW", (0.3, "low")),
+    ("INSUFFICIENT", (0.1, "insufficient")),
+])
+def test_self_assessment_levels_are_parsed(text, expected):
+    assert parse_llm_self_assessment(text) == expected
+
+
+def test_unparseable_self_assessment_falls_back_to_answer_heuristics():
+    score, _ = parse_llm_self_assessment("I cannot answer that from these cases.")
+
+    assert score == 0.2
+
+
+@requires_encoding
+def test_structured_answer_supplies_confidence_and_citations_in_one_call(retriever, use_llms, inline_confidence):
+    # The answer abbreviates the case name; cited_cases still links it
+    primary, _ = use_llms(FakeChatModel(reply=_structured(
+        "Under Smith the late delivery was a material breach.", ["Smith v. Jones Manufacturing Co."], "MEDIUM"
+    )))
+
+    result = asyncio.run(run_rag_query(QUESTION, "inline-structured"))
+
+    assert result["answer"] == "Under Smith the late delivery was a material breach."
+    assert result["llm_confidence"] == 0.6
+    assert [citation["case_name"] for citation in result["citations"]] == ["Smith v. Jones Manufacturing Co."]
+    assert primary.calls == 1  # No separate self-assessment call
+    assert result["error"] is None
+
+
+@requires_encoding
+def test_malformed_structured_answer_fails_over_to_the_fallback_llm(retriever, use_llms, inline_confidence):
+    primary, fallback = use_llms(
+        FakeChatModel(reply="Not JSON at all. HIGH"),
+        FakeChatModel(reply=_structured("Fallback answer.", [], "LOW"))
+    )
+
+    result = asyncio.run(run_rag_query(QUESTION, "inline-fallback"))
+
+    assert result["answer"] == "Fallback answer."
+    assert result["llm_confidence"] == 0.3
+    assert (primary.calls, fallback.calls) == (1, 1)
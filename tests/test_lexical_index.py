@@ -0,0 +1,93 @@
+"""BM25 index storage and hybrid retrieval over the lexical index."""
+import asyncio
+import numpy as np
+import pytest
+from backend.config import settings
+from backend.services.index_version import bump_index_version
+from backend.services.lexical_index import BM25Index, reciprocal_rank_fusion
+from tests.conftest import CASES
+
+
+def _entries(cases=CASES):
+    return [
+        {"id": f"case-{i}-0", "text": text, "metadata": {"case_name": name, "citation": citation}}
+        for i, (name, citation, text) in enumerate(cases)
+    ]
+
+
+@pytest.fixture
+def index_paths(monkeypatch, tmp_path):
+    """Point the lexical index and index version at a per-test directory."""
+    monkeypatch.setattr(settings, "lexical_index_path", str(tmp_path / "lexical_index.npz"))
+    monkeypatch.setattr(settings, "index_version_path", str(tmp_path / ".index_version"))
+    return tmp_path
+
+
+def _vector_search_misses(retriever):
+    """Make the vector store return nothing, so every hit is lexical-only."""
+    async def aquery(vector, top_k, filter_dict=None):
+        return []
+    retriever.vector_store.aquery = aquery
+
+
+def test_search_ranks_exact_citations_first():
+    index = BM25Index.build(_entries())
+
+    matches = index.search("45 F.4th 789", top_k=3)
+
+    assert matches[0]["id"] == "case-1-0"
+    assert set(matches[0]) == {"id", "score"}
+
+
+def test_saved_index_holds_only_ids_and_postings(tmp_path):
+    path = str(tmp_path / "index.npz")
+    BM25Index.build(_entries()).save(path)
+
+    with np.load(path) as data:
+        assert sorted(data.files) == ["doc_ids", "doc_lengths", "offsets", "params", "postings_docs", "postings_tfs", "terms"]
+    loaded = BM25Index.load(path)
+    assert loaded.search("consideration reliance", top_k=1)[0]["id"] == "case-2-0"
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([[{"id": "a"}, {"id": "b"}], [{"id": "b"}, {"id": "c"}]], k=60)
+
+    assert [vector_id for vector_id, _ in fused] == ["b", "a", "c"]
+
+
+def test_lexical_only_hits_are_hydrated_from_the_vector_store(index_paths, retriever):
+    retriever.lexical_index = BM25Index.build(_entries())
+    _vector_search_misses(retriever)
+
+    documents, _ = asyncio.run(retriever.aretrieve("qualified immunity", top_k=2))
+
+    assert documents[0].metadata["id"] == "case-1-0"
+    assert documents[0].page_content == CASES[1][2]
+    assert documents[0].metadata["case_name"] == CASES[1][0]
+    assert "score" not in documents[0].metadata
+
+
+def test_filters_apply_to_lexical_only_hits(index_paths, retriever):
+    retriever.lexical_index = BM25Index.build(_entries())
+    _vector_search_misses(retriever)
+
+    documents, _ = asyncio.run(retriever.aretrieve(
+        "contract immunity consideration", top_k=3, filter_dict={"case_id": {"$in": ["case-1"]}}
+    ))
+
+    assert [document.metadata["id"] for document in documents] == ["case-1-0"]
+
+
+def test_retriever_reloads_the_index_after_ingestion(index_paths, retriever):
+    _vector_search_misses(retriever)
+    BM25Index.build(_entries(CASES[:1])).save(settings.lexical_index_path)
+    bump_index_version()
+
+    documents, _ = asyncio.run(retriever.aretrieve("qualified immunity", top_k=3))
+    assert documents == []
+
+    BM25Index.build(_entries()).save(settings.lexical_index_path)
+    bump_index_version()
+
+    documents, _ = asyncio.run(retriever.aretrieve("qualified immunity", top_k=3))
+    assert documents[0].metadata["id"] == "case-1-0"
@@ -0,0 +1,93 @@
+"""NumPy vector store: growth, filters, persistence and reloading."""
+import threading
+import numpy as np
+from backend.services.local_vector_store import MIN_CAPACITY, LocalVectorStore
+
+
+def _vector(idx, dimension=8):
+    return np.random.default_rng(idx).standard_normal(dimension).tolist()
+
+
+def _records(start, stop, **metadata):
+    return [
+        {"id": f"v{idx}", "values": _vector(idx), "metadata": {"n": idx, **metadata}}
+        for idx in range(start, stop)
+    ]
+
+
+def test_capacity_doubles_instead_of_growing_per_batch():
+    store = LocalVectorStore(dimension=8)
+    capacities = set()
+    for start in range(0, 5000, 100):
+        store.upsert(_records(start, start + 100))
+        capacities.add(len(store._matrix))
+
+    assert sorted(capacities) == [MIN_CAPACITY, 2 * MIN_CAPACITY, 4 * MIN_CAPACITY, 8 * MIN_CAPACITY]
+    assert store.stats()["total_vector_count"] == 5000
+    assert store.query(_vector(4321), top_k=1)[0]["id"] == "v4321"
+
+
+def test_upsert_replaces_records_and_filters_ignore_spare_capacity():
+    store = LocalVectorStore(dimension=8)
+    store.upsert(_records(0, 10, court="A"))
+    store.upsert([{"id": "v3", "values": _vector(3), "metadata": {"n": 3, "court": "B"}}])
+
+    matches = store.query(_vector(3), top_k=10, filter_dict={"court": {"$ne": "A"}})
+
+    assert [match["id"] for match in matches] == ["v3"]
+    assert store.fetch(["v3", "missing"]) == {"v3": {"n": 3, "court": "B"}}
+
+
+def test_delete_compacts_rows():
+    store = LocalVectorStore(dimension=8)
+    store.upsert(_records(0, 10))
+    store.delete(["v2", "v7", "missing"])
+    store.upsert(_records(10, 12))
+
+    assert store.stats()["total_vector_count"] == 10
+    assert store.query(_vector(7), top_k=1)[0]["id"] != "v7"
+    assert store.query(_vector(11), top_k=1)[0]["metadata"] == {"n": 11}
+
+
+def test_memory_mapped_store_can_be_written_after_loading(tmp_path):
+    store = LocalVectorStore(dimension=8, path=str(tmp_path))
+    store.upsert(_records(0, 3))
+    store.save()
+
+    loaded = LocalVectorStore.load(str(tmp_path), mmap=True)
+    loaded.upsert(_records(3, 5))
+
+    assert loaded.stats()["total_vector_count"] == 5
+    assert np.load(str(tmp_path / "vectors.npy")).shape == (3, 8)
+
+
+def test_reload_picks_up_a_store_saved_by_another_process(tmp_path):
+    writer = LocalVectorStore(dimension=8, path=str(tmp_path))
+    writer.upsert(_records(0, 3))
+    writer.save()
+    reader = LocalVectorStore.load(str(tmp_path), mmap=True)
+
+    writer.upsert(_records(3, 6))
+    writer.save()
+    reader.reload()
+
+    assert reader.stats()["total_vector_count"] == 6
+    assert reader.query(_vector(5), top_k=1)[0]["id"] == "v5"
+
+
+
+def test_queries_wait_for_a_reload_to_swap_in_every_array():
+    store = LocalVectorStore(dimension=8)
+    store.upsert(_records(0, 10))
+    results = []
+    query = threading.Thread(target=lambda: results.append(store.query(_vector(7), top_k=1)))
+
+    # reload swaps the matrix, columns and ids while holding the lock
+    with store._lock:
+        query.start()
+        query.join(0.1)
+        assert results == []
+    query.join()
+
+    assert results[0][0]["id"] == "v7"
+    assert results[0][0]["metadata"] == {"n": 7}
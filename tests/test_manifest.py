@@ -0,0 +1,50 @@
+"""Ingestion manifest: document identity, change detection and persistence."""
+from backend.ingestion.manifest import IngestionManifest, chunk_hash, document_hash, document_id
+
+
+DOCUMENT = {"case_name": "Smith v. Jones", "court": "Test Court", "date": "2023-01-01", "citation": "1 A.1d 1", "content": "text"}
+
+
+def _chunks(doc_id, texts):
+    chunks = []
+    for idx, text in enumerate(texts):
+        chunk = {"id": f"{doc_id}-{idx}", "text": text, "metadata": {"doc_id": doc_id, "chunk_id": idx}}
+        chunk["content_hash"] = chunk_hash(chunk)
+        chunks.append(chunk)
+    return chunks
+
+
+def test_document_id_ignores_content():
+    edited = {**DOCUMENT, "content": "edited text"}
+
+    assert document_id(edited) == document_id(DOCUMENT)
+    assert document_hash(edited) != document_hash(DOCUMENT)
+
+
+def test_duplicate_documents_are_skipped_and_the_first_copy_kept():
+    manifest = IngestionManifest()
+    doc_id = document_id(DOCUMENT)
+
+    assert manifest.record_document(doc_id, "first", _chunks(doc_id, ["a", "b"]))
+    assert not manifest.record_document(doc_id, "second", _chunks(doc_id, ["c"]))
+
+    assert manifest.documents[doc_id]["content_hash"] == "first"
+    assert manifest.vector_ids() == {f"{doc_id}-0", f"{doc_id}-1"}
+
+
+def test_changed_chunks_selects_new_and_edited_chunks(tmp_path):
+    doc_id = document_id(DOCUMENT)
+    previous = IngestionManifest(embedding_model="m", vector_store="s")
+    previous.record_document(doc_id, "hash", _chunks(doc_id, ["a", "b"]))
+    path = str(tmp_path / "manifest.json")
+    previous.save(path)
+
+    loaded = IngestionManifest.load(path)
+    changed = list(loaded.changed_chunks(_chunks(doc_id, ["a", "b edited", "c"])))
+
+    assert loaded.embedding_model == "m"
+    assert [chunk["id"] for chunk in changed] == [f"{doc_id}-1", f"{doc_id}-2"]
+
+
+def test_missing_manifest_loads_empty(tmp_path):
+    assert IngestionManifest.load(str(tmp_path / "missing.json")).documents == {}
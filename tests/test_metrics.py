@@ -0,0 +1,60 @@
+"""Prometheus metrics and Server-Timing headers."""
+import asyncio
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from backend.main import app
+from backend.services.rag_pipeline import stream_rag_query
+from tests.conftest import requires_encoding
+from tests.fakes import FakeChatModel
+
+
+QUESTION = "Was the late delivery under the supply contract a material breach?"
+
+
+def _tokens(kind: str) -> float:
+    return REGISTRY.get_sample_value("legal_ai_llm_tokens_total", {"provider": "openai", "kind": kind}) or 0.0
+
+
+@requires_encoding
+def test_token_usage_is_recorded_without_breaking_streaming(retriever, use_llms):
+    primary, _ = use_llms(FakeChatModel(prompt_tokens=200))
+    prompt_before, completion_before = _tokens("prompt"), _tokens("completion")
+
+    async def collect():
+        return [event async for event in stream_rag_query(QUESTION, "metrics-stream")]
+
+    events = asyncio.run(collect())
+
+    assert any(event["event"] == "token" for event in events)
+    # Generation and self-assessment each report their usage
+    assert _tokens("prompt") - prompt_before == 2 * 200
+    assert _tokens("completion") - completion_before == 2 * len(primary.reply.split())
+
+
+@requires_encoding
+def test_chat_reports_server_timing_and_metrics(retriever, use_llms):
+    use_llms(FakeChatModel())
+    client = TestClient(app)
+
+    response = client.post("/chat", json={"session_id": "metrics-chat", "message": QUESTION})
+
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    for name in ("retrieve_documents", "generate_answer", "openai-chat", "total"):
+        assert f"{name};dur=" in timing
+
+    metrics = client.get("/metrics")
+    assert metrics.status_code == 200
+    assert metrics.headers["content-type"].startswith("text/plain")
+    assert 'legal_ai_graph_node_seconds_count{node="generate_answer"}' in metrics.text
+    assert 'legal_ai_cache_hits_total{cache="answers"}' in metrics.text
+
+
+def test_global_retriever_registers_both_of_its_caches(monkeypatch):
+    from backend.services import metrics, retriever as retriever_module
+    monkeypatch.setattr(retriever_module, "_retriever_instance", None)
+    monkeypatch.setattr(metrics, "_cache_sources", {})
+
+    retriever_module.get_retriever()
+
+    assert {"query_embeddings", "retrieval_results"} <= set(metrics._cache_sources)
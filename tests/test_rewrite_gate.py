@@ -0,0 +1,72 @@
+"""Local gate that skips the follow-up rewrite LLM call."""
+import asyncio
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from backend.config import settings
+from backend.services.rag_pipeline import _build_initial_state, _needs_rewrite, rewrite_question
+from tests.conftest import requires_encoding
+from tests.fakes import FakeChatModel
+
+
+HISTORY = [
+    HumanMessage(content="What is consideration in contract law?"),
+    AIMessage(content="Consideration is something of value exchanged by each party."),
+]
+
+
+@pytest.mark.parametrize("question", [
+    "Does it apply to gifts?",
+    "What about promissory estoppel?",
+    "Consideration in California?",
+])
+def test_follow_ups_that_depend_on_earlier_turns_need_a_rewrite(question):
+    assert _needs_rewrite(question, HISTORY)
+
+
+@pytest.mark.parametrize("question", [
+    "When does qualified immunity shield police officers from civil liability?",
+    "Immunity for police?",
+])
+def test_standalone_follow_ups_skip_the_rewrite(question):
+    assert not _needs_rewrite(question, HISTORY)
+
+
+def _state(question):
+    history = [{"role": "user" if isinstance(msg, HumanMessage) else "assistant", "content": msg.content} for msg in HISTORY]
+    return _build_initial_state(question, "rewrite-gate", history)
+
+
+@pytest.fixture
+def no_speculation(monkeypatch):
+    monkeypatch.setattr(settings, "speculative_retrieval", False)
+
+
+def test_gated_follow_up_is_used_as_is_without_an_llm_call(use_llms, no_speculation):
+    primary, _ = use_llms(FakeChatModel(reply="Rewritten question"))
+    question = "When does qualified immunity shield police officers from civil liability?"
+
+    state = asyncio.run(rewrite_question(_state(question)))
+
+    assert state["rewritten_query"] == question
+    assert primary.calls == 0
+
+
+@requires_encoding
+def test_dependent_follow_up_is_rewritten_by_the_llm(use_llms, no_speculation):
+    primary, _ = use_llms(FakeChatModel(reply="Does consideration apply to gifts?"))
+
+    state = asyncio.run(rewrite_question(_state("Does it apply to gifts?")))
+
+    assert state["rewritten_query"] == "Does consideration apply to gifts?"
+    assert primary.calls == 1
+
+
+@requires_encoding
+def test_disabling_the_gate_rewrites_every_follow_up(use_llms, no_speculation, monkeypatch):
+    monkeypatch.setattr(settings, "rewrite_gate_enabled", False)
+    primary, _ = use_llms(FakeChatModel(reply="Rewritten question"))
+
+    state = asyncio.run(rewrite_question(_state("When does qualified immunity shield police officers from civil liability?")))
+
+    assert state["rewritten_query"] == "Rewritten question"
+    assert primary.calls == 1
@@ -0,0 +1,132 @@
+"""Coalescing of identical concurrent calls."""
+import asyncio
+import pytest
+from backend.services.rag_pipeline import get_rag_graph, run_rag_batch, run_rag_query
+from backend.services.single_flight import SingleFlight
+from tests.conftest import requires_encoding
+from tests.fakes import FakeChatModel
+
+
+QUESTION = "Was the late delivery under the supply contract a material breach?"
+
+
+def test_concurrent_identical_calls_run_once_and_get_independent_copies():
+    flights = SingleFlight()
+    runs = []
+
+    async def fetch():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        return {"matches": [1, 2]}
+
+    async def run():
+        return await asyncio.gather(*[flights.do("key", fetch) for _ in range(5)])
+
+    results = asyncio.run(run())
+    results[0]["matches"].append(3)
+
+    assert len(runs) == 1
+    assert results[1] == {"matches": [1, 2]}
+    assert flights.stats()["coalesced"] == 4
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_a_cancelled_caller_does_not_cancel_the_shared_call():
+    flights = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def run():
+        first = asyncio.create_task(flights.do("key", fetch))
+        second = asyncio.create_task(flights.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second, first.cancelled()
+
+    assert asyncio.run(run()) == ("done", True)
+
+
+def test_errors_reach_every_waiter_and_the_key_is_freed():
+    flights = SingleFlight()
+    runs = []
+
+    async def fail():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("vector store down")
+
+    async def run():
+        results = await asyncio.gather(*[flights.do("key", fail) for _ in range(3)], return_exceptions=True)
+        with pytest.raises(RuntimeError):
+            await flights.do("key", fail)
+        return results
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(runs) == 2
+
+
+def test_disabled_group_runs_every_call():
+    flights = SingleFlight(enabled=False)
+    runs = []
+
+    async def fetch():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def run():
+        return await asyncio.gather(*[flights.do("key", fetch) for _ in range(3)])
+
+    assert asyncio.run(run()) == ["value"] * 3
+    assert len(runs) == 3
+
+
+def test_repeated_retrievals_query_the_vector_store_once(retriever):
+    queries = []
+    aquery = retriever.vector_store.aquery
+
+    async def counting_aquery(vector, top_k, filter_dict=None):
+        queries.append(top_k)
+        return await aquery(vector, top_k, filter_dict)
+    retriever.vector_store.aquery = counting_aquery
+
+    async def run():
+        return [await retriever.aretrieve("material breach", top_k=2) for _ in range(3)]
+
+    results = asyncio.run(run())
+
+    assert len(queries) == 1
+    assert results[0] == results[2]
+    assert retriever.result_cache.stats()["hits"] == 2
+
+
+@requires_encoding
+def test_identical_queries_coalesce_only_within_a_session(retriever, use_llms):
+    primary, _ = use_llms(FakeChatModel(first_token_delay=0.05))
+
+    async def run():
+        await asyncio.gather(*[run_rag_query(QUESTION, session_id) for session_id in ("alice", "alice", "bob")])
+        graph = get_rag_graph()
+        return [await graph.aget_state({"configurable": {"thread_id": session_id}}) for session_id in ("alice", "bob")]
+
+    alice, bob = asyncio.run(run())
+
+    assert alice.values["answer"] == bob.values["answer"] != ""
+    assert primary.calls == 2 * 2  # generation and self-assessment, once per session
+
+
+@requires_encoding
+def test_batch_items_leave_no_checkpoints_behind(retriever, use_llms):
+    use_llms(FakeChatModel())
+
+    async def run():
+        return [item async for item in run_rag_batch([QUESTION, "What is qualified immunity?"])]
+
+    items = asyncio.run(run())
+
+    assert all("result" in item for item in items)
+    assert get_rag_graph().checkpointer.stats()["threads"] == 0
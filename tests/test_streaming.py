@@ -0,0 +1,42 @@
+"""Server-sent token streaming from the RAG pipeline."""
+import asyncio
+from backend.services.rag_pipeline import stream_rag_query
+from tests.conftest import requires_encoding
+from tests.fakes import FakeChatModel
+
+
+QUESTION = "Was the late delivery under the supply contract a material breach?"
+
+
+async def _collect(events):
+    return [event async for event in events]
+
+
+@requires_encoding
+def test_stream_forwards_answer_tokens(retriever, use_llms):
+    primary, _ = use_llms(FakeChatModel())
+
+    events = asyncio.run(_collect(stream_rag_query(QUESTION, "stream-tokens")))
+
+    tokens = [event["data"]["content"] for event in events if event["event"] == "token"]
+    result = events[-1]
+    assert result["event"] == "result"
+    assert len(tokens) == len(primary.reply.split())
+    assert "".join(tokens).strip() == result["data"]["answer"]
+
+
+@requires_encoding
+def test_stream_forwards_only_the_hedge_winner(retriever, use_llms, monkeypatch):
+    from backend.config import settings
+    monkeypatch.setattr(settings, "llm_hedge_deadline_seconds", 0.05)
+    primary, fallback = use_llms(
+        FakeChatModel(reply="Slow primary answer. HIGH", first_token_delay=2.0),
+        FakeChatModel(reply="Fast fallback answer citing Smith v. Jones Manufacturing Co.. HIGH")
+    )
+
+    events = asyncio.run(_collect(stream_rag_query(QUESTION, "stream-hedge")))
+
+    tokens = [event["data"]["content"] for event in events if event["event"] == "token"]
+    assert "".join(tokens).strip() == fallback.reply
+    assert events[-1]["data"]["provider"] is not None
+    assert primary.cancelled >= 1